@@ -5,7 +5,13 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import get_settings
 from .core.telemetry import setup_telemetry
-from .infrastructure.persistence.database import init_db
+from .infrastructure.persistence.database import async_engine, init_db
+from .presentation.api.dependencies import (
+    get_matrix_backfill_worker_pool,
+    get_parse_job_worker_pool,
+    get_password_hasher,
+    resume_matrix_backfills,
+)
 from .presentation.api.routes import api_router
 
 
@@ -14,8 +20,17 @@ async def lifespan(app: FastAPI):
     """Lifespan context manager for app startup/shutdown."""
     # Startup
     init_db()
+    worker_pool = get_parse_job_worker_pool()
+    worker_pool.start()
+    backfill_pool = get_matrix_backfill_worker_pool()
+    backfill_pool.start()
+    resume_matrix_backfills()
     yield
-    # Shutdown (if needed)
+    # Shutdown
+    backfill_pool.stop(timeout=5)
+    worker_pool.stop(timeout=5)
+    get_password_hasher().shutdown()
+    await async_engine.dispose()
 
 
 def create_app() -> FastAPI:
@@ -36,6 +51,8 @@ def create_app() -> FastAPI:
         allow_credentials=settings.cors_allow_credentials,
         allow_methods=settings.cors_allow_methods,
         allow_headers=settings.cors_allow_headers,
+        # Validators and the listing's next-page link
+        expose_headers=["ETag", "Link"],
     )
 
     app.include_router(api_router, prefix=settings.api_prefix)
@@ -1,3 +1,13 @@
-from .services import AuthService
+from .passwords import BcryptPasswordHasher
+from .rate_limit import BucketLimit, LoginRateLimiter
+from .services import AsyncAuthService, AuthService
+from .tokens import TokenVerifier
 
-__all__ = ["AuthService"]
+__all__ = [
+    "AsyncAuthService",
+    "AuthService",
+    "BcryptPasswordHasher",
+    "BucketLimit",
+    "LoginRateLimiter",
+    "TokenVerifier",
+]
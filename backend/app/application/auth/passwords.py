@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, TypeVar
+
+import bcrypt
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Counter, Histogram, Observation
+
+from app.domain.auth.exceptions import PasswordHashingBusyError
+
+_T = TypeVar("_T")
+
+_meter = metrics.get_meter(__name__)
+_tracked_hashers: "weakref.WeakSet[BcryptPasswordHasher]" = weakref.WeakSet()
+
+
+class BcryptPasswordHasher:
+    """bcrypt hashing and verification on a dedicated, bounded worker pool.
+
+    At most ``max_workers`` hashes run at once and at most ``max_queued``
+    more wait for a worker; beyond that callers get
+    PasswordHashingBusyError instead of queueing without bound. With
+    ``max_workers=0`` the work runs on the calling thread.
+    """
+
+    _queue_wait: Optional[Histogram] = None
+    _duration: Optional[Histogram] = None
+    _rejections: Optional[Counter] = None
+
+    def __init__(
+        self,
+        rounds: int = 12,
+        max_workers: int = 0,
+        max_queued: int = 0,
+    ) -> None:
+        self._rounds = rounds
+        self._max_pending = max_workers + max_queued
+        self._executor = (
+            ThreadPoolExecutor(max_workers, thread_name_prefix="password-hash")
+            if max_workers > 0
+            else None
+        )
+        self._pending = 0
+        self._running = 0
+        self._lock = threading.Lock()
+        _tracked_hashers.add(self)
+
+        try:
+            meter = metrics.get_meter(__name__)
+            self._queue_wait = meter.create_histogram(
+                "password_hash_queue_wait_seconds",
+                description="Time a password hash or check waited for a worker",
+                unit="s",
+            )
+            self._duration = meter.create_histogram(
+                "password_hash_duration_seconds",
+                description="Time spent computing a password hash or check",
+                unit="s",
+            )
+            self._rejections = meter.create_counter(
+                "password_hash_rejections_total",
+                description=(
+                    "Password hashes or checks refused because the queue was full"
+                ),
+            )
+        except Exception:
+            # Fallback to no-op if telemetry is not available
+            self._queue_wait = None
+            self._duration = None
+            self._rejections = None
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured cost factor."""
+        return self._run("hash", self._hash, password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """Whether the password matches; False for malformed hashes."""
+        return self._run("verify", self._verify, password, hashed)
+
+    async def hash_async(self, password: str) -> str:
+        """Like ``hash``, awaiting the worker instead of blocking on it."""
+        return await self._run_async("hash", self._hash, password)
+
+    async def verify_async(self, password: str, hashed: str) -> bool:
+        """Like ``verify``, awaiting the worker instead of blocking on it."""
+        return await self._run_async("verify", self._verify, password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """Whether the hash was made with another cost than configured."""
+        try:
+            return int(hashed.split("$")[2]) != self._rounds
+        except (IndexError, ValueError):
+            return True
+
+    def usage(self) -> dict[str, int]:
+        """Snapshot of admitted work by state (running, queued)."""
+        with self._lock:
+            queued = max(self._pending - self._running, 0)
+            return {"running": self._running, "queued": queued}
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self._rounds)
+        return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+    @staticmethod
+    def _verify(password: str, hashed: str) -> bool:
+        try:
+            return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+        except Exception:
+            # Malformed or foreign hashes never match
+            return False
+
+    def _run(self, operation: str, func: Callable[..., _T], *args: object) -> _T:
+        if self._executor is None:
+            return self._timed(operation, time.perf_counter(), func, *args)
+        return self._submit(operation, func, *args).result()
+
+    async def _run_async(
+        self, operation: str, func: Callable[..., _T], *args: object
+    ) -> _T:
+        if self._executor is None:
+            return await asyncio.to_thread(
+                self._timed, operation, time.perf_counter(), func, *args
+            )
+        return await asyncio.wrap_future(self._submit(operation, func, *args))
+
+    def _submit(
+        self, operation: str, func: Callable[..., _T], *args: object
+    ) -> Future[_T]:
+        with self._lock:
+            if self._pending >= self._max_pending:
+                if self._rejections:
+                    self._rejections.add(1, {"operation": operation})
+                raise PasswordHashingBusyError("Too many password checks pending")
+            self._pending += 1
+        future = self._executor.submit(
+            self._timed, operation, time.perf_counter(), func, *args
+        )
+        future.add_done_callback(self._release)
+        return future
+
+    def _timed(
+        self,
+        operation: str,
+        submitted_at: float,
+        func: Callable[..., _T],
+        *args: object,
+    ) -> _T:
+        attributes = {"operation": operation}
+        started = time.perf_counter()
+        if self._queue_wait:
+            self._queue_wait.record(started - submitted_at, attributes)
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+            if self._duration:
+                self._duration.record(time.perf_counter() - started, attributes)
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+
+def _observe_hashers(options: CallbackOptions) -> Iterable[Observation]:
+    for hasher in list(_tracked_hashers):
+        for state, value in hasher.usage().items():
+            yield Observation(value, {"state": state})
+
+
+_meter.create_observable_gauge(
+    "password_hash_tasks",
+    callbacks=[_observe_hashers],
+    description="Password hashes and checks by state (running, queued)",
+)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+
+class VerifiedTokenCache(ABC):
+    """Store for the claims of access tokens whose signature was checked."""
+
+    @abstractmethod
+    def get(self, token: str) -> dict | None:
+        """Return the claims of a verified, unexpired token, if present."""
+
+    @abstractmethod
+    def put(self, token: str, claims: dict, expires_at: float) -> None:
+        """Store claims until ``expires_at`` (seconds since the epoch)."""
+
+
+class RateLimitBackend(ABC):
+    """Token-bucket state, shared by every process enforcing a limit.
+
+    Buckets are created full on first use; a shared store (e.g. Redis)
+    makes a limit hold across workers instead of per process.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Take one token from the key's bucket.
+
+        Returns 0 when a token was taken, otherwise the seconds until the
+        bucket holds one again.
+        """
+
+    @abstractmethod
+    async def refund(self, key: str, capacity: float) -> None:
+        """Put back a token taken from the key's bucket, up to ``capacity``."""
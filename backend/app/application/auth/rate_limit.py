@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from opentelemetry import metrics
+
+from app.application.auth.ports import RateLimitBackend
+from app.domain.auth.exceptions import LoginRateLimitedError
+
+_meter = metrics.get_meter(__name__)
+_decisions = _meter.create_counter(
+    "login_rate_limit_decisions_total",
+    description="Login attempts admitted or rejected, by bucket scope",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class BucketLimit:
+    """A burst of ``capacity`` attempts, refilled at ``per_minute``."""
+
+    capacity: int
+    per_minute: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.per_minute / 60
+
+
+class LoginRateLimiter:
+    """Token buckets per client address and per email, in front of logins.
+
+    Checks run before any user lookup or password hash. The client bucket
+    caps credential stuffing from one address; the email bucket caps
+    guessing one account from many addresses. A scope whose limit is None
+    is not checked.
+
+    A successful login gets its email attempt back, so only failed
+    attempts drain the email bucket. That bucket is still shared by every
+    address: whoever fails often enough against an email locks its owner
+    out until the bucket refills, the price of stopping guesses spread
+    over many addresses. Size the email limits so that lockout stays short.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        per_client: BucketLimit | None,
+        per_email: BucketLimit | None,
+    ) -> None:
+        self._backend = backend
+        self._per_client = per_client
+        self._per_email = per_email
+
+    async def check(self, email: str, client: str | None) -> None:
+        """Spend one attempt; raise LoginRateLimitedError when out of them."""
+        scopes = (
+            ("client", client, self._per_client),
+            ("email", _email_key(email), self._per_email),
+        )
+        for scope, key, limit in scopes:
+            if key is None or limit is None:
+                continue
+            retry_after = await self._backend.take(
+                f"login:{scope}:{key}", limit.capacity, limit.refill_per_second
+            )
+            outcome = "rejected" if retry_after else "admitted"
+            _decisions.add(1, {"scope": scope, "outcome": outcome})
+            if retry_after:
+                raise LoginRateLimitedError(retry_after)
+
+    async def refund(self, email: str) -> None:
+        """Give back the email attempt of a login that succeeded."""
+        if self._per_email is not None:
+            await self._backend.refund(
+                f"login:email:{_email_key(email)}", self._per_email.capacity
+            )
+
+
+def _email_key(email: str) -> str:
+    return email.strip().lower()
@@ -3,67 +3,64 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from uuid import uuid4
 
-import bcrypt
-from jose import JWTError, jwt
+from jose import jwt
 
-from app.core.config import get_settings
+from app.application.auth.passwords import BcryptPasswordHasher
+from app.application.auth.rate_limit import LoginRateLimiter
+from app.application.auth.tokens import TokenVerifier
+from app.core.config import Settings, get_settings
 from app.domain.auth.entities import User
 from app.domain.auth.exceptions import (
     InvalidCredentialsError,
+    PasswordHashingBusyError,
     UserAlreadyExistsError,
 )
-from app.domain.auth.repositories import UserRepository
+from app.domain.auth.repositories import AsyncUserRepository, UserRepository
+
+
+def _encode_access_token(settings: Settings, user_id: str, email: str) -> str:
+    expire = datetime.utcnow() + timedelta(
+        minutes=settings.jwt_access_token_expire_minutes
+    )
+    to_encode = {"sub": user_id, "email": email, "exp": expire}
+    return jwt.encode(
+        to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm
+    )
 
 
 class AuthService:
     """Service for authentication and authorization."""
 
-    def __init__(self, user_repository: UserRepository) -> None:
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        token_verifier: TokenVerifier | None = None,
+        password_hasher: BcryptPasswordHasher | None = None,
+    ) -> None:
         self._user_repository = user_repository
         self._settings = get_settings()
+        self._token_verifier = token_verifier or TokenVerifier(
+            self._settings.jwt_secret_key, self._settings.jwt_algorithm
+        )
+        self._password_hasher = password_hasher or BcryptPasswordHasher(
+            rounds=self._settings.password_hash_rounds
+        )
 
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt."""
-        # Encode password to bytes, hash it, and decode back to string
-        password_bytes = password.encode("utf-8")
-        salt = bcrypt.gensalt(rounds=12)
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        return hashed.decode("utf-8")
+        return self._password_hasher.hash(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
-        try:
-            password_bytes = plain_password.encode("utf-8")
-            hashed_bytes = hashed_password.encode("utf-8")
-            return bcrypt.checkpw(password_bytes, hashed_bytes)
-        except Exception:
-            return False
+        return self._password_hasher.verify(plain_password, hashed_password)
 
     def create_access_token(self, user_id: str, email: str) -> str:
         """Create a JWT access token for a user."""
-        expires_delta = timedelta(
-            minutes=self._settings.jwt_access_token_expire_minutes
-        )
-        expire = datetime.utcnow() + expires_delta
-        to_encode = {"sub": user_id, "email": email, "exp": expire}
-        encoded_jwt = jwt.encode(
-            to_encode,
-            self._settings.jwt_secret_key,
-            algorithm=self._settings.jwt_algorithm,
-        )
-        return encoded_jwt
+        return _encode_access_token(self._settings, user_id, email)
 
     def verify_token(self, token: str) -> dict:
         """Verify and decode a JWT token."""
-        try:
-            payload = jwt.decode(
-                token,
-                self._settings.jwt_secret_key,
-                algorithms=[self._settings.jwt_algorithm],
-            )
-            return payload
-        except JWTError as exc:
-            raise InvalidCredentialsError("Invalid token") from exc
+        return self._token_verifier.verify(token)
 
     def register_user(self, email: str, password: str) -> User:
         """Register a new user."""
@@ -86,6 +83,13 @@ class AuthService:
         if not self.verify_password(password, user.hashed_password):
             raise InvalidCredentialsError("Invalid email or password")
 
+        if self._password_hasher.needs_rehash(user.hashed_password):
+            try:
+                user.hashed_password = self.hash_password(password)
+            except PasswordHashingBusyError:
+                # Rehashing is opportunistic; the next login retries it
+                return user
+            self._user_repository.update(user)
         return user
 
     def login(self, email: str, password: str) -> tuple[User, str]:
@@ -93,3 +97,72 @@ class AuthService:
         user = self.authenticate_user(email, password)
         token = self.create_access_token(str(user.id), user.email)
         return user, token
+
+
+class AsyncAuthService:
+    """Registration and login over the async user repository.
+
+    Password hashes are awaited on the hasher's workers, so a burst of
+    logins queues there instead of holding request threads.
+    """
+
+    def __init__(
+        self,
+        user_repository: AsyncUserRepository,
+        password_hasher: BcryptPasswordHasher,
+        login_limiter: LoginRateLimiter | None = None,
+    ) -> None:
+        self._user_repository = user_repository
+        self._password_hasher = password_hasher
+        self._login_limiter = login_limiter
+        self._settings = get_settings()
+
+    def create_access_token(self, user_id: str, email: str) -> str:
+        """Create a JWT access token for a user."""
+        return _encode_access_token(self._settings, user_id, email)
+
+    async def register_user(self, email: str, password: str) -> User:
+        """Register a new user."""
+        if await self._user_repository.get_by_email(email):
+            raise UserAlreadyExistsError(f"User with email {email} already exists")
+
+        hashed_password = await self._password_hasher.hash_async(password)
+        user = User(email=email, hashed_password=hashed_password, id=uuid4())
+        return await self._user_repository.add(user)
+
+    async def authenticate_user(self, email: str, password: str) -> User:
+        """Authenticate a user, upgrading a hash made with another cost."""
+        user = await self._user_repository.get_by_email(email)
+        if not user:
+            raise InvalidCredentialsError("Invalid email or password")
+
+        hasher = self._password_hasher
+        if not await hasher.verify_async(password, user.hashed_password):
+            raise InvalidCredentialsError("Invalid email or password")
+
+        if hasher.needs_rehash(user.hashed_password):
+            try:
+                user.hashed_password = await hasher.hash_async(password)
+            except PasswordHashingBusyError:
+                # Rehashing is opportunistic; the next login retries it
+                return user
+            await self._user_repository.update(user)
+        return user
+
+    async def login(
+        self, email: str, password: str, client: str | None = None
+    ) -> tuple[User, str]:
+        """Login a user and return user entity and access token.
+
+        With a limiter, attempts beyond the limits for ``client`` (the
+        caller's address) or ``email`` fail with LoginRateLimitedError
+        before the password is checked; a successful login gives its
+        ``email`` attempt back.
+        """
+        if self._login_limiter is not None:
+            await self._login_limiter.check(email, client)
+        user = await self.authenticate_user(email, password)
+        if self._login_limiter is not None:
+            await self._login_limiter.refund(email)
+        token = self.create_access_token(str(user.id), user.email)
+        return user, token
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from jose import JWTError, jwt
+
+from app.application.auth.ports import VerifiedTokenCache
+from app.domain.auth.exceptions import InvalidCredentialsError
+
+
+class TokenVerifier:
+    """Verifies access tokens without touching the user store.
+
+    With a cache, a token's signature is checked once and its claims are
+    reused until the token expires. Tokens without an ``exp`` claim are
+    verified on every call.
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str,
+        cache: VerifiedTokenCache | None = None,
+    ) -> None:
+        self._secret_key = secret_key
+        self._algorithm = algorithm
+        self._cache = cache
+
+    def verify(self, token: str) -> dict:
+        """Return the claims of a valid token; raise InvalidCredentialsError."""
+        if self._cache is not None:
+            claims = self._cache.get(token)
+            if claims is not None:
+                return dict(claims)
+
+        try:
+            claims = jwt.decode(token, self._secret_key, algorithms=[self._algorithm])
+        except JWTError as exc:
+            raise InvalidCredentialsError("Invalid token") from exc
+
+        expires_at = claims.get("exp")
+        if self._cache is not None and isinstance(expires_at, (int, float)):
+            self._cache.put(token, dict(claims), float(expires_at))
+        return claims
@@ -3,32 +3,19 @@ from __future__ import annotations
 from typing import Iterable, Sequence
 from uuid import UUID
 
-from collections import defaultdict
-
 from app.domain.diagrams.entities import DiagramNFRComponentImpact, ImpactValue
-from app.domain.diagrams.matrix_repository import DiagramMatrixRepository
-from app.domain.diagrams.repositories import DiagramRepository
-from app.domain.nfr.repositories import NonFunctionalRequirementRepository
+from app.domain.diagrams.matrix_repository import (
+    AsyncDiagramMatrixRepository,
+    DiagramMatrixRepository,
+)
+from app.domain.diagrams.scoring import ImpactMatrix, scores_from_totals
 
 
 class DiagramMatrixService:
     """Application service for managing diagram NFR × Component matrices."""
 
-    def __init__(
-        self,
-        matrix_repository: DiagramMatrixRepository,
-        nfr_repository: NonFunctionalRequirementRepository,
-        diagram_repository: DiagramRepository,
-    ) -> None:
+    def __init__(self, matrix_repository: DiagramMatrixRepository) -> None:
         self._matrix_repository = matrix_repository
-        self._nfr_repository = nfr_repository
-        self._diagram_repository = diagram_repository
-
-    _IMPACT_SCORES: dict[ImpactValue, int] = {
-        ImpactValue.POSITIVE: 1,
-        ImpactValue.NO_EFFECT: 0,
-        ImpactValue.NEGATIVE: -1,
-    }
 
     def list_matrix(self, diagram_id: UUID) -> Sequence[DiagramNFRComponentImpact]:
         return self._matrix_repository.list_by_diagram(diagram_id)
@@ -41,25 +28,38 @@ class DiagramMatrixService:
         float | None,
     ]:
         entries = self._matrix_repository.list_by_diagram(diagram_id)
-        aggregates: dict[UUID, list[int]] = defaultdict(lambda: [0, 0])
-        for entry in entries:
-            score = self._IMPACT_SCORES[entry.impact]
-            aggregate = aggregates[entry.nfr_id]
-            aggregate[0] += score
-            aggregate[1] += 1
-
-        averages: dict[UUID, float] = {}
-        for nfr_id, (total, count) in aggregates.items():
-            if count == 0:
-                continue
-            averages[nfr_id] = total / count
-
-        overall_score: float | None = None
-        if averages:
-            overall_score = sum(averages.values()) / len(averages)
-
+        averages, overall_score = self.score_entries(entries)
         return entries, averages, overall_score
 
+    def load_matrix_with_scores(
+        self, diagram_id: UUID
+    ) -> tuple[ImpactMatrix, dict[UUID, float], float | None]:
+        """Dense counterpart of ``list_matrix_with_scores``; builds no entries."""
+        matrix = self._matrix_repository.load_impact_matrix(diagram_id)
+        averages, overall_score = matrix.score()
+        return matrix, averages, overall_score
+
+    def score_matrix(self, diagram_id: UUID) -> tuple[dict[UUID, float], float | None]:
+        """Scores only, from the per-NFR running totals."""
+        return scores_from_totals(self._matrix_repository.load_score_totals(diagram_id))
+
+    def score_matrices(
+        self, diagram_ids: Sequence[UUID]
+    ) -> dict[UUID, tuple[dict[UUID, float], float | None]]:
+        """``score_matrix`` for several diagrams from one batched read."""
+        totals = self._matrix_repository.load_score_totals_many(diagram_ids)
+        return {
+            diagram_id: scores_from_totals(totals[diagram_id])
+            for diagram_id in diagram_ids
+        }
+
+    @staticmethod
+    def score_entries(
+        entries: Iterable[DiagramNFRComponentImpact],
+    ) -> tuple[dict[UUID, float], float | None]:
+        """Average impact per NFR and the mean of those averages."""
+        return ImpactMatrix.from_entries(entries).score()
+
     def update_impact(
         self,
         diagram_id: UUID,
@@ -69,13 +69,89 @@ class DiagramMatrixService:
     ) -> DiagramNFRComponentImpact:
         return self._matrix_repository.upsert(diagram_id, nfr_id, component_id, impact)
 
+    def update_impacts(
+        self,
+        diagram_id: UUID,
+        cells: Sequence[tuple[UUID, UUID, ImpactValue]],
+    ) -> tuple[
+        Sequence[DiagramNFRComponentImpact],
+        dict[UUID, float],
+        float | None,
+    ]:
+        """
+        Apply many (nfr_id, component_id, impact) changes in one write and
+        score once; returns the written cells, the scores of the NFRs they
+        belong to and the overall score.
+        """
+        entries = self._matrix_repository.bulk_upsert(diagram_id, cells)
+        scores, overall_score = self.score_matrix(diagram_id)
+        return entries, _affected_scores(entries, scores), overall_score
+
     def ensure_defaults(self, diagram_id: UUID) -> None:
         """Ensure that matrix entries exist for every NFR × Component combination."""
-        components = self._diagram_repository.get_components(diagram_id)
-        component_ids = [component.id for component in components]
-        nfrs = self._nfr_repository.list()
-        pairs: Iterable[tuple[UUID, UUID]] = (
-            (nfr.id, component_id) for nfr in nfrs for component_id in component_ids
+        self._matrix_repository.initialize_cells(diagram_id, ImpactValue.NO_EFFECT)
+
+
+class AsyncDiagramMatrixService:
+    """Matrix read/update use cases over the async repositories."""
+
+    def __init__(self, matrix_repository: AsyncDiagramMatrixRepository) -> None:
+        self._matrix_repository = matrix_repository
+
+    async def list_matrix_with_scores(
+        self, diagram_id: UUID
+    ) -> tuple[
+        Sequence[DiagramNFRComponentImpact],
+        dict[UUID, float],
+        float | None,
+    ]:
+        entries = await self._matrix_repository.list_by_diagram(diagram_id)
+        averages, overall_score = DiagramMatrixService.score_entries(entries)
+        return entries, averages, overall_score
+
+    async def load_matrix_with_scores(
+        self, diagram_id: UUID
+    ) -> tuple[ImpactMatrix, dict[UUID, float], float | None]:
+        """Dense counterpart of ``list_matrix_with_scores``; builds no entries."""
+        matrix = await self._matrix_repository.load_impact_matrix(diagram_id)
+        averages, overall_score = matrix.score()
+        return matrix, averages, overall_score
+
+    async def score_matrix(
+        self, diagram_id: UUID
+    ) -> tuple[dict[UUID, float], float | None]:
+        """Scores only, from the per-NFR running totals."""
+        totals = await self._matrix_repository.load_score_totals(diagram_id)
+        return scores_from_totals(totals)
+
+    async def update_impact(
+        self,
+        diagram_id: UUID,
+        nfr_id: UUID,
+        component_id: UUID,
+        impact: ImpactValue,
+    ) -> DiagramNFRComponentImpact:
+        return await self._matrix_repository.upsert(
+            diagram_id, nfr_id, component_id, impact
         )
-        self._matrix_repository.ensure_pairs(diagram_id, pairs, ImpactValue.NO_EFFECT)
-        self._matrix_repository.delete_missing_components(diagram_id, component_ids)
+
+    async def update_impacts(
+        self,
+        diagram_id: UUID,
+        cells: Sequence[tuple[UUID, UUID, ImpactValue]],
+    ) -> tuple[
+        Sequence[DiagramNFRComponentImpact],
+        dict[UUID, float],
+        float | None,
+    ]:
+        """Apply many cell changes in one write and score once."""
+        entries = await self._matrix_repository.bulk_upsert(diagram_id, cells)
+        scores, overall_score = await self.score_matrix(diagram_id)
+        return entries, _affected_scores(entries, scores), overall_score
+
+
+def _affected_scores(
+    entries: Iterable[DiagramNFRComponentImpact], scores: dict[UUID, float]
+) -> dict[UUID, float]:
+    affected = {entry.nfr_id for entry in entries}
+    return {nfr_id: score for nfr_id, score in scores.items() if nfr_id in affected}
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import logging
+from uuid import UUID
+
+from app.domain.diagrams.entities import Component, ParseJob, Relationship
+from app.domain.diagrams.exceptions import DiagramNotFoundError, ParseError
+from app.domain.diagrams.repositories import DiagramRepository
+
+from .matrix_service import DiagramMatrixService
+from .ports import ParseJobQueue, UnitOfWork
+from .services import DiagramService
+
+logger = logging.getLogger(__name__)
+
+
+def parse_with_matrix_defaults(
+    diagram_service: DiagramService,
+    matrix_service: DiagramMatrixService,
+    unit_of_work: UnitOfWork,
+    user_id: UUID,
+    diagram_id: UUID,
+) -> tuple[list[Component], list[Relationship]]:
+    """Parse a diagram and initialize its matrix in a single transaction."""
+    with unit_of_work:
+        try:
+            components, relationships = diagram_service.parse_diagram(
+                user_id, diagram_id
+            )
+        except ParseError:
+            # Keep the FAILED status recorded by the service
+            unit_of_work.commit()
+            raise
+        # Ensure matrix defaults exist for all components/NFR pairs
+        matrix_service.ensure_defaults(diagram_id)
+        unit_of_work.commit()
+    return components, relationships
+
+
+class ParseJobService:
+    """Application service for submitting and tracking background parse jobs."""
+
+    def __init__(
+        self, queue: ParseJobQueue, diagram_repository: DiagramRepository
+    ) -> None:
+        self._queue = queue
+        self._diagram_repository = diagram_repository
+
+    def submit(self, user_id: UUID, diagram_id: UUID) -> ParseJob:
+        if diagram_id not in self._diagram_repository.owned_by(user_id, [diagram_id]):
+            raise DiagramNotFoundError(f"Diagram {diagram_id} not found")
+
+        job = ParseJob(diagram_id=diagram_id, user_id=user_id)
+        self._queue.enqueue(job)
+        return job
+
+    def get_job(
+        self, user_id: UUID, diagram_id: UUID, job_id: UUID
+    ) -> ParseJob | None:
+        job = self._queue.get(job_id)
+        if job is None or job.user_id != user_id or job.diagram_id != diagram_id:
+            return None
+        return job
+
+
+def execute_parse_job(
+    job: ParseJob,
+    queue: ParseJobQueue,
+    diagram_service: DiagramService,
+    matrix_service: DiagramMatrixService,
+    unit_of_work: UnitOfWork,
+) -> ParseJob:
+    """Run a claimed job and record its outcome; never raises."""
+    job.mark_running()
+    queue.save(job)
+    try:
+        components, relationships = parse_with_matrix_defaults(
+            diagram_service,
+            matrix_service,
+            unit_of_work,
+            job.user_id,
+            job.diagram_id,
+        )
+    except (DiagramNotFoundError, ParseError) as exc:
+        job.mark_failed(str(exc))
+    except Exception:
+        logger.exception("Parse job %s failed", job.id)
+        job.mark_failed("Internal error while parsing diagram")
+    else:
+        job.mark_succeeded(len(components), len(relationships))
+    queue.save(job)
+    return job
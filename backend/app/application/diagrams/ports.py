@@ -1,6 +1,19 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from types import TracebackType
+from typing import Iterable, Literal, Sequence
+from uuid import UUID
+
+from app.domain.diagrams.entities import (
+    Component,
+    ComponentType,
+    ParseJob,
+    Relationship,
+    RelationshipDirection,
+)
 
 
 class DiagramStorage(ABC):
@@ -11,3 +24,187 @@ class DiagramStorage(ABC):
     @abstractmethod
     def read(self, path: str) -> bytes | None:
         """Read diagram content from storage path."""
+
+
+class UnitOfWork(ABC):
+    """Transaction boundary spanning diagram and matrix repositories.
+
+    Repository writes made inside ``with uow:`` are staged and become
+    visible atomically on ``commit``; leaving the block without committing
+    discards them.
+    """
+
+    @abstractmethod
+    def __enter__(self) -> "UnitOfWork":
+        """Begin (or join) the transaction."""
+
+    @abstractmethod
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Leave the block, rolling back uncommitted work."""
+
+    @abstractmethod
+    def commit(self) -> None:
+        """Persist all work staged in the current transaction."""
+
+    @abstractmethod
+    def rollback(self) -> None:
+        """Discard all work staged in the current transaction."""
+
+
+# (content checksum, parser version)
+ParseCacheKey = tuple[str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class CachedParseResult:
+    """Compact, entity-free snapshot of a parser result.
+
+    Components are stored as ``(name, type)`` pairs and relationships
+    reference components by index, so the snapshot carries no UUIDs and
+    can be shared between diagrams with identical content.
+    """
+
+    components: tuple[tuple[str, str], ...]
+    relationships: tuple[tuple[int, int, str | None, str], ...]
+
+    @classmethod
+    def from_entities(
+        cls,
+        components: Sequence[Component],
+        relationships: Sequence[Relationship],
+    ) -> "CachedParseResult":
+        index_by_id = {component.id: idx for idx, component in enumerate(components)}
+        return cls(
+            components=tuple(
+                (component.name, component.type.value) for component in components
+            ),
+            relationships=tuple(
+                (
+                    index_by_id[relationship.source_component_id],
+                    index_by_id[relationship.target_component_id],
+                    relationship.label,
+                    relationship.direction.value,
+                )
+                for relationship in relationships
+                if relationship.source_component_id in index_by_id
+                and relationship.target_component_id in index_by_id
+            ),
+        )
+
+    def to_entities(self) -> tuple[list[Component], list[Relationship]]:
+        """Materialize fresh (unattached) entities from the snapshot."""
+        components = [
+            Component(
+                diagram_id=None,  # type: ignore
+                name=name,
+                type=ComponentType(type_value),
+            )
+            for name, type_value in self.components
+        ]
+        relationships = [
+            Relationship(
+                diagram_id=None,  # type: ignore
+                source_component_id=components[source].id,
+                target_component_id=components[target].id,
+                label=label,
+                direction=RelationshipDirection(direction),
+            )
+            for source, target, label, direction in self.relationships
+        ]
+        return components, relationships
+
+    def size_bytes(self) -> int:
+        """Approximate payload size used for cache accounting."""
+        size = 0
+        for name, type_value in self.components:
+            size += 16 + len(name) + len(type_value)
+        for _, _, label, direction in self.relationships:
+            size += 32 + len(label or "") + len(direction)
+        return size
+
+
+class ParseResultCache(ABC):
+    """Content-addressed store for parser results."""
+
+    @abstractmethod
+    def get(self, key: ParseCacheKey) -> CachedParseResult | None:
+        """Return the cached result for the key, if present."""
+
+    @abstractmethod
+    def put(self, key: ParseCacheKey, result: CachedParseResult) -> None:
+        """Store a parser result under the key."""
+
+
+@dataclass(frozen=True, slots=True)
+class ComponentDiff:
+    name: str
+    change_type: Literal["added", "removed", "modified"]
+    previous_type: ComponentType | None = None
+    new_type: ComponentType | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class RelationshipDiff:
+    source: str
+    target: str
+    change_type: Literal["added", "removed", "modified"]
+    previous_label: str | None = None
+    new_label: str | None = None
+    previous_direction: RelationshipDirection | None = None
+    new_direction: RelationshipDirection | None = None
+
+
+# (base checksum, base parsed_at, target checksum, target parsed_at): a
+# parsed diagram's components never change until it is parsed again, which
+# moves parsed_at and so retires every key it appeared in
+DiffCacheKey = tuple[str, datetime | None, str, datetime | None]
+CachedDiff = tuple[tuple[ComponentDiff, ...], tuple[RelationshipDiff, ...]]
+
+
+class DiffResultCache(ABC):
+    """Store for diagram diff results keyed by the compared versions."""
+
+    @abstractmethod
+    def get(self, key: DiffCacheKey) -> CachedDiff | None:
+        """Return the cached diff for the key, if present."""
+
+    @abstractmethod
+    def put(self, key: DiffCacheKey, diff: CachedDiff) -> None:
+        """Store a diff under the key."""
+
+
+class OwnershipCache(ABC):
+    """Short-lived record of diagrams known to belong to a user."""
+
+    @abstractmethod
+    def owned(self, user_id: UUID, diagram_ids: Sequence[UUID]) -> set[UUID]:
+        """Return the ids among ``diagram_ids`` recorded as the user's."""
+
+    @abstractmethod
+    def remember(self, user_id: UUID, diagram_ids: Iterable[UUID]) -> None:
+        """Record that the user owns ``diagram_ids``."""
+
+
+class ParseJobQueue(ABC):
+    """Queue backend holding parse jobs and their latest state."""
+
+    @abstractmethod
+    def enqueue(self, job: ParseJob) -> None:
+        """Register a new job and make it available to workers."""
+
+    @abstractmethod
+    def dequeue(self, timeout: float) -> ParseJob | None:
+        """Claim the next queued job, waiting up to ``timeout`` seconds."""
+
+    @abstractmethod
+    def get(self, job_id: UUID) -> ParseJob | None:
+        """Return the latest state of a job."""
+
+    @abstractmethod
+    def save(self, job: ParseJob) -> None:
+        """Persist a job state transition."""
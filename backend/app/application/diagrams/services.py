@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import codecs
 import time
 from dataclasses import dataclass
+from datetime import datetime
 from hashlib import sha256
-from typing import Any, Dict, Iterable, Literal, Optional, Sequence
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
 from uuid import UUID, uuid5
 
 from opentelemetry import metrics, trace
@@ -11,10 +13,10 @@ from opentelemetry.metrics import Counter, Histogram
 
 from app.domain.diagrams.entities import (
     Component,
-    ComponentType,
     Diagram,
+    DiagramSummary,
+    DiagramVersion,
     Relationship,
-    RelationshipDirection,
 )
 from app.domain.diagrams.exceptions import (
     DiagramAlreadyExistsError,
@@ -22,28 +24,42 @@ from app.domain.diagrams.exceptions import (
     ParseError,
 )
 from app.domain.diagrams.parsers import PlantUMLParser
-from app.domain.diagrams.repositories import DiagramRepository
+from app.domain.diagrams.repositories import (
+    AsyncDiagramRepository,
+    DiagramRepository,
+)
 
-from .ports import DiagramStorage
+from .ports import (
+    CachedParseResult,
+    ComponentDiff,
+    DiagramStorage,
+    DiffCacheKey,
+    DiffResultCache,
+    OwnershipCache,
+    ParseResultCache,
+    RelationshipDiff,
+)
 
 
-@dataclass(slots=True)
-class ComponentDiff:
-    name: str
-    change_type: Literal["added", "removed", "modified"]
-    previous_type: ComponentType | None = None
-    new_type: ComponentType | None = None
+@dataclass(frozen=True, slots=True)
+class EvolutionStep:
+    """One version in an evolution timeline, diffed against the previous one."""
+
+    diagram_id: UUID
+    component_count: int
+    relationship_count: int
+    components: tuple[ComponentDiff, ...] = ()
+    relationships: tuple[RelationshipDiff, ...] = ()
 
 
 @dataclass(slots=True)
-class RelationshipDiff:
-    source: str
-    target: str
-    change_type: Literal["added", "removed", "modified"]
-    previous_label: str | None = None
-    new_label: str | None = None
-    previous_direction: RelationshipDirection | None = None
-    new_direction: RelationshipDirection | None = None
+class _DiagramIndex:
+    """A diagram's components and relationships keyed by normalized names."""
+
+    components: Sequence[Component]
+    components_by_name: dict[str, Component]
+    # (normalized (source, target), source name, target name, relationship)
+    relationships: list[tuple[tuple[str, str], str, str, Relationship]]
 
 
 class DiagramService:
@@ -54,6 +70,8 @@ class DiagramService:
     _evaluation_completed_counter: Optional[Counter] = None
     _version_saved_counter: Optional[Counter] = None
     _diff_comparison_counter: Optional[Counter] = None
+    _parse_cache_hit_counter: Optional[Counter] = None
+    _parse_cache_miss_counter: Optional[Counter] = None
     _tracer: Any
 
     def __init__(
@@ -61,10 +79,16 @@ class DiagramService:
         repository: DiagramRepository,
         storage: DiagramStorage,
         parser: PlantUMLParser,
+        parse_cache: ParseResultCache | None = None,
+        diff_cache: DiffResultCache | None = None,
+        ownership_cache: OwnershipCache | None = None,
     ) -> None:
         self._repository = repository
         self._storage = storage
         self._parser = parser
+        self._parse_cache = parse_cache
+        self._diff_cache = diff_cache
+        self._ownership_cache = ownership_cache
 
         # Initialize OpenTelemetry metrics and tracer
         try:
@@ -98,6 +122,14 @@ class DiagramService:
                 "diff_comparison_total",
                 description="Total number of diagram diff comparisons",
             )
+            self._parse_cache_hit_counter = meter.create_counter(
+                "parse_cache_hits_total",
+                description="Total number of parse requests served from cache",
+            )
+            self._parse_cache_miss_counter = meter.create_counter(
+                "parse_cache_misses_total",
+                description="Total number of parse requests that ran the parser",
+            )
             self._tracer = trace.get_tracer(__name__)
         except Exception:
             # Fallback to no-op if telemetry is not available
@@ -108,6 +140,8 @@ class DiagramService:
             self._evaluation_completed_counter = None
             self._version_saved_counter = None
             self._diff_comparison_counter = None
+            self._parse_cache_hit_counter = None
+            self._parse_cache_miss_counter = None
             self._tracer = trace.NoOpTracer()
 
     def register_diagram(self, diagram: Diagram) -> Diagram:
@@ -119,6 +153,38 @@ class DiagramService:
             return None
         return diagram
 
+    def get_diagram_version(
+        self, user_id: UUID, diagram_id: UUID
+    ) -> DiagramVersion | None:
+        """Metadata and matrix version for conditional requests."""
+        version = self._repository.get_version(diagram_id)
+        if version and version.user_id != user_id:
+            return None
+        return version
+
+    def get_diagram_versions(
+        self, user_id: UUID, diagram_ids: Sequence[UUID]
+    ) -> dict[UUID, DiagramVersion]:
+        """``get_diagram_version`` for several diagrams in one read."""
+        versions = self._repository.get_versions(diagram_ids)
+        return {
+            diagram_id: version
+            for diagram_id, version in versions.items()
+            if version.user_id == user_id
+        }
+
+    def owned_by(self, user_id: UUID, diagram_ids: Sequence[UUID]) -> set[UUID]:
+        """The ids among ``diagram_ids`` the user owns; loads no diagram."""
+        cache = self._ownership_cache
+        owned = set() if cache is None else cache.owned(user_id, diagram_ids)
+        unknown = [diagram_id for diagram_id in diagram_ids if diagram_id not in owned]
+        if unknown:
+            found = self._repository.owned_by(user_id, unknown)
+            if cache is not None:
+                cache.remember(user_id, found)
+            owned |= found
+        return owned
+
     def list_diagrams(self, user_id: UUID) -> Iterable[Diagram]:
         return self._repository.list(user_id)
 
@@ -176,17 +242,20 @@ class DiagramService:
             if diagram.user_id != user_id:
                 raise DiagramNotFoundError(f"Diagram {diagram_id} not found")
 
-            # Read content from diagram (stored in DB)
-            if not diagram.content:
+            # Read content from diagram (stored in DB, fetched on first use)
+            content = diagram.load_content()
+            if not content:
                 diagram.mark_failed()
                 self._repository.update(diagram)
                 raise ParseError(f"Diagram {diagram_id} has no content")
 
-            file_size = len(diagram.content) if diagram.content else 0
+            file_size = len(content)
 
             # Parse content
             try:
-                components, relationships = self._parser.parse(diagram.content)
+                components, relationships = self._parse_content(
+                    diagram.checksum, content
+                )
                 parsing_duration = time.time() - start_time
                 component_count = len(components)
                 relationship_count = len(relationships)
@@ -254,29 +323,9 @@ class DiagramService:
                 span.add_event("parsing_failed", {"error": str(exc)})
                 raise ParseError(f"Failed to parse diagram: {exc}") from exc
 
-            for component in components:
-                component.diagram_id = diagram_id
-
-            id_mapping = self._sync_components(diagram_id, components)
-
-            for relationship in relationships:
-                relationship.diagram_id = diagram_id
-                if relationship.source_component_id in id_mapping:
-                    relationship.source_component_id = id_mapping[
-                        relationship.source_component_id
-                    ]
-                if relationship.target_component_id in id_mapping:
-                    relationship.target_component_id = id_mapping[
-                        relationship.target_component_id
-                    ]
-
-            # Replace relationships atomically (components are upserted)
-            self._repository.delete_relationships(diagram_id)
-            self._repository.add_relationships(relationships)
-
-            # Update diagram status
-            diagram.mark_parsed()
-            self._repository.update(diagram)
+            components, relationships = self._store_parse_result(
+                diagram, components, relationships
+            )
 
             # Track analytics event: matrix_populated (after parsing)
             span.add_event(
@@ -287,12 +336,189 @@ class DiagramService:
                 },
             )
 
-            return list(components), list(relationships)
+            return components, relationships
+
+    def upload_and_parse_diagram(
+        self,
+        user_id: UUID,
+        filename: str,
+        chunks: Iterable[bytes],
+        display_name: str | None = None,
+    ) -> tuple[Diagram, list[Component], list[Relationship]]:
+        """
+        Upload a diagram from a chunked byte stream and parse it in one go.
+
+        Each chunk is hashed, decoded and fed to the parser as it arrives,
+        so the raw payload is never held in memory as a whole and the
+        content is not re-read from the repository for parsing.
+        """
+        with self._tracer.start_as_current_span("diagram.upload_and_parse") as span:
+            start_time = time.time()
+            hasher = sha256()
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            stream = self._parser.open_stream()
+            text_parts: list[str] = []
+            file_size = 0
+
+            for chunk in chunks:
+                file_size += len(chunk)
+                hasher.update(chunk)
+                text = decoder.decode(chunk)
+                text_parts.append(text)
+                stream.feed(text)
+            tail = decoder.decode(b"", final=True)
+            text_parts.append(tail)
+            stream.feed(tail)
+
+            checksum = hasher.hexdigest()
+            existing = self._repository.find_by_checksum(user_id, checksum)
+            if existing:
+                raise DiagramAlreadyExistsError(existing.id)
+
+            try:
+                parsed_components, parsed_relationships = stream.finish()
+            except Exception as exc:
+                span.set_status(trace.Status(trace.StatusCode.ERROR, str(exc)))
+                span.add_event("parsing_failed", {"error": str(exc)})
+                if self._parsing_failed_counter:
+                    self._parsing_failed_counter.add(
+                        1, attributes={"error_type": type(exc).__name__}
+                    )
+                if isinstance(exc, ParseError):
+                    raise
+                raise ParseError(f"Failed to parse diagram: {exc}") from exc
+            parsing_duration = time.time() - start_time
+            if self._parse_cache is not None:
+                self._parse_cache.put(
+                    (checksum, self._parser.version),
+                    CachedParseResult.from_entities(
+                        parsed_components, parsed_relationships
+                    ),
+                )
+
+            diagram = Diagram(
+                user_id=user_id,
+                name=display_name or filename,
+                source_url=f"diagram://{filename}",
+                content="".join(text_parts),
+                checksum=checksum,
+            )
+            text_parts.clear()
+            diagram = self._repository.add(diagram)
+
+            components, relationships = self._store_parse_result(
+                diagram, parsed_components, parsed_relationships
+            )
+
+            if self._diagram_uploaded_counter:
+                self._diagram_uploaded_counter.add(
+                    1,
+                    attributes={
+                        "file_size_bytes": file_size,
+                        "diagram_id": str(diagram.id),
+                    },
+                )
+            if self._parsing_duration:
+                self._parsing_duration.record(
+                    parsing_duration,
+                    attributes={
+                        "file_size_bytes": file_size,
+                        "component_count": len(components),
+                        "status": "success",
+                    },
+                )
+            if self._parsing_succeeded_counter:
+                self._parsing_succeeded_counter.add(
+                    1,
+                    attributes={
+                        "diagram_id": str(diagram.id),
+                        "component_count": len(components),
+                        "relationship_count": len(relationships),
+                    },
+                )
+
+            span.set_attribute("diagram.id", str(diagram.id))
+            span.set_attribute("file.size_bytes", file_size)
+            span.set_attribute("parsing.duration_seconds", parsing_duration)
+            span.set_attribute("parsing.component_count", len(components))
+            span.set_attribute("parsing.relationship_count", len(relationships))
+            span.add_event("diagram_uploaded", {"diagram_id": str(diagram.id)})
+
+            return diagram, components, relationships
+
+    def _parse_content(
+        self, checksum: str, content: str
+    ) -> tuple[Sequence[Component], Sequence[Relationship]]:
+        """Parse content, reusing a cached result for identical content."""
+        if self._parse_cache is None:
+            return self._parser.parse(content)
+
+        key = (checksum, self._parser.version)
+        attributes = {"parser_version": self._parser.version}
+        cached = self._parse_cache.get(key)
+        if cached is not None:
+            if self._parse_cache_hit_counter:
+                self._parse_cache_hit_counter.add(1, attributes=attributes)
+            trace.get_current_span().set_attribute("parsing.cache_hit", True)
+            return cached.to_entities()
+
+        if self._parse_cache_miss_counter:
+            self._parse_cache_miss_counter.add(1, attributes=attributes)
+        trace.get_current_span().set_attribute("parsing.cache_hit", False)
+        components, relationships = self._parser.parse(content)
+        self._parse_cache.put(
+            key, CachedParseResult.from_entities(components, relationships)
+        )
+        return components, relationships
+
+    def _store_parse_result(
+        self,
+        diagram: Diagram,
+        components: Sequence[Component],
+        relationships: Sequence[Relationship],
+    ) -> tuple[list[Component], list[Relationship]]:
+        diagram_id = diagram.id
+        for component in components:
+            component.diagram_id = diagram_id
 
-    def _sync_components(
-        self, diagram_id: UUID, components: Sequence[Component]
-    ) -> Dict[UUID, UUID]:
         existing_components = self._repository.get_components(diagram_id)
+        id_mapping, added, updated, removed_ids = self._plan_component_sync(
+            diagram_id, existing_components, components
+        )
+
+        for relationship in relationships:
+            relationship.diagram_id = diagram_id
+            if relationship.source_component_id in id_mapping:
+                relationship.source_component_id = id_mapping[
+                    relationship.source_component_id
+                ]
+            if relationship.target_component_id in id_mapping:
+                relationship.target_component_id = id_mapping[
+                    relationship.target_component_id
+                ]
+
+        # Upsert components and replace relationships in one batch
+        self._repository.sync_components(
+            diagram_id, added, updated, removed_ids, relationships
+        )
+
+        # Update diagram status
+        diagram.mark_parsed()
+        self._repository.update(diagram)
+
+        return list(components), list(relationships)
+
+    def _plan_component_sync(
+        self,
+        diagram_id: UUID,
+        existing_components: Sequence[Component],
+        components: Sequence[Component],
+    ) -> tuple[Dict[UUID, UUID], list[Component], list[Component], list[UUID]]:
+        """Match parsed components to stored ones by normalized name.
+
+        Returns the parsed-id → persisted-id mapping together with the
+        components to add, the components to update and the ids to remove.
+        """
         existing_by_name = {
             self._normalize_name(component.name): component
             for component in existing_components
@@ -331,16 +557,7 @@ class DiagramService:
             if component.id not in final_ids
         ]
 
-        if obsolete_ids:
-            self._repository.delete_components(diagram_id, obsolete_ids)
-
-        if components_to_add:
-            self._repository.add_components(components_to_add)
-
-        if components_to_update:
-            self._repository.update_components(components_to_update)
-
-        return id_mapping
+        return id_mapping, components_to_add, components_to_update, obsolete_ids
 
     @staticmethod
     def _stable_component_id(diagram_id: UUID, component: Component) -> UUID:
@@ -353,33 +570,49 @@ class DiagramService:
         return " ".join(name.split()).lower()
 
     def diff_diagrams(
-        self, user_id: UUID, base_diagram_id: UUID, target_diagram_id: UUID
+        self,
+        user_id: UUID,
+        base_diagram_id: UUID,
+        target_diagram_id: UUID,
+        versions: Mapping[UUID, DiagramVersion] | None = None,
     ) -> tuple[list[ComponentDiff], list[RelationshipDiff]]:
+        """
+        Component and relationship changes from base to target.
+
+        ``versions`` are the user's versions as returned by
+        ``get_diagram_versions``; callers that already read them (e.g. for
+        an ETag) pass them in so the metadata is not read twice.
+        """
         with self._tracer.start_as_current_span("diagram.diff") as span:
-            base = self._repository.get(base_diagram_id)
-            target = self._repository.get(target_diagram_id)
+            # Metadata only: the key and the ownership check need no content
+            if versions is None:
+                versions = self.get_diagram_versions(
+                    user_id, [base_diagram_id, target_diagram_id]
+                )
+            base = versions.get(base_diagram_id)
+            target = versions.get(target_diagram_id)
             if base is None or target is None:
                 missing_id = base_diagram_id if base is None else target_diagram_id
                 raise DiagramNotFoundError(f"Diagram {missing_id} not found")
-            if base.user_id != user_id or target.user_id != user_id:
-                raise DiagramNotFoundError("Diagram not found")
-
-            base_components = self._repository.get_components(base_diagram_id)
-            target_components = self._repository.get_components(target_diagram_id)
-
-            components_diff = self._build_component_diff(
-                base_components=base_components, target_components=target_components
-            )
-
-            base_relationships = self._repository.get_relationships(base_diagram_id)
-            target_relationships = self._repository.get_relationships(target_diagram_id)
 
-            relationships_diff = self._build_relationship_diff(
-                base_components=base_components,
-                target_components=target_components,
-                base_relationships=base_relationships,
-                target_relationships=target_relationships,
+            key: DiffCacheKey = (
+                base.checksum,
+                base.parsed_at,
+                target.checksum,
+                target.parsed_at,
             )
+            cached = None if self._diff_cache is None else self._diff_cache.get(key)
+            if cached is not None:
+                components_diff = list(cached[0])
+                relationships_diff = list(cached[1])
+            else:
+                components_diff, relationships_diff = self._compute_diff(
+                    base_diagram_id, target_diagram_id
+                )
+                if self._diff_cache is not None:
+                    self._diff_cache.put(
+                        key, (tuple(components_diff), tuple(relationships_diff))
+                    )
 
             # Track analytics event: diff_comparison
             if self._diff_comparison_counter:
@@ -390,9 +623,11 @@ class DiagramService:
                         "target_diagram_id": str(target_diagram_id),
                         "component_changes": len(components_diff),
                         "relationship_changes": len(relationships_diff),
+                        "cache": "hit" if cached is not None else "miss",
                     },
                 )
 
+            span.set_attribute("diff.cache_hit", cached is not None)
             span.set_attribute("diff.component_changes", len(components_diff))
             span.set_attribute("diff.relationship_changes", len(relationships_diff))
             span.add_event(
@@ -405,19 +640,108 @@ class DiagramService:
 
             return components_diff, relationships_diff
 
+    def diagram_evolution(
+        self, user_id: UUID, diagram_ids: Sequence[UUID]
+    ) -> list[EvolutionStep]:
+        """
+        Diff each listed version against the one before it.
+
+        Components and relationships of all versions are loaded in one
+        batched read and every version is indexed once, so a middle version
+        serves as the target of one diff and the base of the next without
+        being loaded or indexed twice.
+        """
+        with self._tracer.start_as_current_span("diagram.evolution") as span:
+            owned = self.owned_by(user_id, diagram_ids)
+            for diagram_id in diagram_ids:
+                if diagram_id not in owned:
+                    raise DiagramNotFoundError(f"Diagram {diagram_id} not found")
+
+            components = self._repository.get_components_by_diagram(diagram_ids)
+            relationships = self._repository.get_relationships_by_diagram(
+                diagram_ids
+            )
+
+            steps: list[EvolutionStep] = []
+            indexes: dict[UUID, _DiagramIndex] = {}
+            previous: _DiagramIndex | None = None
+            for diagram_id in diagram_ids:
+                index = indexes.get(diagram_id)
+                if index is None:
+                    index = indexes[diagram_id] = self._index_diagram(
+                        components.get(diagram_id, ()),
+                        relationships.get(diagram_id, ()),
+                    )
+                component_diffs: list[ComponentDiff] = []
+                relationship_diffs: list[RelationshipDiff] = []
+                if previous is not None:
+                    component_diffs = self._build_component_diff(previous, index)
+                    relationship_diffs = self._build_relationship_diff(previous, index)
+                steps.append(
+                    EvolutionStep(
+                        diagram_id=diagram_id,
+                        component_count=len(index.components),
+                        relationship_count=len(index.relationships),
+                        components=tuple(component_diffs),
+                        relationships=tuple(relationship_diffs),
+                    )
+                )
+                previous = index
+
+            span.set_attribute("evolution.versions", len(diagram_ids))
+            return steps
+
+    def _compute_diff(
+        self, base_diagram_id: UUID, target_diagram_id: UUID
+    ) -> tuple[list[ComponentDiff], list[RelationshipDiff]]:
+        diagram_ids = [base_diagram_id, target_diagram_id]
+        components = self._repository.get_components_by_diagram(diagram_ids)
+        relationships = self._repository.get_relationships_by_diagram(diagram_ids)
+        base = self._index_diagram(
+            components[base_diagram_id], relationships[base_diagram_id]
+        )
+        target = self._index_diagram(
+            components[target_diagram_id], relationships[target_diagram_id]
+        )
+        return (
+            self._build_component_diff(base, target),
+            self._build_relationship_diff(base, target),
+        )
+
+    @classmethod
+    def _index_diagram(
+        cls,
+        components: Sequence[Component],
+        relationships: Sequence[Relationship],
+    ) -> _DiagramIndex:
+        names_by_id = {component.id: component.name for component in components}
+        indexed_relationships = []
+        for relationship in relationships:
+            source_name = names_by_id.get(relationship.source_component_id)
+            target_name = names_by_id.get(relationship.target_component_id)
+            if source_name and target_name:
+                key = (
+                    cls._normalize_name(source_name),
+                    cls._normalize_name(target_name),
+                )
+                indexed_relationships.append(
+                    (key, source_name, target_name, relationship)
+                )
+        return _DiagramIndex(
+            components=components,
+            components_by_name={
+                cls._normalize_name(component.name): component
+                for component in components
+            },
+            relationships=indexed_relationships,
+        )
+
+    @staticmethod
     def _build_component_diff(
-        self,
-        base_components: Sequence[Component],
-        target_components: Sequence[Component],
+        base: _DiagramIndex, target: _DiagramIndex
     ) -> list[ComponentDiff]:
-        base_by_name = {
-            self._normalize_name(component.name): component
-            for component in base_components
-        }
-        target_by_name = {
-            self._normalize_name(component.name): component
-            for component in target_components
-        }
+        base_by_name = base.components_by_name
+        target_by_name = target.components_by_name
 
         diffs: list[ComponentDiff] = []
 
@@ -457,42 +781,19 @@ class DiagramService:
 
         return diffs
 
+    @staticmethod
     def _build_relationship_diff(
-        self,
-        base_components: Sequence[Component],
-        target_components: Sequence[Component],
-        base_relationships: Sequence[Relationship],
-        target_relationships: Sequence[Relationship],
+        base: _DiagramIndex, target: _DiagramIndex
     ) -> list[RelationshipDiff]:
-        base_names_by_id = {
-            component.id: component.name for component in base_components
-        }
-        target_names_by_id = {
-            component.id: component.name for component in target_components
+        # Later duplicates of a (source, target) pair win on the base side
+        base_by_key = {
+            key: (source_name, target_name, relationship)
+            for key, source_name, target_name, relationship in base.relationships
         }
 
-        def _relationship_key(source_name: str, target_name: str) -> tuple[str, str]:
-            return (
-                self._normalize_name(source_name),
-                self._normalize_name(target_name),
-            )
-
-        base_by_key: dict[tuple[str, str], Relationship] = {}
-        for relationship in base_relationships:
-            source_name = base_names_by_id.get(relationship.source_component_id)
-            target_name = base_names_by_id.get(relationship.target_component_id)
-            if source_name and target_name:
-                base_by_key[_relationship_key(source_name, target_name)] = relationship
-
         diffs: list[RelationshipDiff] = []
 
-        for relationship in target_relationships:
-            source_name = target_names_by_id.get(relationship.source_component_id)
-            target_name = target_names_by_id.get(relationship.target_component_id)
-            if not source_name or not target_name:
-                continue
-
-            key = _relationship_key(source_name, target_name)
+        for key, source_name, target_name, relationship in target.relationships:
             if key not in base_by_key:
                 diffs.append(
                     RelationshipDiff(
@@ -505,7 +806,7 @@ class DiagramService:
                 )
                 continue
 
-            base_relationship = base_by_key.pop(key)
+            _, _, base_relationship = base_by_key.pop(key)
             if (
                 base_relationship.label != relationship.label
                 or base_relationship.direction != relationship.direction
@@ -523,18 +824,79 @@ class DiagramService:
                 )
 
         # Relationships removed from target
-        for key, relationship in base_by_key.items():
-            source_name = base_names_by_id.get(relationship.source_component_id)
-            target_name = base_names_by_id.get(relationship.target_component_id)
-            if source_name and target_name:
-                diffs.append(
-                    RelationshipDiff(
-                        source=source_name,
-                        target=target_name,
-                        change_type="removed",
-                        previous_label=relationship.label,
-                        previous_direction=relationship.direction,
-                    )
+        for source_name, target_name, relationship in base_by_key.values():
+            diffs.append(
+                RelationshipDiff(
+                    source=source_name,
+                    target=target_name,
+                    change_type="removed",
+                    previous_label=relationship.label,
+                    previous_direction=relationship.direction,
                 )
+            )
 
         return diffs
+
+
+class AsyncDiagramService:
+    """Read-side diagram use cases over the async repositories."""
+
+    def __init__(
+        self,
+        repository: AsyncDiagramRepository,
+        ownership_cache: OwnershipCache | None = None,
+    ) -> None:
+        self._repository = repository
+        self._ownership_cache = ownership_cache
+
+    async def owned_by(self, user_id: UUID, diagram_ids: Sequence[UUID]) -> set[UUID]:
+        """The ids among ``diagram_ids`` the user owns; loads no diagram."""
+        cache = self._ownership_cache
+        owned = set() if cache is None else cache.owned(user_id, diagram_ids)
+        unknown = [diagram_id for diagram_id in diagram_ids if diagram_id not in owned]
+        if unknown:
+            found = await self._repository.owned_by(user_id, unknown)
+            if cache is not None:
+                cache.remember(user_id, found)
+            owned |= found
+        return owned
+
+    async def get_diagram(self, user_id: UUID, diagram_id: UUID) -> Diagram | None:
+        diagram = await self._repository.get(diagram_id)
+        if diagram and diagram.user_id != user_id:
+            return None
+        return diagram
+
+    async def get_diagram_version(
+        self, user_id: UUID, diagram_id: UUID
+    ) -> DiagramVersion | None:
+        version = await self._repository.get_version(diagram_id)
+        if version and version.user_id != user_id:
+            return None
+        return version
+
+    async def get_diagram_content(self, version: DiagramVersion) -> str | None:
+        """PlantUML source of a diagram resolved by ``get_diagram_version``."""
+        return await self._repository.get_content(version.diagram_id)
+
+    async def list_diagrams(self, user_id: UUID) -> Sequence[Diagram]:
+        return await self._repository.list(user_id)
+
+    async def list_diagram_page(
+        self,
+        user_id: UUID,
+        limit: int | None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> tuple[Sequence[DiagramSummary], tuple[datetime, UUID] | None]:
+        """
+        One page of the user's diagrams and the keyset the next page starts
+        after, or ``None`` when this is the last page. Without a ``limit``
+        the page holds every remaining diagram.
+        """
+        if limit is None:
+            return await self._repository.list_page(user_id, None, after), None
+        summaries = await self._repository.list_page(user_id, limit + 1, after)
+        if len(summaries) <= limit:
+            return summaries, None
+        page = summaries[:limit]
+        return page, (page[-1].uploaded_at, page[-1].id)
@@ -1,3 +1,9 @@
-from .services import NFRService
+from .backfill import MatrixBackfillService, execute_backfill_job
+from .services import AsyncNFRService, NFRService
 
-__all__ = ["NFRService"]
+__all__ = [
+    "AsyncNFRService",
+    "MatrixBackfillService",
+    "NFRService",
+    "execute_backfill_job",
+]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable
+from uuid import UUID
+
+from app.domain.diagrams.matrix_repository import DiagramMatrixRepository
+from app.domain.nfr.entities import MatrixBackfillAction, MatrixBackfillJob
+from app.domain.nfr.repositories import NonFunctionalRequirementRepository
+
+from .ports import MatrixBackfillQueue
+
+logger = logging.getLogger(__name__)
+
+
+class MatrixBackfillService:
+    """Submits and tracks background propagation of NFRs to diagram matrices."""
+
+    def __init__(self, queue: MatrixBackfillQueue) -> None:
+        self._queue = queue
+
+    def submit(self, nfr_id: UUID, action: MatrixBackfillAction) -> MatrixBackfillJob:
+        job = MatrixBackfillJob(nfr_id=nfr_id, action=action)
+        self._queue.enqueue(job)
+        return job
+
+    def latest_job(self, nfr_id: UUID) -> MatrixBackfillJob | None:
+        return self._queue.latest_for_nfr(nfr_id)
+
+    def resume_removals(
+        self, nfr_repository: NonFunctionalRequirementRepository
+    ) -> list[MatrixBackfillJob]:
+        """
+        Queue removing the cells of every NFR still marked deleted, e.g.
+        because its job was lost with the process that queued it.
+        """
+        return [
+            self.submit(nfr_id, MatrixBackfillAction.REMOVE)
+            for nfr_id in nfr_repository.list_deleted_ids()
+        ]
+
+
+def execute_backfill_job(
+    job: MatrixBackfillJob,
+    queue: MatrixBackfillQueue,
+    matrix_repository: DiagramMatrixRepository,
+    nfr_repository: NonFunctionalRequirementRepository,
+    batch_size: int,
+    pause_seconds: float = 0.0,
+    sleep: Callable[[float], object] = time.sleep,
+) -> MatrixBackfillJob:
+    """
+    Walk all diagrams in batches of ``batch_size``, adding or removing the
+    job's NFR cells; never raises.
+
+    Each batch is its own transaction and the job's progress is saved after
+    every batch. Sleeping ``pause_seconds`` between batches leaves room for
+    interactive matrix edits. A removal deletes the NFR row, already marked
+    deleted, once its cells are gone, so the final cascade only has
+    stragglers left to drop.
+    """
+    job.mark_running(matrix_repository.count_diagrams())
+    queue.save(job)
+    try:
+        if job.action is MatrixBackfillAction.ADD:
+            if nfr_repository.get(job.nfr_id) is None:
+                # Deleted before the backfill got to run
+                job.mark_succeeded()
+                queue.save(job)
+                return job
+            process_batch = matrix_repository.add_nfr_cells
+        else:
+            process_batch = matrix_repository.remove_nfr_cells
+
+        after_diagram_id: UUID | None = None
+        while True:
+            diagram_ids = process_batch(job.nfr_id, after_diagram_id, batch_size)
+            job.record_batch(len(diagram_ids))
+            queue.save(job)
+            if not diagram_ids or len(diagram_ids) < batch_size:
+                break
+            after_diagram_id = diagram_ids[-1]
+            if pause_seconds > 0:
+                sleep(pause_seconds)
+
+        if job.action is MatrixBackfillAction.REMOVE:
+            nfr_repository.delete(job.nfr_id)
+    except Exception:
+        logger.exception("Matrix backfill job %s failed", job.id)
+        job.mark_failed("Internal error while updating diagram matrices")
+    else:
+        job.mark_succeeded()
+    queue.save(job)
+    return job
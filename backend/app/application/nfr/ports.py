@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from app.domain.nfr.entities import MatrixBackfillJob
+
+
+class MatrixBackfillQueue(ABC):
+    """Queue backend holding matrix backfill jobs and their latest state."""
+
+    @abstractmethod
+    def enqueue(self, job: MatrixBackfillJob) -> None:
+        """Register a new job and make it available to workers."""
+
+    @abstractmethod
+    def dequeue(self, timeout: float) -> MatrixBackfillJob | None:
+        """Claim the next queued job, waiting up to ``timeout`` seconds."""
+
+    @abstractmethod
+    def get(self, job_id: UUID) -> MatrixBackfillJob | None:
+        """Return the latest state of a job."""
+
+    @abstractmethod
+    def latest_for_nfr(self, nfr_id: UUID) -> MatrixBackfillJob | None:
+        """Return the most recently submitted job for an NFR."""
+
+    @abstractmethod
+    def save(self, job: MatrixBackfillJob) -> None:
+        """Persist a job state transition."""
@@ -2,16 +2,36 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from app.domain.nfr.entities import NonFunctionalRequirement
+from app.domain.nfr.entities import (
+    MatrixBackfillAction,
+    MatrixBackfillJob,
+    NonFunctionalRequirement,
+)
 from app.domain.nfr.exceptions import NFRAlreadyExistsError, NFRNotFoundError
-from app.domain.nfr.repositories import NonFunctionalRequirementRepository
+from app.domain.nfr.repositories import (
+    AsyncNonFunctionalRequirementRepository,
+    NonFunctionalRequirementRepository,
+)
+
+from .backfill import MatrixBackfillService
 
 
 class NFRService:
-    """Application service encapsulating NFR management use cases."""
+    """Application service encapsulating NFR management use cases.
+
+    With a backfill service, creating an NFR queues adding its cells to
+    every diagram matrix. Deleting one marks it deleted right away, which
+    hides it, its cells and its scores from every read, and queues removing
+    its cells; the backfill job deletes the row once they are gone.
+    """
 
-    def __init__(self, repository: NonFunctionalRequirementRepository) -> None:
+    def __init__(
+        self,
+        repository: NonFunctionalRequirementRepository,
+        backfill: MatrixBackfillService | None = None,
+    ) -> None:
         self._repository = repository
+        self._backfill = backfill
 
     def list_requirements(self) -> list[NonFunctionalRequirement]:
         return list(self._repository.list())
@@ -23,12 +43,62 @@ class NFRService:
         if existing:
             raise NFRAlreadyExistsError(f"NFR '{name}' already exists")
 
-        nfr = NonFunctionalRequirement(name=name, description=description)
-        return self._repository.add(nfr)
+        nfr = self._repository.add(
+            NonFunctionalRequirement(name=name, description=description)
+        )
+        if self._backfill is not None:
+            self._backfill.submit(nfr.id, MatrixBackfillAction.ADD)
+        return nfr
 
-    def delete_requirement(self, nfr_id: UUID) -> None:
+    def delete_requirement(self, nfr_id: UUID) -> MatrixBackfillJob | None:
+        """Delete the NFR; returns the job removing its cells, if any."""
         requirement = self._repository.get(nfr_id)
         if not requirement:
             raise NFRNotFoundError(f"NFR {nfr_id} not found")
 
+        if self._backfill is not None:
+            self._repository.mark_deleted(nfr_id)
+            return self._backfill.submit(nfr_id, MatrixBackfillAction.REMOVE)
         self._repository.delete(nfr_id)
+        return None
+
+
+class AsyncNFRService:
+    """NFRService counterpart for the async repositories."""
+
+    def __init__(
+        self,
+        repository: AsyncNonFunctionalRequirementRepository,
+        backfill: MatrixBackfillService | None = None,
+    ) -> None:
+        self._repository = repository
+        self._backfill = backfill
+
+    async def list_requirements(self) -> list[NonFunctionalRequirement]:
+        return list(await self._repository.list())
+
+    async def create_requirement(
+        self, name: str, description: str | None = None
+    ) -> NonFunctionalRequirement:
+        existing = await self._repository.get_by_name(name)
+        if existing:
+            raise NFRAlreadyExistsError(f"NFR '{name}' already exists")
+
+        nfr = await self._repository.add(
+            NonFunctionalRequirement(name=name, description=description)
+        )
+        if self._backfill is not None:
+            self._backfill.submit(nfr.id, MatrixBackfillAction.ADD)
+        return nfr
+
+    async def delete_requirement(self, nfr_id: UUID) -> MatrixBackfillJob | None:
+        """Delete the NFR; returns the job removing its cells, if any."""
+        requirement = await self._repository.get(nfr_id)
+        if not requirement:
+            raise NFRNotFoundError(f"NFR {nfr_id} not found")
+
+        if self._backfill is not None:
+            await self._repository.mark_deleted(nfr_id)
+            return self._backfill.submit(nfr_id, MatrixBackfillAction.REMOVE)
+        await self._repository.delete(nfr_id)
+        return None
@@ -4,6 +4,8 @@ from .exceptions import (
     UserNotFoundError,
     UserAlreadyExistsError,
     InvalidCredentialsError,
+    LoginRateLimitedError,
+    PasswordHashingBusyError,
 )
 
 __all__ = [
@@ -12,4 +14,6 @@ __all__ = [
     "UserNotFoundError",
     "UserAlreadyExistsError",
     "InvalidCredentialsError",
+    "LoginRateLimitedError",
+    "PasswordHashingBusyError",
 ]
@@ -8,3 +8,13 @@ class UserAlreadyExistsError(Exception):
 
 class InvalidCredentialsError(Exception):
     pass
+
+
+class PasswordHashingBusyError(Exception):
+    pass
+
+
+class LoginRateLimitedError(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Too many login attempts")
+        self.retry_after = retry_after
@@ -14,6 +14,10 @@ class UserRepository(ABC):
     def add(self, user: User) -> User:
         """Persist a new user."""
 
+    @abstractmethod
+    def update(self, user: User) -> User:
+        """Persist changes to an existing user."""
+
     @abstractmethod
     def get(self, user_id: UUID) -> Optional[User]:
         """Retrieve a user by its identifier."""
@@ -21,3 +25,23 @@ class UserRepository(ABC):
     @abstractmethod
     def get_by_email(self, email: str) -> Optional[User]:
         """Retrieve a user by email."""
+
+
+class AsyncUserRepository(ABC):
+    """Non-blocking counterpart of UserRepository."""
+
+    @abstractmethod
+    async def add(self, user: User) -> User:
+        """Persist a new user."""
+
+    @abstractmethod
+    async def update(self, user: User) -> User:
+        """Persist changes to an existing user."""
+
+    @abstractmethod
+    async def get(self, user_id: UUID) -> Optional[User]:
+        """Retrieve a user by its identifier."""
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Retrieve a user by email."""
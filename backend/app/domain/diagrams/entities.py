@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional
 from uuid import UUID, uuid4
 
 
@@ -16,15 +16,32 @@ class DiagramStatus(str, Enum):
 
 @dataclass(slots=True)
 class Diagram:
+    """A diagram version; ``content`` is ``None`` until loaded.
+
+    Repositories read diagrams without their source and attach a
+    ``content_loader`` instead, so metadata reads and ownership checks do
+    not transfer the whole file.
+    """
+
     user_id: UUID
     name: str
     source_url: str
-    content: str
+    content: Optional[str]
     checksum: str
     status: DiagramStatus = DiagramStatus.UPLOADED
     id: UUID = field(default_factory=uuid4)
     uploaded_at: datetime = field(default_factory=datetime.utcnow)
     parsed_at: Optional[datetime] = None
+    content_loader: Optional[Callable[[], Optional[str]]] = field(
+        default=None, repr=False, compare=False
+    )
+
+    def load_content(self) -> Optional[str]:
+        """The PlantUML source, fetched through ``content_loader`` on first use."""
+        if self.content is None and self.content_loader is not None:
+            self.content = self.content_loader()
+            self.content_loader = None
+        return self.content
 
     def mark_parsed(self) -> None:
         self.status = DiagramStatus.PARSED
@@ -34,6 +51,40 @@ class Diagram:
         self.status = DiagramStatus.FAILED
 
 
+@dataclass(frozen=True, slots=True)
+class DiagramVersion:
+    """What a diagram's HTTP representations depend on, without its content.
+
+    ``matrix_version`` increases with every write to the diagram's impact
+    matrix; checksum and ``parsed_at`` cover the diagram and its parse.
+    ``nfrs_deleted_at`` is the latest deletion of an NFR whose cells are
+    still stored: the matrix already reads without them before they are
+    removed and ``matrix_version`` moves.
+    """
+
+    diagram_id: UUID
+    user_id: UUID
+    checksum: str
+    status: DiagramStatus
+    parsed_at: Optional[datetime] = None
+    matrix_version: int = 0
+    nfrs_deleted_at: Optional[datetime] = None
+
+
+@dataclass(frozen=True, slots=True)
+class DiagramSummary:
+    """A diagram without its content, as shown in listings."""
+
+    id: UUID
+    user_id: UUID
+    name: str
+    source_url: str
+    checksum: str
+    status: DiagramStatus
+    uploaded_at: datetime
+    parsed_at: Optional[datetime] = None
+
+
 class ComponentType(str, Enum):
     COMPONENT = "component"
     INTERFACE = "interface"
@@ -83,3 +134,43 @@ class DiagramNFRComponentImpact:
     component_id: UUID
     impact: ImpactValue = ImpactValue.NO_EFFECT
     id: UUID = field(default_factory=uuid4)
+
+
+class ParseJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class ParseJob:
+    diagram_id: UUID
+    user_id: UUID
+    status: ParseJobStatus = ParseJobStatus.QUEUED
+    error: Optional[str] = None
+    component_count: Optional[int] = None
+    relationship_count: Optional[int] = None
+    id: UUID = field(default_factory=uuid4)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (ParseJobStatus.SUCCEEDED, ParseJobStatus.FAILED)
+
+    def mark_running(self) -> None:
+        self.status = ParseJobStatus.RUNNING
+        self.started_at = datetime.utcnow()
+
+    def mark_succeeded(self, component_count: int, relationship_count: int) -> None:
+        self.status = ParseJobStatus.SUCCEEDED
+        self.component_count = component_count
+        self.relationship_count = relationship_count
+        self.finished_at = datetime.utcnow()
+
+    def mark_failed(self, error: str) -> None:
+        self.status = ParseJobStatus.FAILED
+        self.error = error
+        self.finished_at = datetime.utcnow()
@@ -10,5 +10,13 @@ class DiagramNotFoundError(DiagramError):
     """Raised when a diagram cannot be located."""
 
 
+class DiagramContentNotLoadedError(DiagramError):
+    """Raised when an async read's diagram is asked for its source."""
+
+
 class ParseError(DiagramError):
     """Raised when PlantUML content cannot be parsed."""
+
+
+class UnknownMatrixAxisError(DiagramError):
+    """Raised when matrix cells reference NFRs or components the diagram lacks."""
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Iterable, Sequence
+from typing import Mapping, Sequence
 from uuid import UUID
 
 from .entities import DiagramNFRComponentImpact, ImpactValue
+from .scoring import ImpactMatrix, NFRScoreTotals
 
 
 class DiagramMatrixRepository(ABC):
@@ -24,17 +25,135 @@ class DiagramMatrixRepository(ABC):
     ) -> DiagramNFRComponentImpact:
         """Create or update a single matrix entry."""
 
-    @abstractmethod
-    def ensure_pairs(
+    def bulk_upsert(
         self,
         diagram_id: UUID,
-        pairs: Iterable[tuple[UUID, UUID]],
-        default_impact: ImpactValue = ImpactValue.NO_EFFECT,
+        cells: Sequence[tuple[UUID, UUID, ImpactValue]],
+    ) -> Sequence[DiagramNFRComponentImpact]:
+        """
+        Create or update many (nfr_id, component_id, impact) cells at once.
+
+        When a cell appears more than once the last impact wins. Persistent
+        implementations write all cells in one statement and one commit.
+        """
+        changes = {
+            (nfr_id, component_id): impact for nfr_id, component_id, impact in cells
+        }
+        return [
+            self.upsert(diagram_id, nfr_id, component_id, impact)
+            for (nfr_id, component_id), impact in changes.items()
+        ]
+
+    @abstractmethod
+    def initialize_cells(
+        self, diagram_id: UUID, default_impact: ImpactValue = ImpactValue.NO_EFFECT
     ) -> None:
-        """Ensure that matrix entries exist for provided (nfr_id, component_id) pairs."""
+        """
+        Make the matrix cover exactly the diagram's NFR × component pairs.
+
+        Missing pairs get a ``default_impact`` cell, existing cells keep
+        their impact and cells of components no longer in the diagram are
+        removed.
+        """
+
+    @abstractmethod
+    def count_diagrams(self) -> int:
+        """Number of diagrams an NFR backfill walks over."""
+
+    @abstractmethod
+    def add_nfr_cells(
+        self,
+        nfr_id: UUID,
+        after_diagram_id: UUID | None,
+        limit: int,
+        default_impact: ImpactValue = ImpactValue.NO_EFFECT,
+    ) -> Sequence[UUID]:
+        """
+        Give the next ``limit`` diagrams (ordered by id, starting after
+        ``after_diagram_id``) a ``default_impact`` cell for the NFR on each
+        component, in one transaction. Returns the ids of the diagrams
+        processed; fewer than ``limit`` means the walk is complete.
+        """
 
     @abstractmethod
-    def delete_missing_components(
-        self, diagram_id: UUID, component_ids: Iterable[UUID]
+    def remove_nfr_cells(
+        self, nfr_id: UUID, after_diagram_id: UUID | None, limit: int
+    ) -> Sequence[UUID]:
+        """Batch counterpart of ``add_nfr_cells`` deleting the NFR's cells."""
+
+    def load_impact_matrix(self, diagram_id: UUID) -> ImpactMatrix:
+        """
+        Load the diagram's cells as a dense matrix for scoring.
+
+        Persistent implementations override this to read only the
+        (nfr_id, component_id, impact) columns instead of full entries.
+        """
+        return ImpactMatrix.from_entries(self.list_by_diagram(diagram_id))
+
+    def load_score_totals(self, diagram_id: UUID) -> Sequence[NFRScoreTotals]:
+        """
+        Per-NFR score sums and entry counts for the diagram.
+
+        Persistent implementations keep these totals up to date on every
+        write (``upsert`` applies the old→new impact delta) so scoring an
+        edit does not read the matrix cells.
+        """
+        return self.load_impact_matrix(diagram_id).score_totals()
+
+    def load_score_totals_many(
+        self, diagram_ids: Sequence[UUID]
+    ) -> Mapping[UUID, Sequence[NFRScoreTotals]]:
+        """``load_score_totals`` for several diagrams, keyed by diagram."""
+        return {
+            diagram_id: self.load_score_totals(diagram_id)
+            for diagram_id in diagram_ids
+        }
+
+
+class AsyncDiagramMatrixRepository(ABC):
+    """Non-blocking counterpart of DiagramMatrixRepository."""
+
+    @abstractmethod
+    async def list_by_diagram(
+        self, diagram_id: UUID
+    ) -> Sequence[DiagramNFRComponentImpact]:
+        """Return all matrix entries for the diagram."""
+
+    @abstractmethod
+    async def upsert(
+        self,
+        diagram_id: UUID,
+        nfr_id: UUID,
+        component_id: UUID,
+        impact: ImpactValue,
+    ) -> DiagramNFRComponentImpact:
+        """Create or update a single matrix entry."""
+
+    async def bulk_upsert(
+        self,
+        diagram_id: UUID,
+        cells: Sequence[tuple[UUID, UUID, ImpactValue]],
+    ) -> Sequence[DiagramNFRComponentImpact]:
+        """Create or update many cells at once; the last impact per cell wins."""
+        changes = {
+            (nfr_id, component_id): impact for nfr_id, component_id, impact in cells
+        }
+        return [
+            await self.upsert(diagram_id, nfr_id, component_id, impact)
+            for (nfr_id, component_id), impact in changes.items()
+        ]
+
+    @abstractmethod
+    async def initialize_cells(
+        self, diagram_id: UUID, default_impact: ImpactValue = ImpactValue.NO_EFFECT
     ) -> None:
-        """Remove matrix entries for components that are no longer part of the diagram."""
+        """Make the matrix cover exactly the diagram's NFR × component pairs."""
+
+    async def load_impact_matrix(self, diagram_id: UUID) -> ImpactMatrix:
+        """Load the diagram's cells as a dense matrix for scoring."""
+        return ImpactMatrix.from_entries(await self.list_by_diagram(diagram_id))
+
+    async def load_score_totals(self, diagram_id: UUID) -> Sequence[NFRScoreTotals]:
+        """Per-NFR score sums and entry counts for the diagram."""
+        matrix = await self.load_impact_matrix(diagram_id)
+        return matrix.score_totals()
@@ -6,9 +6,30 @@ from typing import Sequence
 from .entities import Component, Relationship
 
 
+class PlantUMLParseStream(ABC):
+    """Incremental parse session fed with decoded PlantUML text chunks."""
+
+    @abstractmethod
+    def feed(self, text: str) -> None:
+        """Consume the next chunk of PlantUML text (may split lines)."""
+
+    @abstractmethod
+    def finish(self) -> tuple[Sequence[Component], Sequence[Relationship]]:
+        """
+        Complete the session and return the parsed result.
+
+        Raises:
+            ParseError: If the accumulated content cannot be parsed
+        """
+
+
 class PlantUMLParser(ABC):
     """Port for parsing PlantUML diagrams to extract components and relationships."""
 
+    # Identifies the parser output format; bump when parsing results change
+    # so cached results produced by older versions are not reused.
+    version: str = "unversioned"
+
     @abstractmethod
     def parse(self, content: str) -> tuple[Sequence[Component], Sequence[Relationship]]:
         """
@@ -23,3 +44,24 @@ class PlantUMLParser(ABC):
         Raises:
             ParseError: If the content cannot be parsed
         """
+
+    def open_stream(self) -> PlantUMLParseStream:
+        """
+        Start an incremental parse session.
+
+        Parsers without native streaming support buffer the text and
+        delegate to ``parse`` when the session finishes.
+        """
+        return _BufferedParseStream(self)
+
+
+class _BufferedParseStream(PlantUMLParseStream):
+    def __init__(self, parser: PlantUMLParser) -> None:
+        self._parser = parser
+        self._chunks: list[str] = []
+
+    def feed(self, text: str) -> None:
+        self._chunks.append(text)
+
+    def finish(self) -> tuple[Sequence[Component], Sequence[Relationship]]:
+        return self._parser.parse("".join(self._chunks))
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Iterable, Optional, Sequence
+from datetime import datetime
+from typing import Iterable, Mapping, Optional, Sequence
 from uuid import UUID
 
-from .entities import Component, Diagram, Relationship
+from .entities import (
+    Component,
+    Diagram,
+    DiagramSummary,
+    DiagramVersion,
+    Relationship,
+)
 
 
 class DiagramRepository(ABC):
@@ -16,12 +23,68 @@ class DiagramRepository(ABC):
 
     @abstractmethod
     def update(self, diagram: Diagram) -> Diagram:
-        """Update an existing diagram aggregate."""
+        """Update an existing diagram aggregate; content is never rewritten."""
 
     @abstractmethod
     def get(self, diagram_id: UUID) -> Optional[Diagram]:
         """Retrieve a diagram by its identifier."""
 
+    def get_content(self, diagram_id: UUID) -> Optional[str]:
+        """
+        Retrieve only the PlantUML source of a diagram.
+
+        Backs ``Diagram.load_content`` for diagrams read without their
+        source. Persistent implementations override it with a single-column
+        query.
+        """
+        diagram = self.get(diagram_id)
+        return diagram.load_content() if diagram else None
+
+    def get_version(self, diagram_id: UUID) -> Optional[DiagramVersion]:
+        """
+        Retrieve what the diagram's representations depend on.
+
+        The default implementation loads the whole diagram and has no
+        matrix to version. Persistent implementations override it with a
+        metadata-only query that includes the matrix version.
+        """
+        diagram = self.get(diagram_id)
+        if diagram is None:
+            return None
+        return DiagramVersion(
+            diagram_id=diagram.id,
+            user_id=diagram.user_id,
+            checksum=diagram.checksum,
+            status=diagram.status,
+            parsed_at=diagram.parsed_at,
+        )
+
+    def get_versions(
+        self, diagram_ids: Sequence[UUID]
+    ) -> Mapping[UUID, DiagramVersion]:
+        """``get_version`` for many diagrams; unknown ids are left out."""
+        versions = {
+            diagram_id: self.get_version(diagram_id) for diagram_id in diagram_ids
+        }
+        return {
+            diagram_id: version
+            for diagram_id, version in versions.items()
+            if version is not None
+        }
+
+    def owned_by(self, user_id: UUID, diagram_ids: Sequence[UUID]) -> set[UUID]:
+        """
+        The ids among ``diagram_ids`` that exist and belong to the user.
+
+        The default implementation reads the diagrams' versions; persistent
+        implementations override it with an index-only query.
+        """
+        return {
+            diagram_id
+            for diagram_id, version in self.get_versions(diagram_ids).items()
+            if version.user_id == user_id
+        }
+
     @abstractmethod
     def list(self, user_id: UUID) -> Iterable[Diagram]:
         """Return all diagrams for a user."""
@@ -56,6 +119,133 @@ class DiagramRepository(ABC):
     def get_relationships(self, diagram_id: UUID) -> Sequence[Relationship]:
         """Retrieve all relationships for a diagram."""
 
+    def get_components_by_diagram(
+        self, diagram_ids: Sequence[UUID]
+    ) -> Mapping[UUID, Sequence[Component]]:
+        """
+        Components of several diagrams at once, grouped by diagram.
+
+        The default implementation loads each diagram separately;
+        persistent implementations override it with one batched query.
+        """
+        return {
+            diagram_id: self.get_components(diagram_id) for diagram_id in diagram_ids
+        }
+
+    def get_relationships_by_diagram(
+        self, diagram_ids: Sequence[UUID]
+    ) -> Mapping[UUID, Sequence[Relationship]]:
+        """Relationships of several diagrams at once, grouped by diagram."""
+        return {
+            diagram_id: self.get_relationships(diagram_id)
+            for diagram_id in diagram_ids
+        }
+
     @abstractmethod
     def delete_relationships(self, diagram_id: UUID) -> None:
         """Remove all relationships for a diagram."""
+
+    def sync_components(
+        self,
+        diagram_id: UUID,
+        added: Sequence[Component],
+        updated: Sequence[Component],
+        removed_ids: Sequence[UUID],
+        relationships: Sequence[Relationship],
+    ) -> None:
+        """
+        Apply a parse result: component inserts, updates and deletes plus a
+        full replacement of the diagram's relationships.
+
+        The default implementation composes the fine-grained methods.
+        Persistent implementations override it to apply all changes in a
+        single transaction with batched statements.
+        """
+        if removed_ids:
+            self.delete_components(diagram_id, removed_ids)
+        if added:
+            self.add_components(added)
+        if updated:
+            self.update_components(updated)
+        self.delete_relationships(diagram_id)
+        self.add_relationships(relationships)
+
+
+class AsyncDiagramRepository(ABC):
+    """Non-blocking counterpart of DiagramRepository for async request paths.
+
+    Covers the read side plus ``sync_components``, which is the single
+    write path used to apply a parse result. Diagrams are read without
+    their source and cannot fetch it lazily, so ``Diagram.load_content``
+    raises DiagramContentNotLoadedError; fetch it with ``get_content``.
+    """
+
+    @abstractmethod
+    async def add(self, diagram: Diagram) -> Diagram:
+        """Persist a new diagram aggregate."""
+
+    @abstractmethod
+    async def update(self, diagram: Diagram) -> Diagram:
+        """Update an existing diagram aggregate; content is never rewritten."""
+
+    @abstractmethod
+    async def get(self, diagram_id: UUID) -> Optional[Diagram]:
+        """Retrieve a diagram by its identifier."""
+
+    @abstractmethod
+    async def get_version(self, diagram_id: UUID) -> Optional[DiagramVersion]:
+        """Retrieve diagram metadata and matrix version, without content."""
+
+    @abstractmethod
+    async def owned_by(
+        self, user_id: UUID, diagram_ids: Sequence[UUID]
+    ) -> set[UUID]:
+        """The ids among ``diagram_ids`` that exist and belong to the user."""
+
+    @abstractmethod
+    async def get_content(self, diagram_id: UUID) -> Optional[str]:
+        """Retrieve only the PlantUML source of a diagram."""
+
+    @abstractmethod
+    async def list(self, user_id: UUID) -> Sequence[Diagram]:
+        """Return all diagrams for a user."""
+
+    @abstractmethod
+    async def list_page(
+        self,
+        user_id: UUID,
+        limit: int | None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> Sequence[DiagramSummary]:
+        """
+        Up to ``limit`` (``None``: all) of a user's diagrams, newest first,
+        without content.
+
+        ``after`` is the ``(uploaded_at, id)`` of the last diagram of the
+        previous page; the page continues strictly after it.
+        """
+
+    @abstractmethod
+    async def find_by_checksum(
+        self, user_id: UUID, checksum: str
+    ) -> Optional[Diagram]:
+        """Retrieve a diagram by user_id and checksum to prevent duplicates."""
+
+    @abstractmethod
+    async def get_components(self, diagram_id: UUID) -> Sequence[Component]:
+        """Retrieve all components for a diagram."""
+
+    @abstractmethod
+    async def get_relationships(self, diagram_id: UUID) -> Sequence[Relationship]:
+        """Retrieve all relationships for a diagram."""
+
+    @abstractmethod
+    async def sync_components(
+        self,
+        diagram_id: UUID,
+        added: Sequence[Component],
+        updated: Sequence[Component],
+        removed_ids: Sequence[UUID],
+        relationships: Sequence[Relationship],
+    ) -> None:
+        """Apply a parse result in one transaction."""
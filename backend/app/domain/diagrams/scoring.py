@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Iterable, Sequence
+from uuid import UUID
+
+import numpy as np
+
+from .entities import DiagramNFRComponentImpact, ImpactValue
+
+IMPACT_SCORES: dict[ImpactValue, int] = {
+    ImpactValue.POSITIVE: 1,
+    ImpactValue.NO_EFFECT: 0,
+    ImpactValue.NEGATIVE: -1,
+}
+
+# Keyed by the plain string value so raw column values from the database
+# and ImpactValue members (a str subclass) both resolve
+_SCORES_BY_VALUE: dict[str, int] = {
+    impact.value: score for impact, score in IMPACT_SCORES.items()
+}
+
+# Compact code of each impact, used by the packed storage and the dense
+# matrix response: the score plus 2, leaving 0 for a pair without a cell
+# so every code fits in two bits
+ABSENT_IMPACT_CODE = 0
+IMPACT_CODES: dict[ImpactValue, int] = {
+    impact: score + 2 for impact, score in IMPACT_SCORES.items()
+}
+_CODE_SHIFTS = np.array([0, 2, 4, 6], dtype=np.uint8)
+
+_nfr_id = attrgetter("nfr_id")
+_component_id = attrgetter("component_id")
+_impact = attrgetter("impact")
+
+
+@dataclass(frozen=True, slots=True)
+class NFRScoreTotals:
+    """Running score sum and entry count of one NFR within a diagram."""
+
+    nfr_id: UUID
+    score_sum: int
+    entry_count: int
+
+
+def impact_delta(
+    previous: ImpactValue | None, current: ImpactValue
+) -> tuple[int, int]:
+    """
+    Change to an NFR's (score_sum, entry_count) when one of its cells goes
+    from ``previous`` (None for a new cell) to ``current``.
+    """
+    if previous is None:
+        return IMPACT_SCORES[current], 1
+    return IMPACT_SCORES[current] - IMPACT_SCORES[previous], 0
+
+
+def nfr_deltas(
+    changes: Iterable[tuple[UUID, ImpactValue | None, ImpactValue]],
+) -> dict[UUID, tuple[int, int]]:
+    """Sum ``impact_delta`` per NFR over (nfr_id, previous, current) changes."""
+    deltas: dict[UUID, tuple[int, int]] = {}
+    for nfr_id, previous, current in changes:
+        score_delta, count_delta = impact_delta(previous, current)
+        score_sum, entry_count = deltas.get(nfr_id, (0, 0))
+        deltas[nfr_id] = (score_sum + score_delta, entry_count + count_delta)
+    return deltas
+
+
+def scores_from_totals(
+    totals: Iterable[NFRScoreTotals],
+) -> tuple[dict[UUID, float], float | None]:
+    """Average impact per NFR and the mean of those averages."""
+    averages = {
+        total.nfr_id: total.score_sum / total.entry_count
+        for total in totals
+        if total.entry_count
+    }
+    overall_score: float | None = None
+    if averages:
+        overall_score = sum(averages.values()) / len(averages)
+    return averages, overall_score
+
+
+def pack_impact_codes(codes: np.ndarray) -> bytes:
+    """Four 2-bit codes per byte, row-major, lowest bits first."""
+    flat = codes.ravel().astype(np.uint8)
+    quads = np.zeros(-(-flat.size // 4) * 4, dtype=np.uint8)
+    quads[: flat.size] = flat
+    return np.bitwise_or.reduce(quads.reshape(-1, 4) << _CODE_SHIFTS, axis=1).tobytes()
+
+
+def unpack_impact_codes(data: bytes, shape: tuple[int, int]) -> np.ndarray:
+    """Inverse of ``pack_impact_codes`` for a matrix of ``shape``."""
+    packed = np.frombuffer(data, dtype=np.uint8)
+    codes = ((packed[:, np.newaxis] >> _CODE_SHIFTS) & 3).ravel()
+    return codes[: shape[0] * shape[1]].reshape(shape)
+
+
+def _first_seen_index(keys: Sequence[UUID]) -> dict[UUID, int]:
+    """Map each distinct key to its position of first appearance."""
+    return {key: position for position, key in enumerate(dict.fromkeys(keys))}
+
+
+@dataclass(frozen=True, slots=True)
+class ImpactMatrix:
+    """Dense NFR × component view of a diagram's impact matrix.
+
+    ``scores`` holds the impact score (-1, 0, 1) of every cell and
+    ``present`` marks which cells have a stored entry; missing cells do
+    not count towards an NFR's average. Rows follow the order in which
+    NFRs first appear in the input, columns likewise for components.
+    """
+
+    nfr_ids: tuple[UUID, ...]
+    component_ids: tuple[UUID, ...]
+    scores: np.ndarray
+    present: np.ndarray
+
+    @classmethod
+    def from_cells(
+        cls,
+        nfr_ids: Sequence[UUID],
+        component_ids: Sequence[UUID],
+        impacts: Sequence[str],
+    ) -> "ImpactMatrix":
+        """Build the matrix from parallel columns of cell values."""
+        nfr_index = _first_seen_index(nfr_ids)
+        component_index = _first_seen_index(component_ids)
+
+        shape = (len(nfr_index), len(component_index))
+        scores = np.zeros(shape, dtype=np.int8)
+        present = np.zeros(shape, dtype=bool)
+        if impacts:
+            # map() over bound lookups keeps the per-cell work out of the
+            # interpreter loop
+            rows = np.array(list(map(nfr_index.__getitem__, nfr_ids)), dtype=np.intp)
+            columns = np.array(
+                list(map(component_index.__getitem__, component_ids)), dtype=np.intp
+            )
+            scores[rows, columns] = np.array(
+                list(map(_SCORES_BY_VALUE.__getitem__, impacts)), dtype=np.int8
+            )
+            present[rows, columns] = True
+        return cls(
+            nfr_ids=tuple(nfr_index),
+            component_ids=tuple(component_index),
+            scores=scores,
+            present=present,
+        )
+
+    @classmethod
+    def from_entries(
+        cls, entries: Iterable[DiagramNFRComponentImpact]
+    ) -> "ImpactMatrix":
+        entries = list(entries)
+        return cls.from_cells(
+            list(map(_nfr_id, entries)),
+            list(map(_component_id, entries)),
+            list(map(_impact, entries)),
+        )
+
+    def impact_codes(self) -> np.ndarray:
+        """Row-major ``IMPACT_CODES`` of every cell, absent cells as 0."""
+        return np.where(self.present, self.scores + 2, ABSENT_IMPACT_CODE).astype(
+            np.uint8
+        )
+
+    def nfr_totals(self) -> tuple[np.ndarray, np.ndarray]:
+        """Per-NFR score sums and entry counts."""
+        # Absent cells hold 0, so they never change a sum
+        sums = self.scores.sum(axis=1, dtype=np.int64)
+        counts = self.present.sum(axis=1, dtype=np.int64)
+        return sums, counts
+
+    def score_totals(self) -> list[NFRScoreTotals]:
+        """Per-NFR totals for every NFR with at least one stored cell."""
+        sums, counts = self.nfr_totals()
+        return [
+            NFRScoreTotals(nfr_id=nfr_id, score_sum=score_sum, entry_count=count)
+            for nfr_id, score_sum, count in zip(
+                self.nfr_ids, sums.tolist(), counts.tolist()
+            )
+            if count
+        ]
+
+    def score(self) -> tuple[dict[UUID, float], float | None]:
+        """Average impact per NFR and the mean of those averages."""
+        sums, counts = self.nfr_totals()
+        scored = counts > 0
+        averages = (sums[scored] / counts[scored]).tolist()
+        nfr_ids = [nfr_id for nfr_id, keep in zip(self.nfr_ids, scored) if keep]
+
+        overall_score: float | None = None
+        if averages:
+            # Left-to-right float sum, as the per-entry implementation did,
+            # so results stay bit-identical (numpy uses pairwise summation)
+            overall_score = sum(averages) / len(averages)
+        return dict(zip(nfr_ids, averages)), overall_score
@@ -1,8 +1,16 @@
-from .entities import NonFunctionalRequirement
+from .entities import (
+    MatrixBackfillAction,
+    MatrixBackfillJob,
+    MatrixBackfillStatus,
+    NonFunctionalRequirement,
+)
 from .exceptions import NFRAlreadyExistsError, NFRNotFoundError
 from .repositories import NonFunctionalRequirementRepository
 
 __all__ = [
+    "MatrixBackfillAction",
+    "MatrixBackfillJob",
+    "MatrixBackfillStatus",
     "NonFunctionalRequirement",
     "NFRAlreadyExistsError",
     "NFRNotFoundError",
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from enum import Enum
+from typing import Optional
 from uuid import UUID, uuid4
 
 
@@ -11,3 +13,55 @@ class NonFunctionalRequirement:
     description: str | None = None
     id: UUID = field(default_factory=uuid4)
     created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class MatrixBackfillAction(str, Enum):
+    ADD = "add"
+    REMOVE = "remove"
+
+
+class MatrixBackfillStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class MatrixBackfillJob:
+    """Adds or removes one NFR's cells across all diagram matrices."""
+
+    nfr_id: UUID
+    action: MatrixBackfillAction
+    status: MatrixBackfillStatus = MatrixBackfillStatus.QUEUED
+    diagrams_total: Optional[int] = None
+    diagrams_done: int = 0
+    error: Optional[str] = None
+    id: UUID = field(default_factory=uuid4)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (
+            MatrixBackfillStatus.SUCCEEDED,
+            MatrixBackfillStatus.FAILED,
+        )
+
+    def mark_running(self, diagrams_total: int) -> None:
+        self.status = MatrixBackfillStatus.RUNNING
+        self.diagrams_total = diagrams_total
+        self.started_at = datetime.utcnow()
+
+    def record_batch(self, diagram_count: int) -> None:
+        self.diagrams_done += diagram_count
+
+    def mark_succeeded(self) -> None:
+        self.status = MatrixBackfillStatus.SUCCEEDED
+        self.finished_at = datetime.utcnow()
+
+    def mark_failed(self, error: str) -> None:
+        self.status = MatrixBackfillStatus.FAILED
+        self.error = error
+        self.finished_at = datetime.utcnow()
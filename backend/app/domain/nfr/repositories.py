@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Iterable, Optional
+from typing import Iterable, Optional, Sequence
 from uuid import UUID
 
 from .entities import NonFunctionalRequirement
@@ -29,3 +29,39 @@ class NonFunctionalRequirementRepository(ABC):
     @abstractmethod
     def delete(self, nfr_id: UUID) -> None:
         """Delete NFR by identifier."""
+
+    @abstractmethod
+    def mark_deleted(self, nfr_id: UUID) -> None:
+        """Hide an NFR from every read until ``delete`` removes it."""
+
+    @abstractmethod
+    def list_deleted_ids(self) -> Sequence[UUID]:
+        """Ids of NFRs marked deleted but not removed yet."""
+
+
+class AsyncNonFunctionalRequirementRepository(ABC):
+    """Non-blocking counterpart of NonFunctionalRequirementRepository."""
+
+    @abstractmethod
+    async def add(self, nfr: NonFunctionalRequirement) -> NonFunctionalRequirement:
+        """Persist a new NFR record."""
+
+    @abstractmethod
+    async def get(self, nfr_id: UUID) -> Optional[NonFunctionalRequirement]:
+        """Fetch NFR by identifier."""
+
+    @abstractmethod
+    async def get_by_name(self, name: str) -> Optional[NonFunctionalRequirement]:
+        """Fetch NFR by its unique name."""
+
+    @abstractmethod
+    async def list(self) -> Sequence[NonFunctionalRequirement]:
+        """List all NFRs."""
+
+    @abstractmethod
+    async def delete(self, nfr_id: UUID) -> None:
+        """Delete NFR by identifier."""
+
+    @abstractmethod
+    async def mark_deleted(self, nfr_id: UUID) -> None:
+        """Hide an NFR from every read until ``delete`` removes it."""
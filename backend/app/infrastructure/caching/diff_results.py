@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from app.application.diagrams.ports import CachedDiff, DiffCacheKey, DiffResultCache
+
+
+class LRUDiffResultCache(DiffResultCache):
+    """In-process LRU cache of diff results bounded by entry count.
+
+    Entries are never invalidated explicitly: re-parsing a diagram changes
+    its key, and the superseded entries age out.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[DiffCacheKey, CachedDiff] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: DiffCacheKey) -> CachedDiff | None:
+        with self._lock:
+            diff = self._entries.get(key)
+            if diff is not None:
+                self._entries.move_to_end(key)
+            return diff
+
+    def put(self, key: DiffCacheKey, diff: CachedDiff) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = diff
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Sequence
+from uuid import UUID
+
+from app.application.diagrams.ports import OwnershipCache
+
+
+class TTLOwnershipCache(OwnershipCache):
+    """In-process record of (user, diagram) ownership that expires after a TTL.
+
+    Only ownership is remembered, never its absence, so a diagram is usable
+    right after upload. The TTL bounds how long an answer may outlive a
+    change the process did not see.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._expiry: OrderedDict[tuple[UUID, UUID], float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def owned(self, user_id: UUID, diagram_ids: Sequence[UUID]) -> set[UUID]:
+        now = self._clock()
+        owned: set[UUID] = set()
+        with self._lock:
+            for diagram_id in diagram_ids:
+                key = (user_id, diagram_id)
+                expires_at = self._expiry.get(key)
+                if expires_at is None:
+                    continue
+                if expires_at <= now:
+                    del self._expiry[key]
+                    continue
+                owned.add(diagram_id)
+        return owned
+
+    def remember(self, user_id: UUID, diagram_ids: Iterable[UUID]) -> None:
+        if self._ttl_seconds <= 0 or self._max_entries <= 0:
+            return
+        expires_at = self._clock() + self._ttl_seconds
+        with self._lock:
+            for diagram_id in diagram_ids:
+                key = (user_id, diagram_id)
+                self._expiry[key] = expires_at
+                self._expiry.move_to_end(key)
+            # Insertion order is expiry order, so the oldest go first
+            while len(self._expiry) > self._max_entries:
+                self._expiry.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._expiry)
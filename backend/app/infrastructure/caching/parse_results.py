@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Final
+
+from app.application.diagrams.ports import (
+    CachedParseResult,
+    ParseCacheKey,
+    ParseResultCache,
+)
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class FileParseResultCache(ParseResultCache):
+    """Persistent cache tier storing one JSON document per key on disk."""
+
+    def __init__(self, root: Path) -> None:
+        self._root: Final[Path] = root
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: ParseCacheKey) -> CachedParseResult | None:
+        path = self._path_for(key)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return CachedParseResult(
+            components=tuple(tuple(item) for item in payload["components"]),
+            relationships=tuple(tuple(item) for item in payload["relationships"]),
+        )
+
+    def put(self, key: ParseCacheKey, result: CachedParseResult) -> None:
+        path = self._path_for(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "components": result.components,
+                    "relationships": result.relationships,
+                },
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+
+    def _path_for(self, key: ParseCacheKey) -> Path:
+        checksum, parser_version = key
+        name = _UNSAFE_FILENAME_CHARS.sub("_", f"{checksum}.{parser_version}")
+        return self._root / f"{name}.json"
+
+
+class LRUParseResultCache(ParseResultCache):
+    """In-process LRU cache bounded by entry count and approximate size.
+
+    An optional ``backing`` cache acts as a second, persistent tier: misses
+    fall through to it and hits are promoted back into memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 32 * 1024 * 1024,
+        backing: ParseResultCache | None = None,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._backing = backing
+        self._entries: OrderedDict[ParseCacheKey, tuple[CachedParseResult, int]] = (
+            OrderedDict()
+        )
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: ParseCacheKey) -> CachedParseResult | None:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached[0]
+
+        if self._backing is None:
+            return None
+        result = self._backing.get(key)
+        if result is not None:
+            self._remember(key, result)
+        return result
+
+    def put(self, key: ParseCacheKey, result: CachedParseResult) -> None:
+        self._remember(key, result)
+        if self._backing is not None:
+            self._backing.put(key, result)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def _remember(self, key: ParseCacheKey, result: CachedParseResult) -> None:
+        size = result.size_bytes()
+        if size > self._max_bytes or self._max_entries <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous[1]
+            self._entries[key] = (result, size)
+            self._size_bytes += size
+            while (
+                len(self._entries) > self._max_entries
+                or self._size_bytes > self._max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
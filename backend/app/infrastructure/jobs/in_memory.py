@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import queue
+import threading
+from collections import OrderedDict
+from typing import Generic, Protocol, TypeVar
+from uuid import UUID
+
+from app.application.diagrams.ports import ParseJobQueue
+from app.application.nfr.ports import MatrixBackfillQueue
+from app.domain.diagrams.entities import ParseJob
+from app.domain.nfr.entities import MatrixBackfillJob
+
+
+class _Job(Protocol):
+    @property
+    def id(self) -> UUID: ...
+
+    @property
+    def is_finished(self) -> bool: ...
+
+
+JobT = TypeVar("JobT", bound=_Job)
+
+
+class InMemoryJobQueue(Generic[JobT]):
+    """Process-local queue backend.
+
+    Job states are kept in insertion order; once more than ``max_jobs``
+    are tracked, the oldest finished jobs are forgotten.
+    """
+
+    def __init__(self, max_jobs: int = 1000) -> None:
+        self._max_jobs = max_jobs
+        self._pending: queue.Queue[UUID] = queue.Queue()
+        self._jobs: OrderedDict[UUID, JobT] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def enqueue(self, job: JobT) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict_finished()
+        self._pending.put(job.id)
+
+    def dequeue(self, timeout: float) -> JobT | None:
+        try:
+            job_id = self._pending.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def get(self, job_id: UUID) -> JobT | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def save(self, job: JobT) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+
+    def _evict_finished(self) -> None:
+        overflow = len(self._jobs) - self._max_jobs
+        if overflow <= 0:
+            return
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:overflow]:
+            del self._jobs[job_id]
+
+
+class InMemoryParseJobQueue(InMemoryJobQueue[ParseJob], ParseJobQueue):
+    """Process-local parse job queue."""
+
+
+class InMemoryMatrixBackfillQueue(
+    InMemoryJobQueue[MatrixBackfillJob], MatrixBackfillQueue
+):
+    """Process-local matrix backfill job queue."""
+
+    def latest_for_nfr(self, nfr_id: UUID) -> MatrixBackfillJob | None:
+        with self._lock:
+            return next(
+                (job for job in reversed(self._jobs.values()) if job.nfr_id == nfr_id),
+                None,
+            )
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Callable, Generic, Protocol, TypeVar
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+class _Job(Protocol):
+    @property
+    def id(self) -> UUID: ...
+
+
+JobT = TypeVar("JobT", bound=_Job)
+JobT_co = TypeVar("JobT_co", bound=_Job, covariant=True)
+
+
+class _JobSource(Protocol[JobT_co]):
+    def dequeue(self, timeout: float) -> JobT_co | None: ...
+
+
+class JobWorkerPool(Generic[JobT]):
+    """Fixed-size pool of background threads draining a job queue."""
+
+    def __init__(
+        self,
+        queue: _JobSource[JobT],
+        handler: Callable[[JobT], object],
+        workers: int = 2,
+        poll_interval: float = 0.5,
+        name: str = "job-worker",
+    ) -> None:
+        self._queue = queue
+        self._handler = handler
+        self._workers = workers
+        self._name = name
+        self._poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(
+                target=self._run, name=f"{self._name}-{index}", daemon=True
+            )
+            for index in range(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            job = self._queue.dequeue(self._poll_interval)
+            if job is None:
+                continue
+            try:
+                self._handler(job)
+            except Exception:
+                logger.exception("Unhandled error in job %s", job.id)
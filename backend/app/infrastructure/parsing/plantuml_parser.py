@@ -15,6 +15,8 @@ from app.domain.diagrams.parsers import PlantUMLParser
 class RegexPlantUMLParser(PlantUMLParser):
     """Simple regex-based parser for PlantUML component diagrams."""
 
+    version = "regex-1"
+
     def parse(self, content: str) -> tuple[list[Component], list[Relationship]]:
         """
         Parse PlantUML content to extract components and relationships.
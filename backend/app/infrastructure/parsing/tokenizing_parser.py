@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import io
+import re
+from typing import Iterable
+
+from app.domain.diagrams.entities import (
+    Component,
+    ComponentType,
+    Relationship,
+    RelationshipDirection,
+)
+from app.domain.diagrams.exceptions import ParseError
+from app.domain.diagrams.parsers import PlantUMLParser, PlantUMLParseStream
+
+# The patterns of RegexPlantUMLParser, applied to each line separately.
+# Each one scans independently, as there, so a relationship label such as
+# ``: uses [Cache]`` still declares a component; a cheap substring check
+# skips the scans a line cannot match. Keyword declarations are
+# case-insensitive as before.
+_BRACKET_PATTERN = re.compile(r"\[([^\]]+)\](?:\s+as\s+(\w+))?")
+_KEYWORD_PATTERNS: tuple[tuple[str, ComponentType, re.Pattern[str]], ...] = tuple(
+    (
+        keyword,
+        kind,
+        re.compile(rf'{keyword}\s+"([^"]+)"(?:\s+as\s+(\w+))?', re.IGNORECASE),
+    )
+    for keyword, kind in (
+        ("database", ComponentType.DATABASE),
+        ("queue", ComponentType.QUEUE),
+        ("actor", ComponentType.ACTOR),
+        ("system", ComponentType.SYSTEM),
+    )
+)
+_PARTICIPANT_PATTERN = re.compile(
+    r'participant\s+(?:"([^"]+)"|(\w+))(?:\s+as\s+(\w+))?', re.IGNORECASE
+)
+_RELATIONSHIP_PATTERN = re.compile(r"(\w+)\s*(<?-+>+)\s*(\w+)(?:\s*:\s*([^\n]+))?")
+
+# Declaration order used by RegexPlantUMLParser; components are emitted
+# grouped by kind in this order so both engines return identical lists.
+_KIND_ORDER: tuple[ComponentType, ...] = (
+    ComponentType.COMPONENT,
+    ComponentType.DATABASE,
+    ComponentType.QUEUE,
+    ComponentType.ACTOR,
+    ComponentType.INTERFACE,
+    ComponentType.SYSTEM,
+)
+
+
+class PlantUMLTokenStream(PlantUMLParseStream):
+    """Incremental, line-oriented PlantUML tokenizer.
+
+    Lines are consumed one at a time and only scanned for the elements
+    they can contain; only the declarations and relationship tokens found
+    so far are retained, so memory per line is bounded by the line itself.
+    Arbitrary text chunks can be fed with ``feed``; an incomplete trailing
+    line is held back until the next chunk or ``finish``.
+    """
+
+    def __init__(self) -> None:
+        self._declarations: dict[ComponentType, list[tuple[str, str | None]]] = {
+            kind: [] for kind in _KIND_ORDER
+        }
+        self._relationships: list[tuple[str, str, str, str | None]] = []
+        self._has_content = False
+        self._pending = ""
+
+    def feed(self, text: str) -> None:
+        if not text:
+            return
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self.feed_line(line)
+
+    def feed_line(self, line: str) -> None:
+        """Tokenize a single line of PlantUML source."""
+        if not line or line.isspace():
+            return
+        self._has_content = True
+
+        if "[" in line:
+            for match in _BRACKET_PATTERN.finditer(line):
+                self._declare(
+                    ComponentType.COMPONENT, match.group(1).strip(), match.group(2)
+                )
+        lowered = line.lower()
+        for keyword, kind, pattern in _KEYWORD_PATTERNS:
+            if keyword in lowered:
+                for match in pattern.finditer(line):
+                    self._declare(kind, match.group(1).strip(), match.group(2))
+        if "participant" in lowered:
+            for match in _PARTICIPANT_PATTERN.finditer(line):
+                name = (match.group(1) or match.group(2) or "").strip()
+                if name:
+                    self._declare(ComponentType.INTERFACE, name, match.group(3))
+        if "-" in line and ">" in line:
+            for match in _RELATIONSHIP_PATTERN.finditer(line):
+                label = match.group(4)
+                self._relationships.append(
+                    (
+                        match.group(1),
+                        match.group(2),
+                        match.group(3),
+                        label.strip() if label else None,
+                    )
+                )
+
+    def feed_lines(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.feed_line(line)
+
+    def finish(self) -> tuple[list[Component], list[Relationship]]:
+        """Resolve collected tokens into components and relationships."""
+        if self._pending:
+            self.feed_line(self._pending)
+            self._pending = ""
+        if not self._has_content:
+            raise ParseError("Empty PlantUML content")
+
+        alias_to_name: dict[str, str] = {}
+        for kind in _KIND_ORDER:
+            for name, alias in self._declarations[kind]:
+                if alias:
+                    alias_to_name[alias] = name
+
+        components: list[Component] = []
+        name_to_component: dict[str, Component] = {}
+        for kind in _KIND_ORDER:
+            for name, alias in self._declarations[kind]:
+                if name in name_to_component:
+                    continue
+                component = Component(
+                    diagram_id=None,  # type: ignore
+                    name=name,
+                    type=kind,
+                )
+                components.append(component)
+                name_to_component[name] = component
+                if alias:
+                    alias_to_name[alias] = name
+
+        relationships: list[Relationship] = []
+        for source_alias, arrow, target_alias, label in self._relationships:
+            source_comp = name_to_component.get(
+                alias_to_name.get(source_alias, source_alias)
+            )
+            target_comp = name_to_component.get(
+                alias_to_name.get(target_alias, target_alias)
+            )
+            if source_comp and target_comp:
+                relationships.append(
+                    Relationship(
+                        diagram_id=None,  # type: ignore
+                        source_component_id=source_comp.id,
+                        target_component_id=target_comp.id,
+                        label=label,
+                        direction=(
+                            RelationshipDirection.BIDIRECTIONAL
+                            if "<" in arrow
+                            else RelationshipDirection.UNIDIRECTIONAL
+                        ),
+                    )
+                )
+
+        return components, relationships
+
+    def _declare(self, kind: ComponentType, name: str, alias: str | None) -> None:
+        self._declarations[kind].append((name, alias))
+
+
+class TokenizingPlantUMLParser(PlantUMLParser):
+    """Single-pass, line-oriented parser for PlantUML component diagrams.
+
+    Supports the same syntax as RegexPlantUMLParser but walks the content
+    once, line by line, instead of once per element kind. Unlike it, no
+    declaration or relationship spans a line break.
+    """
+
+    version = "tokenizing-2"
+
+    def parse(self, content: str) -> tuple[list[Component], list[Relationship]]:
+        stream = PlantUMLTokenStream()
+        stream.feed_lines(io.StringIO(content))
+        return stream.finish()
+
+    def open_stream(self) -> PlantUMLTokenStream:
+        return PlantUMLTokenStream()
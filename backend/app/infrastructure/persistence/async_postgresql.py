@@ -0,0 +1,561 @@
+from __future__ import annotations
+
+from datetime import datetime
+from functools import partial
+from typing import NoReturn, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.auth.entities import User as UserEntity
+from app.domain.auth.repositories import AsyncUserRepository
+from app.domain.diagrams.entities import (
+    Component,
+    Diagram,
+    DiagramNFRComponentImpact,
+    DiagramSummary,
+    DiagramVersion,
+    ImpactValue,
+    Relationship,
+)
+from app.domain.diagrams.exceptions import (
+    DiagramContentNotLoadedError,
+    UnknownMatrixAxisError,
+)
+from app.domain.diagrams.matrix_repository import AsyncDiagramMatrixRepository
+from app.domain.diagrams.repositories import AsyncDiagramRepository
+from app.domain.diagrams.scoring import ImpactMatrix, NFRScoreTotals, nfr_deltas
+from app.domain.nfr.entities import NonFunctionalRequirement
+from app.domain.nfr.repositories import AsyncNonFunctionalRequirementRepository
+from app.infrastructure.persistence.models import (
+    ComponentModel,
+    DiagramModel,
+    NonFunctionalRequirementModel,
+    RelationshipModel,
+    UserModel,
+)
+from app.infrastructure.persistence.mapping import (
+    component_to_entity,
+    component_upsert_statement,
+    diagram_content_query,
+    diagram_ownership_query,
+    diagram_page_query,
+    diagram_summary_to_entity,
+    diagram_to_entity,
+    diagram_to_model,
+    diagram_version_query,
+    diagram_version_to_entity,
+    impact_cell_upsert_statement,
+    impact_cells_query,
+    impact_cells_for_update_query,
+    impact_columns,
+    impact_models_query,
+    impact_to_entity,
+    impact_upsert_statement,
+    initialize_cells_statement,
+    live_nfrs_query,
+    matrix_version_bump_statement,
+    nfr_mark_deleted_statement,
+    nfr_to_entity,
+    overwrote_unlocked_cells,
+    relationship_rows,
+    relationship_to_entity,
+    score_delta_statement,
+    score_totals_query,
+    score_totals_rebuild_statements,
+    score_totals_to_entities,
+    user_to_entity,
+    user_update_statement,
+)
+from app.infrastructure.persistence.packed_matrix import (
+    PackedMatrix,
+    live_packed_matrix_from_row,
+    matrix_component_ids_query,
+    matrix_nfr_ids_query,
+    packed_cell_to_entity,
+    packed_matrix_from_row,
+    packed_matrix_lock_statements,
+    packed_matrix_query,
+    packed_matrix_store_statement,
+    unknown_axis_ids_query,
+    with_deleted_nfr_ids,
+)
+from app.infrastructure.persistence.unit_of_work import commit_or_flush_async
+
+
+def _diagram_to_entity(model: DiagramModel) -> Diagram:
+    # A sync loader cannot await the content query, so asking for content
+    # fails loudly instead of quietly returning None
+    return diagram_to_entity(model, partial(_content_not_loaded, model.id))
+
+
+def _content_not_loaded(diagram_id: UUID) -> NoReturn:
+    raise DiagramContentNotLoadedError(
+        f"Content of diagram {diagram_id} is not loaded; fetch it with get_content"
+    )
+
+
+class AsyncPostgreSQLDiagramRepository(AsyncDiagramRepository):
+    """asyncpg-backed implementation of AsyncDiagramRepository."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def add(self, diagram: Diagram) -> Diagram:
+        try:
+            self._session.add(diagram_to_model(diagram))
+            await commit_or_flush_async(self._session)
+            return diagram
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def update(self, diagram: Diagram) -> Diagram:
+        try:
+            diagram_model = await self._session.get(DiagramModel, diagram.id)
+            if diagram_model is None:
+                raise ValueError(f"Diagram {diagram.id} does not exist")
+
+            diagram_model.name = diagram.name
+            diagram_model.source_url = diagram.source_url
+            diagram_model.checksum = diagram.checksum
+            diagram_model.status = diagram.status.value
+            diagram_model.uploaded_at = diagram.uploaded_at
+            diagram_model.parsed_at = diagram.parsed_at
+
+            await commit_or_flush_async(self._session)
+            return diagram
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def get(self, diagram_id: UUID) -> Optional[Diagram]:
+        result = await self._session.execute(
+            select(DiagramModel).where(DiagramModel.id == diagram_id)
+        )
+        model = result.scalars().first()
+        if model is None:
+            return None
+        return _diagram_to_entity(model)
+
+    async def get_version(self, diagram_id: UUID) -> Optional[DiagramVersion]:
+        result = await self._session.execute(diagram_version_query(diagram_id))
+        row = result.first()
+        if row is None:
+            return None
+        return diagram_version_to_entity(row)
+
+    async def owned_by(
+        self, user_id: UUID, diagram_ids: Sequence[UUID]
+    ) -> set[UUID]:
+        result = await self._session.scalars(
+            diagram_ownership_query(user_id, diagram_ids)
+        )
+        return set(result)
+
+    async def get_content(self, diagram_id: UUID) -> Optional[str]:
+        result = await self._session.execute(diagram_content_query(diagram_id))
+        return result.scalar_one_or_none()
+
+    async def list(self, user_id: UUID) -> Sequence[Diagram]:
+        result = await self._session.execute(
+            select(DiagramModel).where(DiagramModel.user_id == user_id)
+        )
+        return [_diagram_to_entity(model) for model in result.scalars()]
+
+    async def list_page(
+        self,
+        user_id: UUID,
+        limit: int | None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> Sequence[DiagramSummary]:
+        result = await self._session.execute(
+            diagram_page_query(user_id, limit, after)
+        )
+        return [diagram_summary_to_entity(row) for row in result]
+
+    async def find_by_checksum(
+        self, user_id: UUID, checksum: str
+    ) -> Optional[Diagram]:
+        result = await self._session.execute(
+            select(DiagramModel).where(
+                DiagramModel.user_id == user_id,
+                DiagramModel.checksum == checksum,
+            )
+        )
+        model = result.scalars().first()
+        if model is None:
+            return None
+        return _diagram_to_entity(model)
+
+    async def get_components(self, diagram_id: UUID) -> Sequence[Component]:
+        result = await self._session.execute(
+            select(ComponentModel).where(ComponentModel.diagram_id == diagram_id)
+        )
+        return [component_to_entity(model) for model in result.scalars()]
+
+    async def get_relationships(self, diagram_id: UUID) -> Sequence[Relationship]:
+        result = await self._session.execute(
+            select(RelationshipModel).where(
+                RelationshipModel.diagram_id == diagram_id
+            )
+        )
+        return [relationship_to_entity(model) for model in result.scalars()]
+
+    async def sync_components(
+        self,
+        diagram_id: UUID,
+        added: Sequence[Component],
+        updated: Sequence[Component],
+        removed_ids: Sequence[UUID],
+        relationships: Sequence[Relationship],
+    ) -> None:
+        try:
+            if removed_ids:
+                await self._session.execute(
+                    delete(ComponentModel).where(
+                        ComponentModel.diagram_id == diagram_id,
+                        ComponentModel.id.in_(list(removed_ids)),
+                    )
+                )
+
+            upserts = [*added, *updated]
+            if upserts:
+                await self._session.execute(
+                    component_upsert_statement(diagram_id, upserts)
+                )
+
+            await self._session.execute(
+                delete(RelationshipModel).where(
+                    RelationshipModel.diagram_id == diagram_id
+                )
+            )
+            if relationships:
+                await self._session.execute(
+                    insert(RelationshipModel),
+                    relationship_rows(diagram_id, relationships),
+                )
+            await commit_or_flush_async(self._session)
+        except Exception:
+            await self._session.rollback()
+            raise
+
+
+class AsyncPostgreSQLNFRRepository(AsyncNonFunctionalRequirementRepository):
+    """asyncpg-backed implementation for managing NFRs."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def add(self, nfr: NonFunctionalRequirement) -> NonFunctionalRequirement:
+        try:
+            self._session.add(
+                NonFunctionalRequirementModel(
+                    id=nfr.id,
+                    name=nfr.name,
+                    description=nfr.description,
+                    created_at=nfr.created_at,
+                )
+            )
+            await commit_or_flush_async(self._session)
+            return nfr
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def get(self, nfr_id: UUID) -> Optional[NonFunctionalRequirement]:
+        result = await self._session.execute(
+            live_nfrs_query().where(NonFunctionalRequirementModel.id == nfr_id)
+        )
+        model = result.scalars().first()
+        if model is None:
+            return None
+        return nfr_to_entity(model)
+
+    async def get_by_name(self, name: str) -> Optional[NonFunctionalRequirement]:
+        result = await self._session.execute(
+            live_nfrs_query().where(NonFunctionalRequirementModel.name == name)
+        )
+        model = result.scalars().first()
+        if model is None:
+            return None
+        return nfr_to_entity(model)
+
+    async def list(self) -> Sequence[NonFunctionalRequirement]:
+        result = await self._session.execute(
+            live_nfrs_query().order_by(NonFunctionalRequirementModel.name.asc())
+        )
+        return [nfr_to_entity(model) for model in result.scalars()]
+
+    async def delete(self, nfr_id: UUID) -> None:
+        try:
+            await self._session.execute(
+                delete(NonFunctionalRequirementModel).where(
+                    NonFunctionalRequirementModel.id == nfr_id
+                )
+            )
+            await commit_or_flush_async(self._session)
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def mark_deleted(self, nfr_id: UUID) -> None:
+        try:
+            await self._session.execute(nfr_mark_deleted_statement(nfr_id))
+            await commit_or_flush_async(self._session)
+        except Exception:
+            await self._session.rollback()
+            raise
+
+
+class AsyncPostgreSQLDiagramMatrixRepository(AsyncDiagramMatrixRepository):
+    """asyncpg-backed implementation for diagram matrix storage."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def list_by_diagram(
+        self, diagram_id: UUID
+    ) -> Sequence[DiagramNFRComponentImpact]:
+        result = await self._session.execute(impact_models_query(diagram_id))
+        return [impact_to_entity(model) for model in result.scalars()]
+
+    async def load_impact_matrix(self, diagram_id: UUID) -> ImpactMatrix:
+        result = await self._session.execute(impact_cells_query(diagram_id))
+        return ImpactMatrix.from_cells(*impact_columns(result.all()))
+
+    async def load_score_totals(self, diagram_id: UUID) -> Sequence[NFRScoreTotals]:
+        result = await self._session.execute(score_totals_query(diagram_id))
+        rows = result.all()
+        if not rows:
+            # No stored totals yet (empty matrix or cells written before
+            # totals were tracked); derive them from the cells
+            return await super().load_score_totals(diagram_id)
+        return score_totals_to_entities(rows)
+
+    async def upsert(
+        self,
+        diagram_id: UUID,
+        nfr_id: UUID,
+        component_id: UUID,
+        impact: ImpactValue,
+    ) -> DiagramNFRComponentImpact:
+        try:
+            result = await self._session.execute(
+                impact_cell_upsert_statement(diagram_id, nfr_id, component_id, impact)
+            )
+            row = result.one()
+            if not row.totals_updated or (
+                row.previous_impact is None and not row.inserted
+            ):
+                # Totals were missing, or a concurrent insert of the same
+                # cell won so the delta assumed a new cell
+                await self._rebuild_score_totals(diagram_id)
+            await self._session.execute(matrix_version_bump_statement([diagram_id]))
+            await commit_or_flush_async(self._session)
+            return impact_to_entity(row)
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def bulk_upsert(
+        self,
+        diagram_id: UUID,
+        cells: Sequence[tuple[UUID, UUID, ImpactValue]],
+    ) -> Sequence[DiagramNFRComponentImpact]:
+        changes = {
+            (nfr_id, component_id): impact for nfr_id, component_id, impact in cells
+        }
+        if not changes:
+            return []
+        try:
+            locked = await self._session.execute(
+                impact_cells_for_update_query(diagram_id, changes)
+            )
+            previous = {
+                (nfr_id, component_id): ImpactValue(impact)
+                for nfr_id, component_id, impact in locked
+            }
+            result = await self._session.execute(
+                impact_upsert_statement(diagram_id, changes)
+            )
+            rows = result.all()
+            if overwrote_unlocked_cells(rows, previous):
+                await self._rebuild_score_totals(diagram_id)
+            else:
+                await self._apply_score_deltas(
+                    diagram_id,
+                    nfr_deltas(
+                        (nfr_id, previous.get((nfr_id, component_id)), impact)
+                        for (nfr_id, component_id), impact in changes.items()
+                    ),
+                )
+            await self._session.execute(matrix_version_bump_statement([diagram_id]))
+            await commit_or_flush_async(self._session)
+            return [impact_to_entity(row) for row in rows]
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def initialize_cells(
+        self, diagram_id: UUID, default_impact: ImpactValue = ImpactValue.NO_EFFECT
+    ) -> None:
+        try:
+            await self._session.execute(
+                initialize_cells_statement(diagram_id, default_impact)
+            )
+            await self._session.execute(matrix_version_bump_statement([diagram_id]))
+            await commit_or_flush_async(self._session)
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def _apply_score_deltas(
+        self, diagram_id: UUID, deltas: dict[UUID, tuple[int, int]]
+    ) -> None:
+        for nfr_id, (score_delta, count_delta) in sorted(deltas.items()):
+            result = await self._session.execute(
+                score_delta_statement(diagram_id, nfr_id, score_delta, count_delta)
+            )
+            if result.rowcount == 0:
+                # Totals missing for this NFR, so a delta has nothing to
+                # apply to; rebuild the diagram's totals once from its cells
+                await self._rebuild_score_totals(diagram_id)
+                return
+
+    async def _rebuild_score_totals(self, diagram_id: UUID) -> None:
+        for statement in score_totals_rebuild_statements(diagram_id):
+            await self._session.execute(statement)
+
+
+class AsyncPackedPostgreSQLDiagramMatrixRepository(AsyncDiagramMatrixRepository):
+    """asyncpg-backed packed matrix storage (one row per diagram)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def list_by_diagram(
+        self, diagram_id: UUID
+    ) -> Sequence[DiagramNFRComponentImpact]:
+        return (await self._load(diagram_id)).entries(diagram_id)
+
+    async def load_impact_matrix(self, diagram_id: UUID) -> ImpactMatrix:
+        return (await self._load(diagram_id)).to_impact_matrix()
+
+    async def upsert(
+        self,
+        diagram_id: UUID,
+        nfr_id: UUID,
+        component_id: UUID,
+        impact: ImpactValue,
+    ) -> DiagramNFRComponentImpact:
+        entries = await self.bulk_upsert(diagram_id, [(nfr_id, component_id, impact)])
+        return entries[0]
+
+    async def bulk_upsert(
+        self,
+        diagram_id: UUID,
+        cells: Sequence[tuple[UUID, UUID, ImpactValue]],
+    ) -> Sequence[DiagramNFRComponentImpact]:
+        changes = {
+            (nfr_id, component_id): impact for nfr_id, component_id, impact in cells
+        }
+        if not changes:
+            return []
+        try:
+            matrix = await self._lock(diagram_id)
+            unknown = unknown_axis_ids_query(diagram_id, matrix, changes)
+            if unknown is not None and await self._session.scalar(unknown):
+                raise UnknownMatrixAxisError(diagram_id)
+            await self._store(diagram_id, matrix.with_cells(changes))
+            await commit_or_flush_async(self._session)
+        except Exception:
+            await self._session.rollback()
+            raise
+        return [
+            packed_cell_to_entity(diagram_id, nfr_id, component_id, impact)
+            for (nfr_id, component_id), impact in changes.items()
+        ]
+
+    async def initialize_cells(
+        self, diagram_id: UUID, default_impact: ImpactValue = ImpactValue.NO_EFFECT
+    ) -> None:
+        try:
+            matrix = await self._lock(diagram_id)
+            nfr_ids = (await self._session.scalars(matrix_nfr_ids_query())).all()
+            component_ids = (
+                await self._session.scalars(matrix_component_ids_query(diagram_id))
+            ).all()
+            await self._store(
+                diagram_id, matrix.covering(nfr_ids, component_ids, default_impact)
+            )
+            await commit_or_flush_async(self._session)
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def _load(self, diagram_id: UUID) -> PackedMatrix:
+        result = await self._session.execute(
+            with_deleted_nfr_ids(packed_matrix_query(diagram_id))
+        )
+        return live_packed_matrix_from_row(result.first())
+
+    async def _lock(self, diagram_id: UUID) -> PackedMatrix:
+        create, lock = packed_matrix_lock_statements(diagram_id)
+        await self._session.execute(create)
+        result = await self._session.execute(lock)
+        return packed_matrix_from_row(result.one())
+
+    async def _store(self, diagram_id: UUID, matrix: PackedMatrix) -> None:
+        await self._session.execute(packed_matrix_store_statement(diagram_id, matrix))
+        await self._session.execute(matrix_version_bump_statement([diagram_id]))
+
+
+class AsyncPostgreSQLUserRepository(AsyncUserRepository):
+    """asyncpg-backed implementation of AsyncUserRepository."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def add(self, user: UserEntity) -> UserEntity:
+        try:
+            self._session.add(
+                UserModel(
+                    id=user.id,
+                    email=user.email,
+                    hashed_password=user.hashed_password,
+                    created_at=user.created_at,
+                )
+            )
+            await commit_or_flush_async(self._session)
+            return user
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def update(self, user: UserEntity) -> UserEntity:
+        try:
+            result = await self._session.execute(user_update_statement(user))
+            if result.rowcount == 0:
+                raise ValueError(f"User {user.id} does not exist")
+            await commit_or_flush_async(self._session)
+            return user
+        except Exception:
+            await self._session.rollback()
+            raise
+
+    async def get(self, user_id: UUID) -> Optional[UserEntity]:
+        model = await self._session.get(UserModel, user_id)
+        if model is None:
+            return None
+        return user_to_entity(model)
+
+    async def get_by_email(self, email: str) -> Optional[UserEntity]:
+        result = await self._session.execute(
+            select(UserModel).where(UserModel.email == email)
+        )
+        model = result.scalars().first()
+        if model is None:
+            return None
+        return user_to_entity(model)
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from app.core.config import get_settings
 from app.infrastructure.persistence.models import Base
+from app.infrastructure.persistence.pool_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    track_pool_usage,
+)
 
 
 def get_database_url() -> str:
@@ -14,22 +22,90 @@ def get_database_url() -> str:
     return get_settings().database_url
 
 
+def _pool_options() -> dict:
+    settings = get_settings()
+    return {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_timeout": settings.database_pool_timeout_seconds,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+    }
+
+
 def create_engine_instance():
     """Create SQLAlchemy engine."""
-    return create_engine(
+    engine = create_engine(
         get_database_url(),
-        pool_pre_ping=True,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="sync",
+        echo=False,
+        **_pool_options(),
+    )
+    track_pool_usage(engine)
+    return engine
+
+
+def get_async_database_url() -> str:
+    """Database URL rewritten for the asyncpg driver."""
+    url = make_url(get_database_url())
+    return url.set(drivername="postgresql+asyncpg").render_as_string(
+        hide_password=False
+    )
+
+
+def create_async_engine_instance():
+    """Create SQLAlchemy async engine."""
+    engine = create_async_engine(
+        get_async_database_url(),
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_logging_name="async",
         echo=False,
+        **_pool_options(),
     )
+    track_pool_usage(engine.sync_engine)
+    return engine
 
 
 engine = create_engine_instance()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine_instance()
+# Entities are mapped eagerly, so attributes never need a lazy reload
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+# ``create_all`` only creates missing tables, so columns, constraints and
+# indexes added to existing tables are brought in here. Every statement must
+# be idempotent: they run on each startup.
+SCHEMA_UPGRADES = (
+    # Soft-deleted NFRs (``deleted_at``) free their name for a new NFR
+    "ALTER TABLE non_functional_requirements "
+    "ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE",
+    "ALTER TABLE non_functional_requirements "
+    "DROP CONSTRAINT IF EXISTS non_functional_requirements_name_key",
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_nfr_name "
+    "ON non_functional_requirements (name) WHERE deleted_at IS NULL",
+    # Keyset-paginated listing and index-only ownership checks
+    "CREATE INDEX IF NOT EXISTS ix_diagrams_user_uploaded_at_id "
+    "ON diagrams (user_id, uploaded_at, id)",
+    "CREATE INDEX IF NOT EXISTS ix_diagrams_id_user_id ON diagrams (id, user_id)",
+)
+
+
+def upgrade_schema(bind: Engine) -> None:
+    """Bring tables created by an earlier release up to the current models."""
+    with bind.begin() as connection:
+        for statement in SCHEMA_UPGRADES:
+            connection.execute(text(statement))
+
 
 def init_db() -> None:
     """Initialize database tables."""
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -39,3 +115,9 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -83,6 +83,23 @@ class InMemoryDiagramRepository(DiagramRepository):
     def delete_relationships(self, diagram_id: UUID) -> None:
         self._relationships.pop(diagram_id, None)
 
+    def sync_components(
+        self,
+        diagram_id: UUID,
+        added: Sequence[Component],
+        updated: Sequence[Component],
+        removed_ids: Sequence[UUID],
+        relationships: Sequence[Relationship],
+    ) -> None:
+        removed = set(removed_ids)
+        updated_by_id = {component.id: component for component in updated}
+        self._components[diagram_id] = [
+            updated_by_id.get(component.id, component)
+            for component in self._components.get(diagram_id, [])
+            if component.id not in removed
+        ] + list(added)
+        self._relationships[diagram_id] = list(relationships)
+
     def get_components(self, diagram_id: UUID) -> Sequence[Component]:
         return self._components.get(diagram_id, [])
 
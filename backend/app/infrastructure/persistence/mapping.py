@@ -0,0 +1,869 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Callable, Collection, Iterable, Mapping, Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import (
+    CTE,
+    ColumnElement,
+    Delete,
+    Insert,
+    Row,
+    Select,
+    Update,
+    and_,
+    case,
+    cast,
+    delete,
+    func,
+    inspect,
+    literal,
+    literal_column,
+    or_,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql.dml import ReturningInsert
+
+from app.domain.auth.entities import User as UserEntity
+from app.domain.diagrams.entities import (
+    Component,
+    ComponentType,
+    Diagram,
+    DiagramNFRComponentImpact,
+    DiagramStatus,
+    DiagramSummary,
+    DiagramVersion,
+    ImpactValue,
+    Relationship,
+    RelationshipDirection,
+)
+from app.domain.diagrams.scoring import IMPACT_SCORES, NFRScoreTotals
+from app.domain.nfr.entities import NonFunctionalRequirement
+from app.infrastructure.persistence.models import (
+    ComponentModel,
+    DiagramImpactModel,
+    DiagramMatrixVersionModel,
+    DiagramModel,
+    DiagramNFRScoreModel,
+    NonFunctionalRequirementModel,
+    RelationshipModel,
+    UserModel,
+)
+
+# Model <-> entity conversions shared by the sync and async PostgreSQL
+# repositories.
+
+
+def diagram_to_entity(
+    model: DiagramModel,
+    content_loader: Callable[[], str | None] | None = None,
+) -> Diagram:
+    """Content is copied when it was loaded, else left to ``content_loader``."""
+    content_loaded = "content" not in inspect(model).unloaded
+    return Diagram(
+        id=model.id,
+        user_id=model.user_id,
+        name=model.name,
+        source_url=model.source_url,
+        content=model.content if content_loaded else None,
+        checksum=model.checksum,
+        status=DiagramStatus(model.status),
+        uploaded_at=model.uploaded_at,
+        parsed_at=model.parsed_at,
+        content_loader=None if content_loaded else content_loader,
+    )
+
+
+def diagram_content_query(diagram_id: UUID) -> Select:
+    return select(DiagramModel.content).where(DiagramModel.id == diagram_id)
+
+
+def diagram_to_model(diagram: Diagram) -> DiagramModel:
+    return DiagramModel(
+        id=diagram.id,
+        user_id=diagram.user_id,
+        name=diagram.name,
+        source_url=diagram.source_url,
+        content=diagram.content,
+        checksum=diagram.checksum,
+        status=diagram.status.value,
+        uploaded_at=diagram.uploaded_at,
+        parsed_at=diagram.parsed_at,
+    )
+
+
+def component_to_entity(model: ComponentModel) -> Component:
+    return Component(
+        id=model.id,
+        diagram_id=model.diagram_id,
+        name=model.name,
+        type=ComponentType(model.type),
+        metadata=model.meta_data,
+    )
+
+
+def relationship_to_entity(model: RelationshipModel) -> Relationship:
+    return Relationship(
+        id=model.id,
+        diagram_id=model.diagram_id,
+        source_component_id=model.source_component_id,
+        target_component_id=model.target_component_id,
+        label=model.label,
+        direction=RelationshipDirection(model.direction),
+        metadata=model.meta_data,
+    )
+
+
+def relationship_rows(
+    diagram_id: UUID, relationships: Sequence[Relationship]
+) -> list[dict[str, Any]]:
+    """Parameter rows for an executemany ``INSERT`` into relationships."""
+    return [
+        {
+            "id": relationship.id,
+            "diagram_id": diagram_id,
+            "source_component_id": relationship.source_component_id,
+            "target_component_id": relationship.target_component_id,
+            "label": relationship.label,
+            "direction": relationship.direction.value,
+            "meta_data": relationship.metadata,
+        }
+        for relationship in relationships
+    ]
+
+
+def component_upsert_statement(diagram_id: UUID, components: Sequence[Component]):
+    """Multi-row ``INSERT ... ON CONFLICT (id) DO UPDATE`` for components."""
+    stmt = pg_insert(ComponentModel).values(
+        [
+            {
+                "id": component.id,
+                "diagram_id": diagram_id,
+                "name": component.name,
+                "type": component.type.value,
+                "meta_data": component.metadata,
+            }
+            for component in components
+        ]
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[ComponentModel.id],
+        set_={
+            "name": stmt.excluded.name,
+            "type": stmt.excluded.type,
+            "metadata": stmt.excluded["metadata"],
+        },
+    )
+
+
+def nfr_to_entity(model: NonFunctionalRequirementModel) -> NonFunctionalRequirement:
+    return NonFunctionalRequirement(
+        id=model.id,
+        name=model.name,
+        description=model.description,
+        created_at=model.created_at,
+    )
+
+
+def live_nfrs_query() -> Select:
+    """NFRs not marked deleted; the only ones reads and new cells see."""
+    return select(NonFunctionalRequirementModel).where(
+        NonFunctionalRequirementModel.deleted_at.is_(None)
+    )
+
+
+def deleted_nfr_ids_query() -> Select:
+    """Ids of NFRs marked deleted whose rows are still waiting for removal."""
+    return select(NonFunctionalRequirementModel.id).where(
+        NonFunctionalRequirementModel.deleted_at.is_not(None)
+    )
+
+
+def nfr_mark_deleted_statement(nfr_id: UUID) -> Update:
+    return (
+        update(NonFunctionalRequirementModel)
+        .where(
+            NonFunctionalRequirementModel.id == nfr_id,
+            NonFunctionalRequirementModel.deleted_at.is_(None),
+        )
+        .values(deleted_at=func.now())
+    )
+
+
+def impact_to_entity(model: DiagramImpactModel | Row) -> DiagramNFRComponentImpact:
+    return DiagramNFRComponentImpact(
+        id=model.id,
+        diagram_id=model.diagram_id,
+        nfr_id=model.nfr_id,
+        component_id=model.component_id,
+        impact=ImpactValue(model.impact),
+    )
+
+
+def _of_live_nfr(nfr_id: ColumnElement[UUID]) -> ColumnElement[bool]:
+    """Reads skip an NFR marked deleted while its cells wait for removal."""
+    return nfr_id.not_in(deleted_nfr_ids_query())
+
+
+def impact_models_query(diagram_id: UUID) -> Select:
+    return select(DiagramImpactModel).where(
+        DiagramImpactModel.diagram_id == diagram_id,
+        _of_live_nfr(DiagramImpactModel.nfr_id),
+    )
+
+
+def _impact_cells(diagram_id: UUID) -> Select:
+    return select(
+        DiagramImpactModel.nfr_id,
+        DiagramImpactModel.component_id,
+        DiagramImpactModel.impact,
+    ).where(DiagramImpactModel.diagram_id == diagram_id)
+
+
+def impact_cells_query(diagram_id: UUID) -> Select:
+    """Column-only projection of a diagram's matrix cells (no ORM entities)."""
+    return _impact_cells(diagram_id).where(_of_live_nfr(DiagramImpactModel.nfr_id))
+
+
+def impact_cells_for_update_query(
+    diagram_id: UUID, keys: Iterable[tuple[UUID, UUID]]
+) -> Select:
+    """Lock the given (nfr_id, component_id) cells and read their impacts."""
+    return (
+        _impact_cells(diagram_id)
+        .where(
+            tuple_(DiagramImpactModel.nfr_id, DiagramImpactModel.component_id).in_(
+                list(keys)
+            )
+        )
+        # A fixed lock order keeps concurrent batch edits from deadlocking
+        .order_by(DiagramImpactModel.nfr_id, DiagramImpactModel.component_id)
+        .with_for_update()
+    )
+
+
+def impact_upsert_statement(
+    diagram_id: UUID, changes: Mapping[tuple[UUID, UUID], ImpactValue]
+) -> ReturningInsert:
+    """
+    Multi-row ``INSERT ... ON CONFLICT DO UPDATE`` of matrix cells.
+
+    Each returned cell carries ``inserted``, telling whether this statement
+    created it or overwrote an existing one.
+    """
+    now = datetime.utcnow()
+    stmt = pg_insert(DiagramImpactModel).values(
+        [
+            {
+                "id": uuid4(),
+                "diagram_id": diagram_id,
+                "nfr_id": nfr_id,
+                "component_id": component_id,
+                "impact": impact.value,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for (nfr_id, component_id), impact in changes.items()
+        ]
+    )
+    return stmt.on_conflict_do_update(
+        constraint="uq_matrix_cell",
+        set_={"impact": stmt.excluded.impact, "updated_at": stmt.excluded.updated_at},
+    ).returning(
+        DiagramImpactModel.id,
+        DiagramImpactModel.diagram_id,
+        DiagramImpactModel.nfr_id,
+        DiagramImpactModel.component_id,
+        DiagramImpactModel.impact,
+        # xmax is 0 only for rows this statement inserted
+        literal_column("xmax = 0").label("inserted"),
+    )
+
+
+def overwrote_unlocked_cells(
+    rows: Sequence[Row], locked: Collection[tuple[UUID, UUID]]
+) -> bool:
+    """
+    Whether ``impact_upsert_statement`` updated a cell that was not among
+    the ``locked`` ones read before it.
+
+    That cell was inserted concurrently after the lock was taken, so its
+    old impact is unknown and score deltas cannot be derived; the caller
+    rebuilds the totals instead.
+    """
+    return any(
+        not row.inserted and (row.nfr_id, row.component_id) not in locked
+        for row in rows
+    )
+
+
+def impact_columns(
+    rows: Sequence[Row],
+) -> tuple[Sequence[UUID], Sequence[UUID], Sequence[str]]:
+    """Transpose ``impact_cells_query`` rows into parallel columns."""
+    if not rows:
+        return (), (), ()
+    nfr_ids, component_ids, impacts = zip(*rows)
+    return nfr_ids, component_ids, impacts
+
+
+def impact_cell_upsert_statement(
+    diagram_id: UUID, nfr_id: UUID, component_id: UUID, impact: ImpactValue
+) -> Select:
+    """
+    Write one matrix cell and apply its score delta in a single statement.
+
+    ``previous`` locks the cell and reads its old impact; the insert selects
+    from it, so the lock is taken before the write. The ``ON CONFLICT``
+    upsert writes the cell and ``totals`` applies the old→new delta. The
+    result row is the written cell plus ``previous_impact``, ``inserted``
+    and ``totals_updated``, which callers use to tell when the stored totals
+    need a rebuild.
+    """
+    previous = (
+        select(DiagramImpactModel.impact)
+        .where(
+            DiagramImpactModel.diagram_id == diagram_id,
+            DiagramImpactModel.nfr_id == nfr_id,
+            DiagramImpactModel.component_id == component_id,
+        )
+        .with_for_update()
+        .cte("previous")
+    )
+    previous_impact = select(previous.c.impact).scalar_subquery()
+
+    now = datetime.utcnow()
+    values = {
+        "id": uuid4(),
+        "diagram_id": diagram_id,
+        "nfr_id": nfr_id,
+        "component_id": component_id,
+        "impact": impact.value,
+        "created_at": now,
+        "updated_at": now,
+    }
+    columns = DiagramImpactModel.__table__.c
+    source = select(
+        *(cast(literal(value), columns[name].type) for name, value in values.items())
+    ).select_from(select(func.count()).select_from(previous).subquery())
+    insert_stmt = pg_insert(DiagramImpactModel).from_select(list(values), source)
+    upserted = (
+        insert_stmt.on_conflict_do_update(
+            constraint="uq_matrix_cell",
+            set_={
+                "impact": insert_stmt.excluded.impact,
+                "updated_at": insert_stmt.excluded.updated_at,
+            },
+        )
+        .returning(
+            DiagramImpactModel.id,
+            DiagramImpactModel.diagram_id,
+            DiagramImpactModel.nfr_id,
+            DiagramImpactModel.component_id,
+            DiagramImpactModel.impact,
+            # xmax is 0 only for rows this statement inserted
+            literal_column("xmax = 0").label("inserted"),
+        )
+        .cte("upserted")
+    )
+    totals = (
+        score_delta_statement(
+            diagram_id,
+            nfr_id,
+            IMPACT_SCORES[impact] - _impact_score(previous_impact),
+            case((previous_impact.is_(None), 1), else_=0),
+        )
+        .returning(DiagramNFRScoreModel.nfr_id)
+        .cte("totals")
+    )
+    return select(
+        upserted,
+        previous_impact.label("previous_impact"),
+        select(func.count())
+        .select_from(totals)
+        .scalar_subquery()
+        .label("totals_updated"),
+    )
+
+
+def initialize_cells_statement(
+    diagram_id: UUID, default_impact: ImpactValue
+) -> Insert:
+    """
+    Fill a diagram's matrix and refresh its score totals in one statement.
+
+    Inserts a ``default_impact`` cell for every missing live NFR × component pair
+    (``ON CONFLICT DO NOTHING`` keeps existing cells), deletes cells whose
+    component is no longer part of the diagram and upserts each NFR's
+    totals. All parts run on one snapshot, so the totals are computed from
+    the existing cells plus the defaults being added rather than read back.
+    """
+    cells = DiagramImpactModel
+    diagram_components = select(ComponentModel.id).where(
+        ComponentModel.diagram_id == diagram_id
+    )
+    diagram_id_value = literal(diagram_id, cells.diagram_id.type)
+    pairs = (
+        select(NonFunctionalRequirementModel.id, ComponentModel.id)
+        .select_from(NonFunctionalRequirementModel)
+        .join(ComponentModel, true())
+        .where(
+            ComponentModel.diagram_id == diagram_id,
+            NonFunctionalRequirementModel.deleted_at.is_(None),
+        )
+    )
+
+    orphans = (
+        delete(cells)
+        .where(
+            cells.diagram_id == diagram_id,
+            cells.component_id.not_in(diagram_components),
+        )
+        .returning(cells.id)
+        .cte("orphans")
+    )
+    filled = (
+        pg_insert(cells)
+        .from_select(
+            [
+                "id",
+                "diagram_id",
+                "nfr_id",
+                "component_id",
+                "impact",
+                "created_at",
+                "updated_at",
+            ],
+            pairs.with_only_columns(
+                func.gen_random_uuid(),
+                diagram_id_value,
+                NonFunctionalRequirementModel.id,
+                ComponentModel.id,
+                cast(literal(default_impact.value), cells.impact.type),
+                func.now(),
+                func.now(),
+            ),
+        )
+        .on_conflict_do_nothing(constraint="uq_matrix_cell")
+        .returning(cells.id)
+        .cte("filled")
+    )
+    # A diagram without components keeps no totals
+    emptied = (
+        delete(DiagramNFRScoreModel)
+        .where(
+            DiagramNFRScoreModel.diagram_id == diagram_id,
+            ~diagram_components.exists(),
+        )
+        .returning(DiagramNFRScoreModel.nfr_id)
+        .cte("emptied")
+    )
+
+    missing = func.count(ComponentModel.id) - func.count(cells.id)
+    totals = (
+        pairs.with_only_columns(
+            diagram_id_value,
+            NonFunctionalRequirementModel.id,
+            func.sum(_impact_score(cells.impact))
+            + missing * IMPACT_SCORES[default_impact],
+            func.count(ComponentModel.id),
+        )
+        .outerjoin(
+            cells,
+            and_(
+                cells.diagram_id == diagram_id,
+                cells.nfr_id == NonFunctionalRequirementModel.id,
+                cells.component_id == ComponentModel.id,
+            ),
+        )
+        .group_by(NonFunctionalRequirementModel.id)
+    )
+    stmt = pg_insert(DiagramNFRScoreModel).from_select(
+        ["diagram_id", "nfr_id", "score_sum", "entry_count"], totals
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[DiagramNFRScoreModel.diagram_id, DiagramNFRScoreModel.nfr_id],
+        set_={
+            "score_sum": stmt.excluded.score_sum,
+            "entry_count": stmt.excluded.entry_count,
+        },
+    ).add_cte(orphans, filled, emptied)
+
+
+def diagram_batch_query(after_diagram_id: UUID | None, limit: int) -> Select:
+    """The next ``limit`` diagram ids after ``after_diagram_id`` (keyset)."""
+    batch = select(DiagramModel.id).order_by(DiagramModel.id).limit(limit)
+    if after_diagram_id is not None:
+        batch = batch.where(DiagramModel.id > after_diagram_id)
+    return batch
+
+
+def _diagram_batch(after_diagram_id: UUID | None, limit: int) -> CTE:
+    return diagram_batch_query(after_diagram_id, limit).cte("batch")
+
+
+def nfr_cells_fill_statement(
+    nfr_id: UUID,
+    after_diagram_id: UUID | None,
+    limit: int,
+    default_impact: ImpactValue,
+) -> Select:
+    """
+    Add one NFR's default cells to the next batch of diagrams.
+
+    Every component of the diagrams in the batch gets a ``default_impact``
+    cell (``ON CONFLICT DO NOTHING`` keeps cells written concurrently, and
+    nothing is added once the NFR is marked deleted) and
+    the NFR's totals are upserted from the existing plus added cells.
+    Diagrams whose cells predate the totals table get no totals row, so
+    they keep being scored from their cells until rebuilt. Returns the
+    batch's diagram ids in order.
+    """
+    cells = DiagramImpactModel
+    totals_model = DiagramNFRScoreModel
+    batch = _diagram_batch(after_diagram_id, limit)
+    in_batch = select(batch.c.id)
+    nfr_id_value = literal(nfr_id, cells.nfr_id.type)
+
+    filled = (
+        pg_insert(cells)
+        .from_select(
+            [
+                "id",
+                "diagram_id",
+                "nfr_id",
+                "component_id",
+                "impact",
+                "created_at",
+                "updated_at",
+            ],
+            select(
+                func.gen_random_uuid(),
+                ComponentModel.diagram_id,
+                nfr_id_value,
+                ComponentModel.id,
+                cast(literal(default_impact.value), cells.impact.type),
+                func.now(),
+                func.now(),
+            ).where(
+                ComponentModel.diagram_id.in_(in_batch),
+                live_nfrs_query()
+                .where(NonFunctionalRequirementModel.id == nfr_id)
+                .exists(),
+            ),
+        )
+        .on_conflict_do_nothing(constraint="uq_matrix_cell")
+        .returning(cells.diagram_id)
+        .cte("filled")
+    )
+    # The statement's snapshot does not see the rows it inserts, so the
+    # new cells are counted from the insert's RETURNING rows
+    scored = (
+        select(
+            cells.diagram_id.label("diagram_id"),
+            _impact_score(cells.impact).label("score"),
+        )
+        .where(cells.nfr_id == nfr_id, cells.diagram_id.in_(in_batch))
+        .union_all(
+            select(
+                filled.c.diagram_id,
+                literal(IMPACT_SCORES[default_impact]),
+            )
+        )
+        .subquery("scored")
+    )
+    tracked = or_(
+        select(totals_model.diagram_id)
+        .where(totals_model.diagram_id == scored.c.diagram_id)
+        .exists(),
+        ~select(cells.id)
+        .where(cells.diagram_id == scored.c.diagram_id, cells.nfr_id != nfr_id)
+        .exists(),
+    )
+    totals_insert = pg_insert(totals_model).from_select(
+        ["diagram_id", "nfr_id", "score_sum", "entry_count"],
+        select(
+            scored.c.diagram_id,
+            nfr_id_value,
+            func.sum(scored.c.score),
+            func.count(),
+        )
+        .where(tracked)
+        .group_by(scored.c.diagram_id),
+    )
+    totals = (
+        totals_insert.on_conflict_do_update(
+            index_elements=[totals_model.diagram_id, totals_model.nfr_id],
+            set_={
+                "score_sum": totals_insert.excluded.score_sum,
+                "entry_count": totals_insert.excluded.entry_count,
+            },
+        )
+        .returning(totals_model.diagram_id)
+        .cte("totals")
+    )
+    return select(batch.c.id).order_by(batch.c.id).add_cte(totals)
+
+
+def nfr_cells_remove_statement(
+    nfr_id: UUID, after_diagram_id: UUID | None, limit: int
+) -> Select:
+    """
+    Remove one NFR's cells and totals from the next batch of diagrams.
+
+    Returns the batch's diagram ids in order.
+    """
+    batch = _diagram_batch(after_diagram_id, limit)
+    in_batch = select(batch.c.id)
+    removed = (
+        delete(DiagramImpactModel)
+        .where(
+            DiagramImpactModel.nfr_id == nfr_id,
+            DiagramImpactModel.diagram_id.in_(in_batch),
+        )
+        .returning(DiagramImpactModel.id)
+        .cte("removed")
+    )
+    dropped = (
+        delete(DiagramNFRScoreModel)
+        .where(
+            DiagramNFRScoreModel.nfr_id == nfr_id,
+            DiagramNFRScoreModel.diagram_id.in_(in_batch),
+        )
+        .returning(DiagramNFRScoreModel.diagram_id)
+        .cte("dropped")
+    )
+    return select(batch.c.id).order_by(batch.c.id).add_cte(removed, dropped)
+
+
+def score_totals_query(diagram_id: UUID) -> Select:
+    return select(
+        DiagramNFRScoreModel.nfr_id,
+        DiagramNFRScoreModel.score_sum,
+        DiagramNFRScoreModel.entry_count,
+    ).where(
+        DiagramNFRScoreModel.diagram_id == diagram_id,
+        _of_live_nfr(DiagramNFRScoreModel.nfr_id),
+    )
+
+
+def score_totals_many_query(diagram_ids: Collection[UUID]) -> Select:
+    return select(
+        DiagramNFRScoreModel.diagram_id,
+        DiagramNFRScoreModel.nfr_id,
+        DiagramNFRScoreModel.score_sum,
+        DiagramNFRScoreModel.entry_count,
+    ).where(
+        DiagramNFRScoreModel.diagram_id.in_(list(diagram_ids)),
+        _of_live_nfr(DiagramNFRScoreModel.nfr_id),
+    )
+
+
+def score_totals_to_entities(rows: Sequence[Row]) -> list[NFRScoreTotals]:
+    return [
+        NFRScoreTotals(nfr_id=nfr_id, score_sum=score_sum, entry_count=entry_count)
+        for nfr_id, score_sum, entry_count in rows
+    ]
+
+
+def score_delta_statement(
+    diagram_id: UUID,
+    nfr_id: UUID,
+    score_delta: int | ColumnElement[int],
+    count_delta: int | ColumnElement[int],
+) -> Update:
+    """Apply an impact delta to one NFR's stored totals."""
+    return (
+        update(DiagramNFRScoreModel)
+        .where(
+            DiagramNFRScoreModel.diagram_id == diagram_id,
+            DiagramNFRScoreModel.nfr_id == nfr_id,
+        )
+        .values(
+            score_sum=DiagramNFRScoreModel.score_sum + score_delta,
+            entry_count=DiagramNFRScoreModel.entry_count + count_delta,
+        )
+    )
+
+
+def score_totals_rebuild_statements(diagram_id: UUID) -> tuple[Delete, Insert]:
+    """
+    Recompute a diagram's stored totals from its impact cells.
+
+    Used after bulk matrix changes and to backfill diagrams whose cells
+    predate the totals table; single-cell edits use score_delta_statement.
+    """
+    totals = (
+        select(
+            DiagramImpactModel.diagram_id,
+            DiagramImpactModel.nfr_id,
+            func.sum(_impact_score(DiagramImpactModel.impact)),
+            func.count(),
+        )
+        .where(DiagramImpactModel.diagram_id == diagram_id)
+        .group_by(DiagramImpactModel.diagram_id, DiagramImpactModel.nfr_id)
+    )
+    return (
+        delete(DiagramNFRScoreModel).where(
+            DiagramNFRScoreModel.diagram_id == diagram_id
+        ),
+        DiagramNFRScoreModel.__table__.insert().from_select(
+            ["diagram_id", "nfr_id", "score_sum", "entry_count"], totals
+        ),
+    )
+
+
+def diagram_versions_query(diagram_ids: Collection[UUID]) -> Select:
+    """Diagram metadata plus matrix version; never touches ``content``."""
+    return (
+        select(
+            DiagramModel.id,
+            DiagramModel.user_id,
+            DiagramModel.checksum,
+            DiagramModel.status,
+            DiagramModel.parsed_at,
+            func.coalesce(DiagramMatrixVersionModel.version, 0).label(
+                "matrix_version"
+            ),
+            select(func.max(NonFunctionalRequirementModel.deleted_at))
+            .scalar_subquery()
+            .label("nfrs_deleted_at"),
+        )
+        .outerjoin(
+            DiagramMatrixVersionModel,
+            DiagramMatrixVersionModel.diagram_id == DiagramModel.id,
+        )
+        .where(DiagramModel.id.in_(list(diagram_ids)))
+    )
+
+
+def diagram_ownership_query(user_id: UUID, diagram_ids: Collection[UUID]) -> Select:
+    """Ids among ``diagram_ids`` owned by the user; answered from an index."""
+    return select(DiagramModel.id).where(
+        DiagramModel.id.in_(list(diagram_ids)), DiagramModel.user_id == user_id
+    )
+
+
+def diagram_version_query(diagram_id: UUID) -> Select:
+    return diagram_versions_query([diagram_id])
+
+
+def diagram_page_query(
+    user_id: UUID, limit: int | None, after: tuple[datetime, UUID] | None = None
+) -> Select:
+    """
+    A user's diagrams newest first, keyset-paginated on ``(uploaded_at, id)``.
+
+    Selects the listing columns only, so ``content`` is never read. A
+    ``limit`` of ``None`` selects every diagram after ``after``.
+    """
+    page = (
+        select(
+            DiagramModel.id,
+            DiagramModel.user_id,
+            DiagramModel.name,
+            DiagramModel.source_url,
+            DiagramModel.checksum,
+            DiagramModel.status,
+            DiagramModel.uploaded_at,
+            DiagramModel.parsed_at,
+        )
+        .where(DiagramModel.user_id == user_id)
+        .order_by(DiagramModel.uploaded_at.desc(), DiagramModel.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        page = page.where(
+            tuple_(DiagramModel.uploaded_at, DiagramModel.id) < tuple_(*after)
+        )
+    return page
+
+
+def diagram_summary_to_entity(row: Row) -> DiagramSummary:
+    return DiagramSummary(
+        id=row.id,
+        user_id=row.user_id,
+        name=row.name,
+        source_url=row.source_url,
+        checksum=row.checksum,
+        status=DiagramStatus(row.status),
+        uploaded_at=row.uploaded_at,
+        parsed_at=row.parsed_at,
+    )
+
+
+def group_by_diagram(
+    entities: Iterable[Component] | Iterable[Relationship],
+    diagram_ids: Iterable[UUID],
+) -> dict[UUID, list[Any]]:
+    """Bucket entities per diagram, with an empty list for every id."""
+    grouped: dict[UUID, list[Any]] = {diagram_id: [] for diagram_id in diagram_ids}
+    for entity in entities:
+        grouped[entity.diagram_id].append(entity)
+    return grouped
+
+
+def diagram_version_to_entity(row: Row) -> DiagramVersion:
+    return DiagramVersion(
+        diagram_id=row.id,
+        user_id=row.user_id,
+        checksum=row.checksum,
+        status=DiagramStatus(row.status),
+        parsed_at=row.parsed_at,
+        matrix_version=row.matrix_version,
+        nfrs_deleted_at=row.nfrs_deleted_at,
+    )
+
+
+def matrix_version_bump_statement(diagram_ids: Iterable[UUID]) -> Insert:
+    """
+    Increment the matrix version of each diagram, creating it at 1.
+
+    Rows are written in id order so concurrent multi-diagram bumps take
+    their row locks in the same order. Matrix writers bump last, after
+    their cell and totals writes.
+    """
+    return (
+        pg_insert(DiagramMatrixVersionModel)
+        .values(
+            [
+                {"diagram_id": diagram_id, "version": 1}
+                for diagram_id in sorted(diagram_ids)
+            ]
+        )
+        .on_conflict_do_update(
+            index_elements=[DiagramMatrixVersionModel.diagram_id],
+            set_={"version": DiagramMatrixVersionModel.version + 1},
+        )
+    )
+
+
+def _impact_score(impact: ColumnElement[str]) -> ColumnElement[int]:
+    """SQL counterpart of IMPACT_SCORES; NULL (no cell) scores 0."""
+    return case(
+        *((impact == value.value, score) for value, score in IMPACT_SCORES.items()),
+        else_=0,
+    )
+
+
+def user_update_statement(user: UserEntity) -> Update:
+    """Write a user's mutable fields by primary key, without loading it."""
+    return (
+        update(UserModel)
+        .where(UserModel.id == user.id)
+        .values(email=user.email, hashed_password=user.hashed_password)
+    )
+
+
+def user_to_entity(model: UserModel) -> UserEntity:
+    return UserEntity(
+        id=model.id,
+        email=model.email,
+        hashed_password=model.hashed_password,
+        created_at=model.created_at,
+    )
@@ -4,8 +4,20 @@ from datetime import datetime
 from typing import Dict
 from uuid import UUID, uuid4
 
-from sqlalchemy import JSON, String, Text, DateTime, ForeignKey, Enum, UniqueConstraint
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import (
+    JSON,
+    String,
+    Text,
+    DateTime,
+    ForeignKey,
+    Enum,
+    Index,
+    Integer,
+    LargeBinary,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PGUUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -36,6 +48,10 @@ class DiagramModel(Base):
     __tablename__ = "diagrams"
     __table_args__ = (
         UniqueConstraint("user_id", "checksum", name="uq_user_diagram_checksum"),
+        # Serves the keyset-paginated listing
+        Index("ix_diagrams_user_uploaded_at_id", "user_id", "uploaded_at", "id"),
+        # Lets ownership checks run as index-only scans
+        Index("ix_diagrams_id_user_id", "id", "user_id"),
     )
 
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
@@ -47,7 +63,10 @@ class DiagramModel(Base):
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     source_url: Mapped[str] = mapped_column(Text, nullable=False)
-    content: Mapped[str] = mapped_column(Text, nullable=False)
+    # Never part of a plain entity load; read explicitly where needed
+    content: Mapped[str] = mapped_column(
+        Text, nullable=False, deferred=True, deferred_raiseload=True
+    )
     checksum: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     status: Mapped[str] = mapped_column(String(20), nullable=False)
     uploaded_at: Mapped[datetime] = mapped_column(
@@ -116,13 +135,26 @@ class RelationshipModel(Base):
 
 class NonFunctionalRequirementModel(Base):
     __tablename__ = "non_functional_requirements"
+    __table_args__ = (
+        # A deleted NFR's name is free again while its cells are removed
+        Index(
+            "uq_nfr_name",
+            "name",
+            unique=True,
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
-    name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=datetime.utcnow
     )
+    # Set when the NFR is deleted; the row goes once its cells are removed
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
 
 class DiagramImpactModel(Base):
@@ -163,3 +195,65 @@ class DiagramImpactModel(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=datetime.utcnow
     )
+
+
+class DiagramNFRScoreModel(Base):
+    """Running per-NFR score totals, kept in step with the impact cells."""
+
+    __tablename__ = "diagram_nfr_scores"
+
+    diagram_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("diagrams.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    nfr_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("non_functional_requirements.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    score_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class DiagramMatrixVersionModel(Base):
+    """Counter bumped by every write to a diagram's impact matrix.
+
+    Kept out of ``diagrams`` so matrix writers never queue behind a parse
+    holding the diagram row.
+    """
+
+    __tablename__ = "diagram_matrix_versions"
+
+    diagram_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("diagrams.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class DiagramMatrixModel(Base):
+    """Whole impact matrix of a diagram in one row (packed matrix storage).
+
+    ``cells`` holds 2-bit impact codes for every NFR × component pair in
+    row-major order over the ``nfr_ids`` × ``component_ids`` axes.
+    """
+
+    __tablename__ = "diagram_matrices"
+
+    diagram_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("diagrams.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    nfr_ids: Mapped[list[UUID]] = mapped_column(
+        ARRAY(PGUUID(as_uuid=True)), nullable=False, default=list
+    )
+    component_ids: Mapped[list[UUID]] = mapped_column(
+        ARRAY(PGUUID(as_uuid=True)), nullable=False, default=list
+    )
+    cells: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, default=b"")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=datetime.utcnow
+    )
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Collection, Mapping, Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import Insert, Row, Select, Update, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.domain.diagrams.entities import DiagramNFRComponentImpact, ImpactValue
+from app.domain.diagrams.scoring import (
+    ABSENT_IMPACT_CODE,
+    IMPACT_CODES,
+    ImpactMatrix,
+    pack_impact_codes,
+    unpack_impact_codes,
+)
+from app.infrastructure.persistence.models import (
+    ComponentModel,
+    DiagramMatrixModel,
+    NonFunctionalRequirementModel,
+)
+
+# Packed matrix storage: one row per diagram holding its NFR and component
+# id vectors and the 2-bit impact code of every cell, four cells per byte.
+_ABSENT = ABSENT_IMPACT_CODE
+_IMPACTS_BY_CODE: tuple[ImpactValue | None, ...] = (None,) + tuple(
+    sorted(IMPACT_CODES, key=IMPACT_CODES.__getitem__)
+)
+
+
+def _frozen(codes: np.ndarray) -> np.ndarray:
+    codes.flags.writeable = False
+    return codes
+
+
+def _index(ids: Sequence[UUID]) -> dict[UUID, int]:
+    return {id_: position for position, id_ in enumerate(ids)}
+
+
+@dataclass(frozen=True, slots=True)
+class PackedMatrix:
+    """Immutable NFR × component matrix of impact codes.
+
+    ``codes`` is read-only; every change returns a new matrix built on a
+    copy, so a loaded matrix can be shared by readers while an update is
+    being prepared.
+    """
+
+    nfr_ids: tuple[UUID, ...]
+    component_ids: tuple[UUID, ...]
+    codes: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "PackedMatrix":
+        return cls((), (), _frozen(np.zeros((0, 0), dtype=np.uint8)))
+
+    @classmethod
+    def from_storage(
+        cls,
+        nfr_ids: Sequence[UUID],
+        component_ids: Sequence[UUID],
+        cells: bytes,
+    ) -> "PackedMatrix":
+        codes = unpack_impact_codes(cells, (len(nfr_ids), len(component_ids)))
+        return cls(tuple(nfr_ids), tuple(component_ids), _frozen(codes))
+
+    def to_storage(self) -> bytes:
+        return pack_impact_codes(self.codes)
+
+    def to_impact_matrix(self) -> ImpactMatrix:
+        present = self.codes != _ABSENT
+        scores = np.where(present, self.codes.astype(np.int8) - 2, 0).astype(np.int8)
+        return ImpactMatrix(
+            nfr_ids=self.nfr_ids,
+            component_ids=self.component_ids,
+            scores=scores,
+            present=present,
+        )
+
+    def entries(self, diagram_id: UUID) -> list[DiagramNFRComponentImpact]:
+        """Stored cells in row-major order.
+
+        Cells have no identity of their own here, so their ids are derived
+        from the (nfr_id, component_id) pair and stay stable across reads.
+        """
+        rows, columns = np.nonzero(self.codes)
+        nfr_ids, component_ids = self.nfr_ids, self.component_ids
+        return [
+            packed_cell_to_entity(
+                diagram_id,
+                nfr_ids[row],
+                component_ids[column],
+                _IMPACTS_BY_CODE[code],  # type: ignore[arg-type]
+            )
+            for row, column, code in zip(
+                rows.tolist(), columns.tolist(), self.codes[rows, columns].tolist()
+            )
+        ]
+
+    def impact(self, nfr_id: UUID, component_id: UUID) -> ImpactValue | None:
+        try:
+            row = self.nfr_ids.index(nfr_id)
+            column = self.component_ids.index(component_id)
+        except ValueError:
+            return None
+        return _IMPACTS_BY_CODE[self.codes[row, column]]
+
+    def with_cells(
+        self, changes: Mapping[tuple[UUID, UUID], ImpactValue]
+    ) -> "PackedMatrix":
+        """Copy with the given cells set; unknown ids extend the axes."""
+        nfr_index, component_index = _index(self.nfr_ids), _index(self.component_ids)
+        for nfr_id, component_id in changes:
+            nfr_index.setdefault(nfr_id, len(nfr_index))
+            component_index.setdefault(component_id, len(component_index))
+
+        codes = np.zeros((len(nfr_index), len(component_index)), dtype=np.uint8)
+        codes[: len(self.nfr_ids), : len(self.component_ids)] = self.codes
+        for (nfr_id, component_id), impact in changes.items():
+            codes[nfr_index[nfr_id], component_index[component_id]] = IMPACT_CODES[
+                impact
+            ]
+        return PackedMatrix(tuple(nfr_index), tuple(component_index), _frozen(codes))
+
+    def covering(
+        self,
+        nfr_ids: Sequence[UUID],
+        component_ids: Sequence[UUID],
+        default_impact: ImpactValue,
+    ) -> "PackedMatrix":
+        """
+        Copy over exactly the given axes: cells of kept pairs keep their
+        impact, every other pair gets ``default_impact`` and ids missing
+        from the axes are dropped.
+        """
+        default_code = IMPACT_CODES[default_impact]
+        codes = np.full(
+            (len(nfr_ids), len(component_ids)), default_code, dtype=np.uint8
+        )
+        old_rows, old_columns = _index(self.nfr_ids), _index(self.component_ids)
+        kept_rows = [
+            (new, old_rows[nfr_id])
+            for new, nfr_id in enumerate(nfr_ids)
+            if nfr_id in old_rows
+        ]
+        kept_columns = [
+            (new, old_columns[component_id])
+            for new, component_id in enumerate(component_ids)
+            if component_id in old_columns
+        ]
+        if kept_rows and kept_columns:
+            new_rows, from_rows = zip(*kept_rows)
+            new_columns, from_columns = zip(*kept_columns)
+            kept = self.codes[np.ix_(from_rows, from_columns)]
+            codes[np.ix_(new_rows, new_columns)] = np.where(
+                kept == _ABSENT, default_code, kept
+            )
+        return PackedMatrix(tuple(nfr_ids), tuple(component_ids), _frozen(codes))
+
+    def with_nfr(self, nfr_id: UUID, default_impact: ImpactValue) -> "PackedMatrix":
+        """Copy where the NFR has a cell, ``default_impact`` if new, per component."""
+        nfr_ids = (
+            self.nfr_ids if nfr_id in self.nfr_ids else self.nfr_ids + (nfr_id,)
+        )
+        codes = np.zeros((len(nfr_ids), len(self.component_ids)), dtype=np.uint8)
+        codes[: len(self.nfr_ids)] = self.codes
+        row = codes[nfr_ids.index(nfr_id)]
+        row[row == _ABSENT] = IMPACT_CODES[default_impact]
+        return PackedMatrix(nfr_ids, self.component_ids, _frozen(codes))
+
+    def without_nfr(self, nfr_id: UUID) -> "PackedMatrix":
+        return self.without_nfrs((nfr_id,))
+
+    def without_nfrs(self, nfr_ids: Collection[UUID]) -> "PackedMatrix":
+        dropped = set(nfr_ids)
+        rows = [row for row, nfr_id in enumerate(self.nfr_ids) if nfr_id in dropped]
+        if not rows:
+            return self
+        return PackedMatrix(
+            tuple(nfr_id for nfr_id in self.nfr_ids if nfr_id not in dropped),
+            self.component_ids,
+            _frozen(np.delete(self.codes, rows, axis=0)),
+        )
+
+
+def packed_cell_to_entity(
+    diagram_id: UUID, nfr_id: UUID, component_id: UUID, impact: ImpactValue
+) -> DiagramNFRComponentImpact:
+    return DiagramNFRComponentImpact(
+        diagram_id=diagram_id,
+        nfr_id=nfr_id,
+        component_id=component_id,
+        impact=impact,
+        id=UUID(int=nfr_id.int ^ component_id.int),
+    )
+
+
+def packed_matrix_query(diagram_id: UUID) -> Select:
+    return select(
+        DiagramMatrixModel.nfr_ids,
+        DiagramMatrixModel.component_ids,
+        DiagramMatrixModel.cells,
+    ).where(DiagramMatrixModel.diagram_id == diagram_id)
+
+
+def packed_matrix_from_row(row: Row | None) -> PackedMatrix:
+    if row is None:
+        return PackedMatrix.empty()
+    return PackedMatrix.from_storage(row.nfr_ids, row.component_ids, row.cells)
+
+
+def with_deleted_nfr_ids(query: Select) -> Select:
+    """Add the ids of NFRs marked deleted, whose rows reads must skip."""
+    return query.add_columns(
+        select(func.array_agg(NonFunctionalRequirementModel.id))
+        .where(NonFunctionalRequirementModel.deleted_at.is_not(None))
+        .scalar_subquery()
+        .label("deleted_nfr_ids")
+    )
+
+
+def live_packed_matrix_from_row(row: Row | None) -> PackedMatrix:
+    """Decode a ``with_deleted_nfr_ids`` row without the deleted NFRs' rows."""
+    matrix = packed_matrix_from_row(row)
+    if row is None or not row.deleted_nfr_ids:
+        return matrix
+    return matrix.without_nfrs(row.deleted_nfr_ids)
+
+
+def packed_matrix_lock_statements(diagram_id: UUID) -> tuple[Insert, Select]:
+    """
+    Create the diagram's (empty) matrix row if missing, then lock it.
+
+    Creating the row first means concurrent first writes queue on the
+    same row lock instead of both inserting a new matrix.
+    """
+    return (
+        pg_insert(DiagramMatrixModel)
+        .values(
+            diagram_id=diagram_id,
+            nfr_ids=[],
+            component_ids=[],
+            cells=b"",
+            updated_at=func.now(),
+        )
+        .on_conflict_do_nothing(index_elements=[DiagramMatrixModel.diagram_id]),
+        packed_matrix_query(diagram_id).with_for_update(),
+    )
+
+
+def packed_matrices_query(diagram_ids: Sequence[UUID]) -> Select:
+    return (
+        select(
+            DiagramMatrixModel.diagram_id,
+            DiagramMatrixModel.nfr_ids,
+            DiagramMatrixModel.component_ids,
+            DiagramMatrixModel.cells,
+        )
+        .where(DiagramMatrixModel.diagram_id.in_(list(diagram_ids)))
+        .order_by(DiagramMatrixModel.diagram_id)
+    )
+
+
+def packed_matrices_for_update_query(diagram_ids: Sequence[UUID]) -> Select:
+    return packed_matrices_query(diagram_ids).with_for_update()
+
+
+def packed_matrix_store_statement(diagram_id: UUID, matrix: PackedMatrix) -> Update:
+    return (
+        update(DiagramMatrixModel)
+        .where(DiagramMatrixModel.diagram_id == diagram_id)
+        .values(
+            nfr_ids=list(matrix.nfr_ids),
+            component_ids=list(matrix.component_ids),
+            cells=matrix.to_storage(),
+            updated_at=func.now(),
+        )
+    )
+
+
+def matrix_nfr_ids_query(among: Collection[UUID] | None = None) -> Select:
+    """Ids of the live NFRs (optionally only those ``among``) in axis order."""
+    query = (
+        select(NonFunctionalRequirementModel.id)
+        .where(NonFunctionalRequirementModel.deleted_at.is_(None))
+        .order_by(
+            NonFunctionalRequirementModel.created_at, NonFunctionalRequirementModel.id
+        )
+    )
+    if among is not None:
+        query = query.where(NonFunctionalRequirementModel.id.in_(list(among)))
+    return query
+
+
+def matrix_component_ids_query(
+    diagram_id: UUID, among: Collection[UUID] | None = None
+) -> Select:
+    """Ids of the diagram's components (optionally only ``among``) in axis order."""
+    query = (
+        select(ComponentModel.id)
+        .where(ComponentModel.diagram_id == diagram_id)
+        .order_by(ComponentModel.name, ComponentModel.id)
+    )
+    if among is not None:
+        query = query.where(ComponentModel.id.in_(list(among)))
+    return query
+
+
+def unknown_axis_ids_query(
+    diagram_id: UUID,
+    matrix: PackedMatrix,
+    changes: Mapping[tuple[UUID, UUID], ImpactValue],
+) -> Select | None:
+    """
+    Count the ids ``changes`` would add to the matrix's axes that are not
+    live NFRs or components of the diagram; None when no id is new.
+
+    Cells are not foreign keys in packed storage, so ids joining an axis
+    are validated explicitly before the matrix is stored.
+    """
+    nfr_ids = {nfr_id for nfr_id, _ in changes}.difference(matrix.nfr_ids)
+    component_ids = {component_id for _, component_id in changes}.difference(
+        matrix.component_ids
+    )
+    if not nfr_ids and not component_ids:
+        return None
+    known_nfrs = matrix_nfr_ids_query(nfr_ids).order_by(None).subquery()
+    known_components = (
+        matrix_component_ids_query(diagram_id, component_ids)
+        .order_by(None)
+        .subquery()
+    )
+    return select(
+        len(nfr_ids)
+        + len(component_ids)
+        - select(func.count()).select_from(known_nfrs).scalar_subquery()
+        - select(func.count()).select_from(known_components).scalar_subquery()
+    )
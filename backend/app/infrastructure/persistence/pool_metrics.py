@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Iterable, TypeVar
+
+from opentelemetry import metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+_T = TypeVar("_T")
+
+_meter = metrics.get_meter(__name__)
+_checkouts = _meter.create_counter(
+    "db_pool_checkouts_total",
+    description="Connections checked out of the pool",
+)
+_checkout_timeouts = _meter.create_counter(
+    "db_pool_checkout_timeouts_total",
+    description="Checkouts that gave up after pool_timeout (pool exhausted)",
+)
+_checkout_wait = _meter.create_histogram(
+    "db_pool_checkout_wait_seconds",
+    description="Time spent waiting for a pooled connection",
+    unit="s",
+)
+
+_tracked_engines: list[Engine] = []
+
+
+def pool_usage(pool: Pool) -> dict[str, int]:
+    """Snapshot of connections by state for a queue-based pool."""
+    if not isinstance(pool, QueuePool):
+        return {}
+    return {
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # Negative while the pool has not opened pool_size connections yet
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+def track_pool_usage(engine: Engine) -> None:
+    """Report the engine's pool usage through the ``db_pool_connections`` gauge."""
+    _tracked_engines.append(engine)
+
+
+def _observe_pools(options: CallbackOptions) -> Iterable[Observation]:
+    for engine in _tracked_engines:
+        # Read engine.pool on each callback: dispose() swaps in a new pool
+        pool = engine.pool
+        for state, value in pool_usage(pool).items():
+            yield Observation(value, {"pool": _pool_name(pool), "state": state})
+
+
+_meter.create_observable_gauge(
+    "db_pool_connections",
+    callbacks=[_observe_pools],
+    description="Pooled connections by state (in_use, idle, overflow)",
+)
+
+
+def _pool_name(pool: Pool) -> str:
+    return pool._orig_logging_name or "default"
+
+
+def _timed_checkout(pool: Pool, checkout: Callable[[], _T]) -> _T:
+    attributes = {"pool": _pool_name(pool)}
+    started = time.perf_counter()
+    try:
+        connection = checkout()
+    except PoolTimeoutError:
+        _checkout_timeouts.add(1, attributes)
+        raise
+    finally:
+        _checkout_wait.record(time.perf_counter() - started, attributes)
+    _checkouts.add(1, attributes)
+    return connection
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording checkout wait time, checkouts and timeouts."""
+
+    def _do_get(self):
+        return _timed_checkout(self, super()._do_get)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Async engine variant of :class:`InstrumentedQueuePool`."""
+
+    def _do_get(self):
+        return _timed_checkout(self, super()._do_get)
@@ -1,23 +1,24 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Iterable, Optional, Sequence
+from functools import partial
+from typing import Callable, Iterable, Mapping, Optional, Sequence
 from uuid import UUID
 
+from sqlalchemy import delete, insert, update
 from sqlalchemy.orm import Session
 
 from app.domain.diagrams.entities import (
     Component,
     Diagram,
     DiagramNFRComponentImpact,
-    DiagramStatus,
+    DiagramVersion,
     ImpactValue,
-    ComponentType,
     Relationship,
-    RelationshipDirection,
 )
 from app.domain.diagrams.repositories import DiagramRepository
+from app.domain.diagrams.exceptions import UnknownMatrixAxisError
 from app.domain.diagrams.matrix_repository import DiagramMatrixRepository
+from app.domain.diagrams.scoring import ImpactMatrix, NFRScoreTotals, nfr_deltas
 from app.domain.nfr.entities import NonFunctionalRequirement
 from app.domain.nfr.repositories import NonFunctionalRequirementRepository
 from app.domain.auth.entities import User as UserEntity
@@ -30,6 +31,60 @@ from app.infrastructure.persistence.models import (
     DiagramImpactModel,
     UserModel,
 )
+from app.infrastructure.persistence.mapping import (
+    component_to_entity,
+    component_upsert_statement,
+    deleted_nfr_ids_query,
+    diagram_batch_query,
+    diagram_content_query,
+    diagram_ownership_query,
+    diagram_to_entity,
+    diagram_to_model,
+    diagram_version_query,
+    diagram_version_to_entity,
+    diagram_versions_query,
+    group_by_diagram,
+    impact_cell_upsert_statement,
+    impact_cells_query,
+    impact_cells_for_update_query,
+    impact_columns,
+    impact_models_query,
+    impact_to_entity,
+    impact_upsert_statement,
+    initialize_cells_statement,
+    live_nfrs_query,
+    matrix_version_bump_statement,
+    nfr_cells_fill_statement,
+    nfr_cells_remove_statement,
+    nfr_mark_deleted_statement,
+    nfr_to_entity,
+    overwrote_unlocked_cells,
+    relationship_rows,
+    relationship_to_entity,
+    score_delta_statement,
+    score_totals_many_query,
+    score_totals_query,
+    score_totals_rebuild_statements,
+    score_totals_to_entities,
+    user_to_entity,
+    user_update_statement,
+)
+from app.infrastructure.persistence.packed_matrix import (
+    PackedMatrix,
+    live_packed_matrix_from_row,
+    matrix_component_ids_query,
+    matrix_nfr_ids_query,
+    packed_cell_to_entity,
+    packed_matrices_for_update_query,
+    packed_matrices_query,
+    packed_matrix_from_row,
+    packed_matrix_lock_statements,
+    packed_matrix_query,
+    packed_matrix_store_statement,
+    unknown_axis_ids_query,
+    with_deleted_nfr_ids,
+)
+from app.infrastructure.persistence.unit_of_work import commit_or_flush
 
 
 class PostgreSQLDiagramRepository(DiagramRepository):
@@ -41,19 +96,9 @@ class PostgreSQLDiagramRepository(DiagramRepository):
     def add(self, diagram: Diagram) -> Diagram:
         """Persist a new diagram aggregate."""
         try:
-            diagram_model = DiagramModel(
-                id=diagram.id,
-                user_id=diagram.user_id,
-                name=diagram.name,
-                source_url=diagram.source_url,
-                content=diagram.content,
-                checksum=diagram.checksum,
-                status=diagram.status.value,
-                uploaded_at=diagram.uploaded_at,
-                parsed_at=diagram.parsed_at,
-            )
+            diagram_model = diagram_to_model(diagram)
             self._session.add(diagram_model)
-            self._session.commit()
+            commit_or_flush(self._session)
             self._session.refresh(diagram_model)
             return diagram
         except Exception:
@@ -73,14 +118,12 @@ class PostgreSQLDiagramRepository(DiagramRepository):
 
             diagram_model.name = diagram.name
             diagram_model.source_url = diagram.source_url
-            diagram_model.content = diagram.content
             diagram_model.checksum = diagram.checksum
             diagram_model.status = diagram.status.value
             diagram_model.uploaded_at = diagram.uploaded_at
             diagram_model.parsed_at = diagram.parsed_at
 
-            self._session.commit()
-            self._session.refresh(diagram_model)
+            commit_or_flush(self._session)
             return diagram
         except Exception:
             self._session.rollback()
@@ -97,6 +140,26 @@ class PostgreSQLDiagramRepository(DiagramRepository):
             return None
         return self._to_domain_entity(diagram_model)
 
+    def get_content(self, diagram_id: UUID) -> Optional[str]:
+        return self._session.scalar(diagram_content_query(diagram_id))
+
+    def get_version(self, diagram_id: UUID) -> Optional[DiagramVersion]:
+        row = self._session.execute(diagram_version_query(diagram_id)).first()
+        if row is None:
+            return None
+        return diagram_version_to_entity(row)
+
+    def get_versions(
+        self, diagram_ids: Sequence[UUID]
+    ) -> Mapping[UUID, DiagramVersion]:
+        rows = self._session.execute(diagram_versions_query(diagram_ids)).all()
+        return {row.id: diagram_version_to_entity(row) for row in rows}
+
+    def owned_by(self, user_id: UUID, diagram_ids: Sequence[UUID]) -> set[UUID]:
+        return set(
+            self._session.scalars(diagram_ownership_query(user_id, diagram_ids))
+        )
+
     def list(self, user_id: UUID) -> Iterable[Diagram]:
         """Return all diagrams for a user."""
         diagram_models = (
@@ -136,7 +199,7 @@ class PostgreSQLDiagramRepository(DiagramRepository):
                 for component in components
             ]
             self._session.add_all(component_models)
-            self._session.commit()
+            commit_or_flush(self._session)
         except Exception:
             self._session.rollback()
             raise
@@ -146,18 +209,20 @@ class PostgreSQLDiagramRepository(DiagramRepository):
         if not components:
             return
         try:
-            for component in components:
-                component_model = (
-                    self._session.query(ComponentModel)
-                    .filter(ComponentModel.id == component.id)
-                    .first()
-                )
-                if component_model is None:
-                    continue
-                component_model.name = component.name
-                component_model.type = component.type.value
-                component_model.meta_data = component.metadata
-            self._session.commit()
+            # ORM bulk UPDATE by primary key: one executemany, no per-row SELECT
+            self._session.execute(
+                update(ComponentModel),
+                [
+                    {
+                        "id": component.id,
+                        "name": component.name,
+                        "type": component.type.value,
+                        "meta_data": component.metadata,
+                    }
+                    for component in components
+                ],
+            )
+            commit_or_flush(self._session)
         except Exception:
             self._session.rollback()
             raise
@@ -176,7 +241,10 @@ class PostgreSQLDiagramRepository(DiagramRepository):
                     return
                 query = query.filter(ComponentModel.id.in_(ids))
             query.delete(synchronize_session=False)
-            self._session.commit()
+            # The components' cells went with them (ON DELETE CASCADE)
+            for statement in score_totals_rebuild_statements(diagram_id):
+                self._session.execute(statement)
+            commit_or_flush(self._session)
         except Exception:
             self._session.rollback()
             raise
@@ -197,7 +265,7 @@ class PostgreSQLDiagramRepository(DiagramRepository):
                 for relationship in relationships
             ]
             self._session.add_all(relationship_models)
-            self._session.commit()
+            commit_or_flush(self._session)
         except Exception:
             self._session.rollback()
             raise
@@ -220,6 +288,30 @@ class PostgreSQLDiagramRepository(DiagramRepository):
         )
         return [self._to_relationship_entity(model) for model in relationship_models]
 
+    def get_components_by_diagram(
+        self, diagram_ids: Sequence[UUID]
+    ) -> Mapping[UUID, Sequence[Component]]:
+        component_models = (
+            self._session.query(ComponentModel)
+            .filter(ComponentModel.diagram_id.in_(list(diagram_ids)))
+            .all()
+        )
+        return group_by_diagram(
+            map(self._to_component_entity, component_models), diagram_ids
+        )
+
+    def get_relationships_by_diagram(
+        self, diagram_ids: Sequence[UUID]
+    ) -> Mapping[UUID, Sequence[Relationship]]:
+        relationship_models = (
+            self._session.query(RelationshipModel)
+            .filter(RelationshipModel.diagram_id.in_(list(diagram_ids)))
+            .all()
+        )
+        return group_by_diagram(
+            map(self._to_relationship_entity, relationship_models), diagram_ids
+        )
+
     def delete_relationships(self, diagram_id: UUID) -> None:
         """Delete all relationships for a diagram."""
         try:
@@ -228,46 +320,61 @@ class PostgreSQLDiagramRepository(DiagramRepository):
                 .filter(RelationshipModel.diagram_id == diagram_id)
                 .delete(synchronize_session=False)
             )
-            self._session.commit()
+            commit_or_flush(self._session)
+        except Exception:
+            self._session.rollback()
+            raise
+
+    def sync_components(
+        self,
+        diagram_id: UUID,
+        added: Sequence[Component],
+        updated: Sequence[Component],
+        removed_ids: Sequence[UUID],
+        relationships: Sequence[Relationship],
+    ) -> None:
+        """Apply component changes and replace relationships in one transaction."""
+        try:
+            if removed_ids:
+                self._session.execute(
+                    delete(ComponentModel).where(
+                        ComponentModel.diagram_id == diagram_id,
+                        ComponentModel.id.in_(list(removed_ids)),
+                    )
+                )
+
+            upserts = [*added, *updated]
+            if upserts:
+                self._session.execute(
+                    component_upsert_statement(diagram_id, upserts)
+                )
+
+            self._session.execute(
+                delete(RelationshipModel).where(
+                    RelationshipModel.diagram_id == diagram_id
+                )
+            )
+            if relationships:
+                self._session.execute(
+                    insert(RelationshipModel),
+                    relationship_rows(diagram_id, relationships),
+                )
+            commit_or_flush(self._session)
         except Exception:
             self._session.rollback()
             raise
 
     def _to_domain_entity(self, model: DiagramModel) -> Diagram:
-        """Convert database model to domain entity."""
-        return Diagram(
-            id=model.id,
-            user_id=model.user_id,
-            name=model.name,
-            source_url=model.source_url,
-            content=model.content,
-            checksum=model.checksum,
-            status=DiagramStatus(model.status),
-            uploaded_at=model.uploaded_at,
-            parsed_at=model.parsed_at,
-        )
+        """Convert database model to domain entity; content loads on demand."""
+        return diagram_to_entity(model, partial(self.get_content, model.id))
 
     def _to_component_entity(self, model: ComponentModel) -> Component:
         """Convert database model to component entity."""
-        return Component(
-            id=model.id,
-            diagram_id=model.diagram_id,
-            name=model.name,
-            type=ComponentType(model.type),
-            metadata=model.meta_data,
-        )
+        return component_to_entity(model)
 
     def _to_relationship_entity(self, model: RelationshipModel) -> Relationship:
         """Convert database model to relationship entity."""
-        return Relationship(
-            id=model.id,
-            diagram_id=model.diagram_id,
-            source_component_id=model.source_component_id,
-            target_component_id=model.target_component_id,
-            label=model.label,
-            direction=RelationshipDirection(model.direction),
-            metadata=model.meta_data,
-        )
+        return relationship_to_entity(model)
 
 
 class PostgreSQLNFRRepository(NonFunctionalRequirementRepository):
@@ -285,7 +392,7 @@ class PostgreSQLNFRRepository(NonFunctionalRequirementRepository):
                 created_at=nfr.created_at,
             )
             self._session.add(model)
-            self._session.commit()
+            commit_or_flush(self._session)
             self._session.refresh(model)
             return nfr
         except Exception:
@@ -293,28 +400,24 @@ class PostgreSQLNFRRepository(NonFunctionalRequirementRepository):
             raise
 
     def get(self, nfr_id: UUID) -> Optional[NonFunctionalRequirement]:
-        model = (
-            self._session.query(NonFunctionalRequirementModel)
-            .filter(NonFunctionalRequirementModel.id == nfr_id)
-            .first()
-        )
+        model = self._session.scalars(
+            live_nfrs_query().where(NonFunctionalRequirementModel.id == nfr_id)
+        ).first()
         if model is None:
             return None
         return self._to_domain_entity(model)
 
     def get_by_name(self, name: str) -> Optional[NonFunctionalRequirement]:
-        model = (
-            self._session.query(NonFunctionalRequirementModel)
-            .filter(NonFunctionalRequirementModel.name == name)
-            .first()
-        )
+        model = self._session.scalars(
+            live_nfrs_query().where(NonFunctionalRequirementModel.name == name)
+        ).first()
         if model is None:
             return None
         return self._to_domain_entity(model)
 
     def list(self) -> Iterable[NonFunctionalRequirement]:
-        models = self._session.query(NonFunctionalRequirementModel).order_by(
-            NonFunctionalRequirementModel.name.asc()
+        models = self._session.scalars(
+            live_nfrs_query().order_by(NonFunctionalRequirementModel.name.asc())
         )
         return [self._to_domain_entity(model) for model in models]
 
@@ -325,20 +428,26 @@ class PostgreSQLNFRRepository(NonFunctionalRequirementRepository):
                 .filter(NonFunctionalRequirementModel.id == nfr_id)
                 .delete(synchronize_session=False)
             )
-            self._session.commit()
+            commit_or_flush(self._session)
         except Exception:
             self._session.rollback()
             raise
 
+    def mark_deleted(self, nfr_id: UUID) -> None:
+        try:
+            self._session.execute(nfr_mark_deleted_statement(nfr_id))
+            commit_or_flush(self._session)
+        except Exception:
+            self._session.rollback()
+            raise
+
+    def list_deleted_ids(self) -> Sequence[UUID]:
+        return self._session.scalars(deleted_nfr_ids_query()).all()
+
     def _to_domain_entity(
         self, model: NonFunctionalRequirementModel
     ) -> NonFunctionalRequirement:
-        return NonFunctionalRequirement(
-            id=model.id,
-            name=model.name,
-            description=model.description,
-            created_at=model.created_at,
-        )
+        return nfr_to_entity(model)
 
 
 class PostgreSQLDiagramMatrixRepository(DiagramMatrixRepository):
@@ -348,11 +457,7 @@ class PostgreSQLDiagramMatrixRepository(DiagramMatrixRepository):
         self._session = session
 
     def list_by_diagram(self, diagram_id: UUID) -> Sequence[DiagramNFRComponentImpact]:
-        models = (
-            self._session.query(DiagramImpactModel)
-            .filter(DiagramImpactModel.diagram_id == diagram_id)
-            .all()
-        )
+        models = self._session.scalars(impact_models_query(diagram_id))
         return [self._to_domain_entity(model) for model in models]
 
     def upsert(
@@ -363,98 +468,321 @@ class PostgreSQLDiagramMatrixRepository(DiagramMatrixRepository):
         impact: ImpactValue,
     ) -> DiagramNFRComponentImpact:
         try:
-            model = (
-                self._session.query(DiagramImpactModel)
-                .filter(
-                    DiagramImpactModel.diagram_id == diagram_id,
-                    DiagramImpactModel.nfr_id == nfr_id,
-                    DiagramImpactModel.component_id == component_id,
-                )
-                .one_or_none()
-            )
-            if model is None:
-                model = DiagramImpactModel(
-                    diagram_id=diagram_id,
-                    nfr_id=nfr_id,
-                    component_id=component_id,
-                    impact=impact.value,
+            row = self._session.execute(
+                impact_cell_upsert_statement(diagram_id, nfr_id, component_id, impact)
+            ).one()
+            if not row.totals_updated or (
+                row.previous_impact is None and not row.inserted
+            ):
+                # Totals were missing, or a concurrent insert of the same
+                # cell won so the delta assumed a new cell
+                self._rebuild_score_totals(diagram_id)
+            self._bump_matrix_versions([diagram_id])
+            commit_or_flush(self._session)
+            return impact_to_entity(row)
+        except Exception:
+            self._session.rollback()
+            raise
+
+    def bulk_upsert(
+        self,
+        diagram_id: UUID,
+        cells: Sequence[tuple[UUID, UUID, ImpactValue]],
+    ) -> Sequence[DiagramNFRComponentImpact]:
+        changes = {
+            (nfr_id, component_id): impact for nfr_id, component_id, impact in cells
+        }
+        if not changes:
+            return []
+        try:
+            previous = {
+                (nfr_id, component_id): ImpactValue(impact)
+                for nfr_id, component_id, impact in self._session.execute(
+                    impact_cells_for_update_query(diagram_id, changes)
                 )
-                self._session.add(model)
+            }
+            rows = self._session.execute(
+                impact_upsert_statement(diagram_id, changes)
+            ).all()
+            if overwrote_unlocked_cells(rows, previous):
+                self._rebuild_score_totals(diagram_id)
             else:
-                model.impact = impact.value
-                model.updated_at = datetime.utcnow()
-            self._session.commit()
-            self._session.refresh(model)
-            return self._to_domain_entity(model)
+                self._apply_score_deltas(
+                    diagram_id,
+                    nfr_deltas(
+                        (nfr_id, previous.get((nfr_id, component_id)), impact)
+                        for (nfr_id, component_id), impact in changes.items()
+                    ),
+                )
+            self._bump_matrix_versions([diagram_id])
+            commit_or_flush(self._session)
+            return [impact_to_entity(row) for row in rows]
+        except Exception:
+            self._session.rollback()
+            raise
+
+    def initialize_cells(
+        self, diagram_id: UUID, default_impact: ImpactValue = ImpactValue.NO_EFFECT
+    ) -> None:
+        try:
+            self._session.execute(
+                initialize_cells_statement(diagram_id, default_impact)
+            )
+            self._bump_matrix_versions([diagram_id])
+            commit_or_flush(self._session)
         except Exception:
             self._session.rollback()
             raise
 
-    def ensure_pairs(
+    def count_diagrams(self) -> int:
+        return self._session.query(DiagramModel).count()
+
+    def add_nfr_cells(
         self,
-        diagram_id: UUID,
-        pairs: Iterable[tuple[UUID, UUID]],
+        nfr_id: UUID,
+        after_diagram_id: UUID | None,
+        limit: int,
         default_impact: ImpactValue = ImpactValue.NO_EFFECT,
-    ) -> None:
+    ) -> Sequence[UUID]:
         try:
-            pairs_set = set(pairs)
-            if not pairs_set:
-                return
+            diagram_ids = self._session.scalars(
+                nfr_cells_fill_statement(
+                    nfr_id, after_diagram_id, limit, default_impact
+                )
+            ).all()
+            self._bump_matrix_versions(diagram_ids)
+            commit_or_flush(self._session)
+            return diagram_ids
+        except Exception:
+            self._session.rollback()
+            raise
 
-            existing = (
-                self._session.query(
-                    DiagramImpactModel.nfr_id, DiagramImpactModel.component_id
+    def remove_nfr_cells(
+        self, nfr_id: UUID, after_diagram_id: UUID | None, limit: int
+    ) -> Sequence[UUID]:
+        try:
+            diagram_ids = self._session.scalars(
+                nfr_cells_remove_statement(nfr_id, after_diagram_id, limit)
+            ).all()
+            self._bump_matrix_versions(diagram_ids)
+            commit_or_flush(self._session)
+            return diagram_ids
+        except Exception:
+            self._session.rollback()
+            raise
+
+    def load_impact_matrix(self, diagram_id: UUID) -> ImpactMatrix:
+        rows = self._session.execute(impact_cells_query(diagram_id)).all()
+        return ImpactMatrix.from_cells(*impact_columns(rows))
+
+    def load_score_totals(self, diagram_id: UUID) -> Sequence[NFRScoreTotals]:
+        rows = self._session.execute(score_totals_query(diagram_id)).all()
+        if not rows:
+            # No stored totals yet (empty matrix or cells written before
+            # totals were tracked); derive them from the cells
+            return super().load_score_totals(diagram_id)
+        return score_totals_to_entities(rows)
+
+    def load_score_totals_many(
+        self, diagram_ids: Sequence[UUID]
+    ) -> Mapping[UUID, Sequence[NFRScoreTotals]]:
+        grouped: dict[UUID, list[NFRScoreTotals]] = {}
+        for row in self._session.execute(score_totals_many_query(diagram_ids)):
+            grouped.setdefault(row.diagram_id, []).append(
+                NFRScoreTotals(
+                    nfr_id=row.nfr_id,
+                    score_sum=row.score_sum,
+                    entry_count=row.entry_count,
                 )
-                .filter(DiagramImpactModel.diagram_id == diagram_id)
-                .all()
             )
-            existing_set = {(row[0], row[1]) for row in existing}
-            missing = pairs_set - existing_set
-
-            if missing:
-                entries = [
-                    DiagramImpactModel(
-                        diagram_id=diagram_id,
-                        nfr_id=nfr_id,
-                        component_id=component_id,
-                        impact=default_impact.value,
-                    )
-                    for nfr_id, component_id in missing
-                ]
-                self._session.add_all(entries)
-            self._session.commit()
+        totals: dict[UUID, Sequence[NFRScoreTotals]] = {}
+        for diagram_id in diagram_ids:
+            if diagram_id in grouped:
+                totals[diagram_id] = grouped[diagram_id]
+            else:
+                # No stored totals yet; derive them from the cells
+                totals[diagram_id] = super().load_score_totals(diagram_id)
+        return totals
+
+    def _apply_score_deltas(
+        self, diagram_id: UUID, deltas: dict[UUID, tuple[int, int]]
+    ) -> None:
+        for nfr_id, (score_delta, count_delta) in sorted(deltas.items()):
+            result = self._session.execute(
+                score_delta_statement(diagram_id, nfr_id, score_delta, count_delta)
+            )
+            if result.rowcount == 0:
+                # Totals missing for this NFR, so a delta has nothing to
+                # apply to; rebuild the diagram's totals once from its cells
+                self._rebuild_score_totals(diagram_id)
+                return
+
+    def _rebuild_score_totals(self, diagram_id: UUID) -> None:
+        for statement in score_totals_rebuild_statements(diagram_id):
+            self._session.execute(statement)
+
+    def _bump_matrix_versions(self, diagram_ids: Sequence[UUID]) -> None:
+        if diagram_ids:
+            self._session.execute(matrix_version_bump_statement(diagram_ids))
+
+    def _to_domain_entity(self, model: DiagramImpactModel) -> DiagramNFRComponentImpact:
+        return impact_to_entity(model)
+
+
+class PackedPostgreSQLDiagramMatrixRepository(DiagramMatrixRepository):
+    """
+    PostgreSQL matrix storage keeping each diagram's whole matrix in one
+    packed row (DiagramMatrixModel) instead of a row per cell.
+
+    Writes lock the diagram's row, build a changed copy of the matrix and
+    store it back; reads decode the row straight into numpy arrays.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def list_by_diagram(self, diagram_id: UUID) -> Sequence[DiagramNFRComponentImpact]:
+        return self._load(diagram_id).entries(diagram_id)
+
+    def load_impact_matrix(self, diagram_id: UUID) -> ImpactMatrix:
+        return self._load(diagram_id).to_impact_matrix()
+
+    def load_score_totals_many(
+        self, diagram_ids: Sequence[UUID]
+    ) -> Mapping[UUID, Sequence[NFRScoreTotals]]:
+        matrices = {
+            row.diagram_id: live_packed_matrix_from_row(row)
+            for row in self._session.execute(
+                with_deleted_nfr_ids(packed_matrices_query(diagram_ids))
+            )
+        }
+        return {
+            diagram_id: matrices.get(diagram_id, PackedMatrix.empty())
+            .to_impact_matrix()
+            .score_totals()
+            for diagram_id in diagram_ids
+        }
+
+    def upsert(
+        self,
+        diagram_id: UUID,
+        nfr_id: UUID,
+        component_id: UUID,
+        impact: ImpactValue,
+    ) -> DiagramNFRComponentImpact:
+        return self.bulk_upsert(diagram_id, [(nfr_id, component_id, impact)])[0]
+
+    def bulk_upsert(
+        self,
+        diagram_id: UUID,
+        cells: Sequence[tuple[UUID, UUID, ImpactValue]],
+    ) -> Sequence[DiagramNFRComponentImpact]:
+        changes = {
+            (nfr_id, component_id): impact for nfr_id, component_id, impact in cells
+        }
+        if not changes:
+            return []
+        try:
+            matrix = self._lock(diagram_id)
+            unknown = unknown_axis_ids_query(diagram_id, matrix, changes)
+            if unknown is not None and self._session.scalar(unknown):
+                raise UnknownMatrixAxisError(diagram_id)
+            self._store(diagram_id, matrix.with_cells(changes))
+            commit_or_flush(self._session)
         except Exception:
             self._session.rollback()
             raise
+        return [
+            packed_cell_to_entity(diagram_id, nfr_id, component_id, impact)
+            for (nfr_id, component_id), impact in changes.items()
+        ]
 
-    def delete_missing_components(
-        self, diagram_id: UUID, component_ids: Iterable[UUID]
+    def initialize_cells(
+        self, diagram_id: UUID, default_impact: ImpactValue = ImpactValue.NO_EFFECT
     ) -> None:
         try:
-            component_ids_set = set(component_ids)
-            query = self._session.query(DiagramImpactModel).filter(
-                DiagramImpactModel.diagram_id == diagram_id
+            matrix = self._lock(diagram_id)
+            nfr_ids = self._session.scalars(matrix_nfr_ids_query()).all()
+            component_ids = self._session.scalars(
+                matrix_component_ids_query(diagram_id)
+            ).all()
+            self._store(
+                diagram_id, matrix.covering(nfr_ids, component_ids, default_impact)
             )
-            if component_ids_set:
-                query = query.filter(
-                    ~DiagramImpactModel.component_id.in_(component_ids_set)
-                )
-            # If there are no components, remove all entries for the diagram
-            query.delete(synchronize_session=False)
-            self._session.commit()
+            commit_or_flush(self._session)
         except Exception:
             self._session.rollback()
             raise
 
-    def _to_domain_entity(self, model: DiagramImpactModel) -> DiagramNFRComponentImpact:
-        return DiagramNFRComponentImpact(
-            id=model.id,
-            diagram_id=model.diagram_id,
-            nfr_id=model.nfr_id,
-            component_id=model.component_id,
-            impact=ImpactValue(model.impact),
+    def count_diagrams(self) -> int:
+        return self._session.query(DiagramModel).count()
+
+    def add_nfr_cells(
+        self,
+        nfr_id: UUID,
+        after_diagram_id: UUID | None,
+        limit: int,
+        default_impact: ImpactValue = ImpactValue.NO_EFFECT,
+    ) -> Sequence[UUID]:
+        # An NFR marked deleted meanwhile gets no new cells
+        live = bool(self._session.scalars(matrix_nfr_ids_query([nfr_id])).all())
+        return self._update_batch(
+            after_diagram_id,
+            limit,
+            lambda matrix: (
+                matrix.with_nfr(nfr_id, default_impact)
+                if live and matrix.component_ids
+                else matrix
+            ),
+        )
+
+    def remove_nfr_cells(
+        self, nfr_id: UUID, after_diagram_id: UUID | None, limit: int
+    ) -> Sequence[UUID]:
+        return self._update_batch(
+            after_diagram_id, limit, lambda matrix: matrix.without_nfr(nfr_id)
+        )
+
+    def _update_batch(
+        self,
+        after_diagram_id: UUID | None,
+        limit: int,
+        change: Callable[[PackedMatrix], PackedMatrix],
+    ) -> Sequence[UUID]:
+        try:
+            diagram_ids = self._session.scalars(
+                diagram_batch_query(after_diagram_id, limit)
+            ).all()
+            locked = self._session.execute(
+                packed_matrices_for_update_query(diagram_ids)
+            ).all()
+            for row in locked:
+                matrix = packed_matrix_from_row(row)
+                changed = change(matrix)
+                if changed is not matrix:
+                    self._store(row.diagram_id, changed)
+            commit_or_flush(self._session)
+            return diagram_ids
+        except Exception:
+            self._session.rollback()
+            raise
+
+    def _load(self, diagram_id: UUID) -> PackedMatrix:
+        return live_packed_matrix_from_row(
+            self._session.execute(
+                with_deleted_nfr_ids(packed_matrix_query(diagram_id))
+            ).first()
         )
 
+    def _lock(self, diagram_id: UUID) -> PackedMatrix:
+        create, lock = packed_matrix_lock_statements(diagram_id)
+        self._session.execute(create)
+        return packed_matrix_from_row(self._session.execute(lock).one())
+
+    def _store(self, diagram_id: UUID, matrix: PackedMatrix) -> None:
+        self._session.execute(packed_matrix_store_statement(diagram_id, matrix))
+        self._session.execute(matrix_version_bump_statement([diagram_id]))
+
 
 class PostgreSQLUserRepository(UserRepository):
     """PostgreSQL implementation of UserRepository."""
@@ -472,13 +800,25 @@ class PostgreSQLUserRepository(UserRepository):
                 created_at=user.created_at,
             )
             self._session.add(user_model)
-            self._session.commit()
+            commit_or_flush(self._session)
             self._session.refresh(user_model)
             return user
         except Exception:
             self._session.rollback()
             raise
 
+    def update(self, user: UserEntity) -> UserEntity:
+        """Persist changes to an existing user."""
+        try:
+            result = self._session.execute(user_update_statement(user))
+            if result.rowcount == 0:
+                raise ValueError(f"User {user.id} does not exist")
+            commit_or_flush(self._session)
+            return user
+        except Exception:
+            self._session.rollback()
+            raise
+
     def get(self, user_id: UUID) -> Optional[UserEntity]:
         """Retrieve a user by its identifier."""
         user_model = (
@@ -499,9 +839,4 @@ class PostgreSQLUserRepository(UserRepository):
 
     def _to_domain_entity(self, model: UserModel) -> UserEntity:
         """Convert database model to domain entity."""
-        return UserEntity(
-            id=model.id,
-            email=model.email,
-            hashed_password=model.hashed_password,
-            created_at=model.created_at,
-        )
+        return user_to_entity(model)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from types import TracebackType
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.application.diagrams.ports import UnitOfWork
+
+_DEPTH_KEY = "unit_of_work_depth"
+
+
+def commit_or_flush(session: Session) -> None:
+    """Commit the session unless a unit of work owns the transaction.
+
+    Repositories call this instead of ``Session.commit``. Inside an active
+    :class:`SQLAlchemyUnitOfWork` pending changes are only flushed, so that
+    the unit of work can commit (or roll back) everything at once.
+    """
+    if session.info.get(_DEPTH_KEY, 0) > 0:
+        session.flush()
+    else:
+        session.commit()
+
+
+async def commit_or_flush_async(session: AsyncSession) -> None:
+    """Async counterpart of :func:`commit_or_flush`."""
+    if session.info.get(_DEPTH_KEY, 0) > 0:
+        await session.flush()
+    else:
+        await session.commit()
+
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    """Unit of work over the request-scoped SQLAlchemy session.
+
+    All repositories built on the same session join the transaction.
+    Nested ``with`` blocks share the outermost transaction; only the
+    outermost ``commit`` reaches the database.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def __enter__(self) -> "SQLAlchemyUnitOfWork":
+        self._session.info[_DEPTH_KEY] = self._session.info.get(_DEPTH_KEY, 0) + 1
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        depth = self._session.info.get(_DEPTH_KEY, 1) - 1
+        self._session.info[_DEPTH_KEY] = depth
+        if depth == 0:
+            # Anything not explicitly committed is discarded
+            self._session.rollback()
+
+    def commit(self) -> None:
+        if self._session.info.get(_DEPTH_KEY, 0) <= 1:
+            self._session.commit()
+        else:
+            self._session.flush()
+
+    def rollback(self) -> None:
+        self._session.rollback()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from app.application.auth.ports import RateLimitBackend
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Process-local token buckets, bounded by the number of keys.
+
+    Beyond ``max_keys`` the least recently used bucket is dropped, which
+    resets it to full; size the bound above the keys expected per refill
+    period.
+    """
+
+    def __init__(
+        self,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_keys = max_keys
+        self._clock = clock
+        # key -> (tokens, updated_at)
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        now = self._clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            elif refill_per_second > 0:
+                retry_after = (1 - tokens) / refill_per_second
+            else:
+                retry_after = float("inf")
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+    async def refund(self, key: str, capacity: float) -> None:
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated_at = self._buckets[key]
+                self._buckets[key] = (min(capacity, tokens + 1), updated_at)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -2,26 +2,80 @@ from functools import lru_cache
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.application.auth.services import AuthService
-from app.application.diagrams.matrix_service import DiagramMatrixService
-from app.application.diagrams.services import DiagramService
-from app.application.nfr.services import NFRService
+from app.application.auth.passwords import BcryptPasswordHasher
+from app.application.auth.ports import RateLimitBackend
+from app.application.auth.rate_limit import BucketLimit, LoginRateLimiter
+from app.application.auth.services import AsyncAuthService, AuthService
+from app.application.auth.tokens import TokenVerifier
+from app.application.diagrams.ports import (
+    DiffResultCache,
+    OwnershipCache,
+    ParseJobQueue,
+    ParseResultCache,
+    UnitOfWork,
+)
+from app.application.diagrams.matrix_service import (
+    AsyncDiagramMatrixService,
+    DiagramMatrixService,
+)
+from app.application.diagrams.parse_jobs import ParseJobService, execute_parse_job
+from app.application.diagrams.services import AsyncDiagramService, DiagramService
+from app.application.nfr.backfill import MatrixBackfillService, execute_backfill_job
+from app.application.nfr.ports import MatrixBackfillQueue
+from app.application.nfr.services import AsyncNFRService, NFRService
 from app.core.config import get_settings
 from app.domain.auth.exceptions import InvalidCredentialsError
-from app.domain.auth.repositories import UserRepository
-from app.domain.diagrams.repositories import DiagramRepository
-from app.domain.diagrams.matrix_repository import DiagramMatrixRepository
-from app.domain.nfr.repositories import NonFunctionalRequirementRepository
+from app.domain.auth.repositories import AsyncUserRepository, UserRepository
+from app.domain.diagrams.repositories import AsyncDiagramRepository, DiagramRepository
+from app.domain.diagrams.matrix_repository import (
+    AsyncDiagramMatrixRepository,
+    DiagramMatrixRepository,
+)
+from app.domain.nfr.repositories import (
+    AsyncNonFunctionalRequirementRepository,
+    NonFunctionalRequirementRepository,
+)
+from app.domain.diagrams.entities import ParseJob
+from app.domain.diagrams.parsers import PlantUMLParser
+from app.infrastructure.caching.diff_results import LRUDiffResultCache
+from app.infrastructure.caching.ownership import TTLOwnershipCache
+from app.infrastructure.caching.verified_tokens import LRUVerifiedTokenCache
+from app.infrastructure.caching.parse_results import (
+    FileParseResultCache,
+    LRUParseResultCache,
+)
+from app.domain.nfr.entities import MatrixBackfillJob
+from app.infrastructure.jobs.in_memory import (
+    InMemoryMatrixBackfillQueue,
+    InMemoryParseJobQueue,
+)
+from app.infrastructure.jobs.worker import JobWorkerPool
 from app.infrastructure.parsing.plantuml_parser import RegexPlantUMLParser
-from app.infrastructure.persistence.database import get_db
+from app.infrastructure.parsing.tokenizing_parser import TokenizingPlantUMLParser
+from app.infrastructure.persistence.async_postgresql import (
+    AsyncPackedPostgreSQLDiagramMatrixRepository,
+    AsyncPostgreSQLDiagramMatrixRepository,
+    AsyncPostgreSQLDiagramRepository,
+    AsyncPostgreSQLNFRRepository,
+    AsyncPostgreSQLUserRepository,
+)
+from app.infrastructure.persistence.database import (
+    SessionLocal,
+    get_async_db,
+    get_db,
+)
+from app.infrastructure.persistence.unit_of_work import SQLAlchemyUnitOfWork
 from app.infrastructure.persistence.postgresql import (
+    PackedPostgreSQLDiagramMatrixRepository,
     PostgreSQLDiagramRepository,
     PostgreSQLDiagramMatrixRepository,
     PostgreSQLNFRRepository,
     PostgreSQLUserRepository,
 )
+from app.infrastructure.ratelimit.in_memory import InMemoryRateLimitBackend
 from app.infrastructure.storage.local import LocalDiagramStorage
 
 security = HTTPBearer()
@@ -40,20 +94,57 @@ def get_diagram_storage() -> LocalDiagramStorage:
 
 
 @lru_cache
-def get_plantuml_parser() -> RegexPlantUMLParser:
-    return RegexPlantUMLParser()
+def get_plantuml_parser() -> PlantUMLParser:
+    if get_settings().plantuml_parser == "regex":
+        return RegexPlantUMLParser()
+    return TokenizingPlantUMLParser()
+
+
+@lru_cache
+def get_parse_result_cache() -> ParseResultCache:
+    settings = get_settings()
+    backing = (
+        FileParseResultCache(settings.parse_cache_dir)
+        if settings.parse_cache_dir
+        else None
+    )
+    return LRUParseResultCache(
+        max_entries=settings.parse_cache_max_entries,
+        max_bytes=settings.parse_cache_max_bytes,
+        backing=backing,
+    )
+
+
+@lru_cache
+def get_diff_result_cache() -> DiffResultCache:
+    return LRUDiffResultCache(max_entries=get_settings().diff_cache_max_entries)
+
+
+@lru_cache
+def get_ownership_cache() -> OwnershipCache:
+    settings = get_settings()
+    return TTLOwnershipCache(
+        ttl_seconds=settings.ownership_cache_ttl_seconds,
+        max_entries=settings.ownership_cache_max_entries,
+    )
 
 
 def get_diagram_service(
     repository: DiagramRepository = Depends(get_diagram_repository),
     storage: LocalDiagramStorage = Depends(get_diagram_storage),
-    parser: RegexPlantUMLParser = Depends(get_plantuml_parser),
+    parser: PlantUMLParser = Depends(get_plantuml_parser),
+    parse_cache: ParseResultCache = Depends(get_parse_result_cache),
+    diff_cache: DiffResultCache = Depends(get_diff_result_cache),
+    ownership_cache: OwnershipCache = Depends(get_ownership_cache),
 ) -> DiagramService:
     """Get diagram service with dependencies."""
     return DiagramService(
         repository,
         storage,
         parser,
+        parse_cache,
+        diff_cache,
+        ownership_cache,
     )
 
 
@@ -63,27 +154,168 @@ def get_nfr_repository(
     return PostgreSQLNFRRepository(db)
 
 
+@lru_cache
+def get_matrix_backfill_queue() -> MatrixBackfillQueue:
+    return InMemoryMatrixBackfillQueue()
+
+
+def get_matrix_backfill_service(
+    queue: MatrixBackfillQueue = Depends(get_matrix_backfill_queue),
+) -> MatrixBackfillService:
+    return MatrixBackfillService(queue)
+
+
 def get_nfr_service(
     repository: NonFunctionalRequirementRepository = Depends(get_nfr_repository),
+    backfill: MatrixBackfillService = Depends(get_matrix_backfill_service),
 ) -> NFRService:
-    return NFRService(repository)
+    return NFRService(repository, backfill)
 
 
 def get_diagram_matrix_repository(
     db: Session = Depends(get_db),
 ) -> DiagramMatrixRepository:
+    if get_settings().matrix_storage == "packed":
+        return PackedPostgreSQLDiagramMatrixRepository(db)
     return PostgreSQLDiagramMatrixRepository(db)
 
 
 def get_diagram_matrix_service(
     matrix_repository: DiagramMatrixRepository = Depends(get_diagram_matrix_repository),
-    nfr_repository: NonFunctionalRequirementRepository = Depends(get_nfr_repository),
-    diagram_repository: DiagramRepository = Depends(get_diagram_repository),
 ) -> DiagramMatrixService:
-    return DiagramMatrixService(
-        matrix_repository,
-        nfr_repository,
-        diagram_repository,
+    return DiagramMatrixService(matrix_repository)
+
+
+def get_unit_of_work(db: Session = Depends(get_db)) -> UnitOfWork:
+    """Unit of work over the same session the request's repositories use."""
+    return SQLAlchemyUnitOfWork(db)
+
+
+def get_async_diagram_repository(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncDiagramRepository:
+    return AsyncPostgreSQLDiagramRepository(db)
+
+
+def get_async_diagram_service(
+    repository: AsyncDiagramRepository = Depends(get_async_diagram_repository),
+    ownership_cache: OwnershipCache = Depends(get_ownership_cache),
+) -> AsyncDiagramService:
+    return AsyncDiagramService(repository, ownership_cache)
+
+
+def get_async_nfr_repository(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncNonFunctionalRequirementRepository:
+    return AsyncPostgreSQLNFRRepository(db)
+
+
+def get_async_nfr_service(
+    repository: AsyncNonFunctionalRequirementRepository = Depends(
+        get_async_nfr_repository
+    ),
+    backfill: MatrixBackfillService = Depends(get_matrix_backfill_service),
+) -> AsyncNFRService:
+    return AsyncNFRService(repository, backfill)
+
+
+def get_async_diagram_matrix_repository(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncDiagramMatrixRepository:
+    if get_settings().matrix_storage == "packed":
+        return AsyncPackedPostgreSQLDiagramMatrixRepository(db)
+    return AsyncPostgreSQLDiagramMatrixRepository(db)
+
+
+def get_async_diagram_matrix_service(
+    matrix_repository: AsyncDiagramMatrixRepository = Depends(
+        get_async_diagram_matrix_repository
+    ),
+) -> AsyncDiagramMatrixService:
+    return AsyncDiagramMatrixService(matrix_repository)
+
+
+@lru_cache
+def get_parse_job_queue() -> ParseJobQueue:
+    return InMemoryParseJobQueue(max_jobs=get_settings().parse_job_retention)
+
+
+def get_parse_job_service(
+    queue: ParseJobQueue = Depends(get_parse_job_queue),
+    diagram_repository: DiagramRepository = Depends(get_diagram_repository),
+) -> ParseJobService:
+    return ParseJobService(queue, diagram_repository)
+
+
+def run_parse_job(job: ParseJob) -> ParseJob:
+    """Worker entry point: process one job with its own database session."""
+    db = SessionLocal()
+    try:
+        diagram_service = DiagramService(
+            PostgreSQLDiagramRepository(db),
+            get_diagram_storage(),
+            get_plantuml_parser(),
+            get_parse_result_cache(),
+        )
+        matrix_service = DiagramMatrixService(get_diagram_matrix_repository(db))
+        return execute_parse_job(
+            job,
+            get_parse_job_queue(),
+            diagram_service,
+            matrix_service,
+            SQLAlchemyUnitOfWork(db),
+        )
+    finally:
+        db.close()
+
+
+@lru_cache
+def get_parse_job_worker_pool() -> JobWorkerPool[ParseJob]:
+    return JobWorkerPool(
+        get_parse_job_queue(),
+        run_parse_job,
+        workers=get_settings().parse_job_workers,
+        name="parse-worker",
+    )
+
+
+def run_matrix_backfill_job(job: MatrixBackfillJob) -> MatrixBackfillJob:
+    """Worker entry point: run one backfill with its own database session."""
+    settings = get_settings()
+    db = SessionLocal()
+    try:
+        return execute_backfill_job(
+            job,
+            get_matrix_backfill_queue(),
+            get_diagram_matrix_repository(db),
+            PostgreSQLNFRRepository(db),
+            batch_size=settings.nfr_backfill_batch_size,
+            pause_seconds=settings.nfr_backfill_pause_seconds,
+        )
+    finally:
+        db.close()
+
+
+def resume_matrix_backfills() -> None:
+    """Queue the cell removals of NFRs deleted before the last shutdown."""
+    db = SessionLocal()
+    try:
+        MatrixBackfillService(get_matrix_backfill_queue()).resume_removals(
+            PostgreSQLNFRRepository(db)
+        )
+    finally:
+        db.close()
+
+
+@lru_cache
+def get_matrix_backfill_worker_pool() -> JobWorkerPool[MatrixBackfillJob]:
+    # A single worker runs backfills one at a time, so removing an NFR never
+    # overlaps with still adding its cells
+    return JobWorkerPool(
+        get_matrix_backfill_queue(),
+        run_matrix_backfill_job,
+        workers=1,
+        name="matrix-backfill-worker",
     )
 
 
@@ -92,21 +324,88 @@ def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
     return PostgreSQLUserRepository(db)
 
 
+@lru_cache
+def get_token_verifier() -> TokenVerifier:
+    settings = get_settings()
+    return TokenVerifier(
+        settings.jwt_secret_key,
+        settings.jwt_algorithm,
+        cache=LRUVerifiedTokenCache(max_entries=settings.token_cache_max_entries),
+    )
+
+
+@lru_cache
+def get_password_hasher() -> BcryptPasswordHasher:
+    settings = get_settings()
+    return BcryptPasswordHasher(
+        rounds=settings.password_hash_rounds,
+        max_workers=settings.password_hash_workers,
+        max_queued=settings.password_hash_max_queued,
+    )
+
+
 def get_auth_service(
     user_repository: UserRepository = Depends(get_user_repository),
+    token_verifier: TokenVerifier = Depends(get_token_verifier),
+    password_hasher: BcryptPasswordHasher = Depends(get_password_hasher),
 ) -> AuthService:
     """Get auth service with dependencies."""
-    return AuthService(user_repository)
+    return AuthService(user_repository, token_verifier, password_hasher)
+
+
+def get_async_user_repository(
+    db: AsyncSession = Depends(get_async_db),
+) -> AsyncUserRepository:
+    return AsyncPostgreSQLUserRepository(db)
+
+
+@lru_cache
+def get_rate_limit_backend() -> RateLimitBackend:
+    return InMemoryRateLimitBackend(
+        max_keys=get_settings().login_rate_limit_max_buckets
+    )
+
+
+@lru_cache
+def get_login_rate_limiter() -> LoginRateLimiter:
+    settings = get_settings()
+
+    def limit(burst: int, per_minute: float) -> BucketLimit | None:
+        if burst <= 0 or per_minute <= 0:
+            return None
+        return BucketLimit(burst, per_minute)
+
+    return LoginRateLimiter(
+        get_rate_limit_backend(),
+        per_client=limit(
+            settings.login_rate_limit_client_burst,
+            settings.login_rate_limit_client_per_minute,
+        ),
+        per_email=limit(
+            settings.login_rate_limit_email_burst,
+            settings.login_rate_limit_email_per_minute,
+        ),
+    )
+
+
+def get_async_auth_service(
+    user_repository: AsyncUserRepository = Depends(get_async_user_repository),
+    password_hasher: BcryptPasswordHasher = Depends(get_password_hasher),
+    login_limiter: LoginRateLimiter = Depends(get_login_rate_limiter),
+) -> AsyncAuthService:
+    return AsyncAuthService(user_repository, password_hasher, login_limiter)
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    auth_service: AuthService = Depends(get_auth_service),
+    token_verifier: TokenVerifier = Depends(get_token_verifier),
 ) -> dict:
     """Get current user from JWT token."""
+    # Only the token is checked, so no session is opened, and verification
+    # is cheap enough to run on the event loop instead of a worker thread
     token = credentials.credentials
     try:
-        payload = auth_service.verify_token(token)
+        payload = token_verifier.verify(token)
         return payload
     except InvalidCredentialsError as exc:
         raise HTTPException(
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from hashlib import sha256
+
+from fastapi import Response, status
+
+# Validators are re-checked on every use, so clients and proxies may keep
+# a copy but must send If-None-Match before reusing it
+REVALIDATE = "no-cache"
+
+
+def entity_tag(*parts: object) -> str:
+    """Strong ETag over the values a representation is derived from."""
+    digest = sha256("\x1f".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches ``etag``.
+
+    If-None-Match uses the weak comparison, so a ``W/`` prefix a proxy
+    may have added does not prevent a match.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": REVALIDATE},
+    )
+
+
+def set_validators(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE
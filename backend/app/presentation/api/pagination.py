@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from datetime import datetime
+from uuid import UUID
+
+from starlette.datastructures import URL
+
+# Cursors are opaque to clients: the keyset of the last item of a page
+Keyset = tuple[datetime, UUID]
+
+
+def encode_cursor(keyset: Keyset) -> str:
+    uploaded_at, item_id = keyset
+    raw = f"{uploaded_at.isoformat()}|{item_id}".encode()
+    return urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    """Inverse of ``encode_cursor``; raises ValueError for foreign input."""
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (Base64Error, UnicodeDecodeError) as exc:
+        raise ValueError("Malformed cursor") from exc
+    uploaded_at, separator, item_id = raw.partition("|")
+    if not separator:
+        raise ValueError("Malformed cursor")
+    return datetime.fromisoformat(uploaded_at), UUID(item_id)
+
+
+def next_page_link(url: URL, keyset: Keyset) -> str:
+    """RFC 8288 ``Link`` header value pointing at the page after ``keyset``."""
+    return f'<{url.include_query_params(cursor=encode_cursor(keyset))}>; rel="next"'
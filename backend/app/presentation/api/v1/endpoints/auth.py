@@ -1,12 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from uuid import UUID
 
-from app.application.auth.services import AuthService
+from app.application.auth.services import AsyncAuthService
 from app.domain.auth.exceptions import (
     InvalidCredentialsError,
+    LoginRateLimitedError,
+    PasswordHashingBusyError,
     UserAlreadyExistsError,
 )
-from app.presentation.api.dependencies import get_auth_service, get_current_user
+from app.presentation.api.dependencies import (
+    get_async_auth_service,
+    get_current_user,
+)
 from app.presentation.api.v1.schemas.auth import (
     LoginResponse,
     RegisterResponse,
@@ -19,6 +26,17 @@ from app.presentation.api.v1.schemas.auth import (
 router = APIRouter()
 
 
+def _busy(exc: PasswordHashingBusyError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={
+            "code": "auth/busy",
+            "message": str(exc),
+        },
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post(
     "/auth/register",
     response_model=RegisterResponse,
@@ -27,10 +45,10 @@ router = APIRouter()
 )
 async def register(
     request: UserRegisterRequest,
-    auth_service: AuthService = Depends(get_auth_service),
+    auth_service: AsyncAuthService = Depends(get_async_auth_service),
 ) -> RegisterResponse:
     try:
-        user = auth_service.register_user(request.email, request.password)
+        user = await auth_service.register_user(request.email, request.password)
         token = auth_service.create_access_token(str(user.id), user.email)
         return RegisterResponse(
             user=UserResponse.from_domain(user),
@@ -44,6 +62,8 @@ async def register(
                 "message": str(exc),
             },
         ) from exc
+    except PasswordHashingBusyError as exc:
+        raise _busy(exc) from exc
 
 
 @router.post(
@@ -53,10 +73,16 @@ async def register(
 )
 async def login(
     request: UserLoginRequest,
-    auth_service: AuthService = Depends(get_auth_service),
+    http_request: Request,
+    auth_service: AsyncAuthService = Depends(get_async_auth_service),
 ) -> LoginResponse:
+    # The peer address; run behind a proxy with uvicorn --proxy-headers so
+    # this is the original client rather than the proxy
+    client = http_request.client.host if http_request.client else None
     try:
-        user, token = auth_service.login(request.email, request.password)
+        user, token = await auth_service.login(
+            request.email, request.password, client
+        )
         return LoginResponse(
             user=UserResponse.from_domain(user),
             token=TokenResponse(access_token=token, token_type="bearer"),
@@ -69,6 +95,17 @@ async def login(
                 "message": str(exc),
             },
         ) from exc
+    except LoginRateLimitedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "code": "auth/too-many-attempts",
+                "message": str(exc),
+            },
+            headers={"Retry-After": str(math.ceil(exc.retry_after))},
+        ) from exc
+    except PasswordHashingBusyError as exc:
+        raise _busy(exc) from exc
 
 
 @router.get(
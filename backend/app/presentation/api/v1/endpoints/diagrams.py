@@ -1,35 +1,127 @@
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from collections.abc import Iterator
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import PlainTextResponse
 from uuid import UUID
 
-from app.application.diagrams.matrix_service import DiagramMatrixService
-from app.application.diagrams.services import DiagramService
+from app.application.diagrams.matrix_service import (
+    AsyncDiagramMatrixService,
+    DiagramMatrixService,
+)
+from app.application.diagrams.parse_jobs import (
+    ParseJobService,
+    parse_with_matrix_defaults,
+)
+from app.application.diagrams.ports import UnitOfWork
+from app.application.diagrams.services import AsyncDiagramService, DiagramService
+from app.core.config import get_settings
+from app.domain.diagrams.entities import DiagramVersion
 from app.domain.diagrams.exceptions import (
     DiagramAlreadyExistsError,
     DiagramNotFoundError,
     ParseError,
+    UnknownMatrixAxisError,
 )
 from app.presentation.api.dependencies import (
+    get_async_diagram_matrix_service,
+    get_async_diagram_service,
     get_current_user,
     get_diagram_matrix_service,
     get_diagram_service,
+    get_parse_job_service,
+    get_unit_of_work,
+)
+from app.presentation.api.etags import (
+    REVALIDATE,
+    entity_tag,
+    etag_matches,
+    not_modified,
+    set_validators,
 )
+from app.presentation.api.pagination import decode_cursor, next_page_link
 from app.presentation.api.v1.schemas import (
     ComponentResponse,
     ComponentDiffResponse,
+    DenseDiagramMatrixResponse,
     DiagramResponse,
     DiagramMatrixResponse,
     DiagramDiffResponse,
+    DiagramEvolutionResponse,
+    DiagramEvolutionStepResponse,
     MatrixCellResponse,
     MatrixCellUpdateResponse,
+    MatrixCellsUpdateResponse,
+    MatrixFormat,
     NFRScoreResponse,
     ParseDiagramResponse,
+    ParseJobResponse,
     RelationshipDiffResponse,
     RelationshipResponse,
     UpdateMatrixCellRequest,
+    UpdateMatrixCellsRequest,
 )
 
 router = APIRouter()
 
+# Accept media types selecting a dense matrix response; ``format`` wins
+MATRIX_MEDIA_TYPES: dict[str, MatrixFormat] = {
+    "application/vnd.matrix.dense+json": MatrixFormat.DENSE,
+    "application/vnd.matrix.packed+json": MatrixFormat.PACKED,
+}
+_MEDIA_TYPES_BY_FORMAT = {
+    matrix_format: media_type
+    for media_type, matrix_format in MATRIX_MEDIA_TYPES.items()
+}
+
+
+# ETags come from the version read before the representation is loaded,
+# so a concurrent write can only make a tag older than its body, which
+# costs one extra 200 rather than serving stale data as fresh
+def _diagram_etag(version: DiagramVersion) -> str:
+    return entity_tag(
+        "diagram",
+        version.diagram_id,
+        version.checksum,
+        version.status.value,
+        version.parsed_at,
+    )
+
+
+def _matrix_etag(version: DiagramVersion, matrix_format: MatrixFormat) -> str:
+    return entity_tag(
+        "matrix",
+        version.diagram_id,
+        version.checksum,
+        version.parsed_at,
+        version.matrix_version,
+        version.nfrs_deleted_at,
+        matrix_format.value,
+    )
+
+
+def _diff_etag(base: DiagramVersion, target: DiagramVersion) -> str:
+    return entity_tag(
+        "diff",
+        base.diagram_id,
+        base.checksum,
+        base.parsed_at,
+        target.diagram_id,
+        target.checksum,
+        target.parsed_at,
+    )
+
 
 @router.post(
     "/diagrams",
@@ -37,13 +129,13 @@ router = APIRouter()
     status_code=status.HTTP_201_CREATED,
     summary="Upload PlantUML diagram",
 )
-async def upload_diagram(
+def upload_diagram(
     file: UploadFile = File(...),
     name: str | None = Form(default=None),
     current_user: dict = Depends(get_current_user),
     service: DiagramService = Depends(get_diagram_service),
 ) -> DiagramResponse:
-    payload = await file.read()
+    payload = file.file.read()
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -68,20 +160,148 @@ async def upload_diagram(
     return DiagramResponse.from_domain(diagram)
 
 
+def _iter_upload_chunks(file: UploadFile, first_chunk: bytes) -> Iterator[bytes]:
+    chunk_size = get_settings().upload_chunk_size_bytes
+    chunk = first_chunk
+    while chunk:
+        yield chunk
+        chunk = file.file.read(chunk_size)
+
+
+@router.post(
+    "/diagrams/upload-and-parse",
+    response_model=ParseDiagramResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Upload PlantUML diagram and parse it while streaming",
+)
+def upload_and_parse_diagram(
+    file: UploadFile = File(...),
+    name: str | None = Form(default=None),
+    current_user: dict = Depends(get_current_user),
+    service: DiagramService = Depends(get_diagram_service),
+    matrix_service: DiagramMatrixService = Depends(get_diagram_matrix_service),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
+) -> ParseDiagramResponse:
+    first_chunk = file.file.read(get_settings().upload_chunk_size_bytes)
+    if not first_chunk:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "diagram/empty-file", "message": "Uploaded file is empty"},
+        )
+
+    try:
+        user_id = UUID(current_user["sub"])
+        # Diagram, components, relationships and matrix defaults commit together
+        with unit_of_work:
+            diagram, components, relationships = service.upload_and_parse_diagram(
+                user_id,
+                file.filename or "diagram.puml",
+                _iter_upload_chunks(file, first_chunk),
+                display_name=name,
+            )
+            matrix_service.ensure_defaults(diagram.id)
+            unit_of_work.commit()
+    except DiagramAlreadyExistsError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "code": "diagram/already-exists",
+                "message": "Diagram with identical content already exists",
+                "diagramId": str(exc.args[0]),
+            },
+        ) from exc
+    except ParseError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "code": "diagram/parse-error",
+                "message": str(exc),
+            },
+        ) from exc
+
+    return ParseDiagramResponse(
+        diagram=DiagramResponse.from_domain(diagram),
+        components=[ComponentResponse.from_domain(c) for c in components],
+        relationships=[RelationshipResponse.from_domain(r) for r in relationships],
+    )
+
+
 @router.get(
     "/diagrams",
     response_model=list[DiagramResponse],
-    summary="List all diagrams",
+    summary="List diagrams, newest first, one page at a time if asked",
 )
 async def list_diagrams(
+    request: Request,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
     current_user: dict = Depends(get_current_user),
-    service: DiagramService = Depends(get_diagram_service),
+    service: AsyncDiagramService = Depends(get_async_diagram_service),
 ) -> list[DiagramResponse]:
+    settings = get_settings()
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(cursor)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "code": "diagram/invalid-cursor",
+                    "message": "Cursor is not one returned by this endpoint",
+                },
+            ) from exc
+
+    if limit is None and cursor is None:
+        # Clients that predate pagination expect every diagram in one list
+        page_size = None
+    else:
+        page_size = min(
+            limit or settings.diagram_page_size, settings.diagram_page_size_max
+        )
     user_id = UUID(current_user["sub"])
-    diagrams = service.list_diagrams(user_id)
+    diagrams, next_after = await service.list_diagram_page(user_id, page_size, after)
+    # The body stays a plain list; the next page is linked from the header
+    if next_after is not None:
+        response.headers["Link"] = next_page_link(request.url, next_after)
     return [DiagramResponse.from_domain(diagram) for diagram in diagrams]
 
 
+@router.get(
+    "/diagrams/evolution",
+    response_model=DiagramEvolutionResponse,
+    summary="Get scores and consecutive differences across diagram versions",
+)
+def get_diagram_evolution(
+    ids: list[UUID] = Query(..., min_length=2, max_length=50),
+    current_user: dict = Depends(get_current_user),
+    service: DiagramService = Depends(get_diagram_service),
+    matrix_service: DiagramMatrixService = Depends(get_diagram_matrix_service),
+) -> DiagramEvolutionResponse:
+    user_id = UUID(current_user["sub"])
+    try:
+        steps = service.diagram_evolution(user_id, ids)
+    except DiagramNotFoundError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "diagram/not-found",
+                "message": str(exc),
+            },
+        ) from exc
+
+    scores = matrix_service.score_matrices([step.diagram_id for step in steps])
+    return DiagramEvolutionResponse(
+        versions=[
+            DiagramEvolutionStepResponse.from_domain(
+                step, *scores[step.diagram_id]
+            )
+            for step in steps
+        ]
+    )
+
+
 @router.get(
     "/diagrams/{diagram_id}",
     response_model=DiagramResponse,
@@ -89,11 +309,19 @@ async def list_diagrams(
 )
 async def get_diagram(
     diagram_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     current_user: dict = Depends(get_current_user),
-    service: DiagramService = Depends(get_diagram_service),
-) -> DiagramResponse:
+    service: AsyncDiagramService = Depends(get_async_diagram_service),
+) -> DiagramResponse | Response:
     user_id = UUID(current_user["sub"])
-    diagram = service.get_diagram(user_id, diagram_id)
+    version = await service.get_diagram_version(user_id, diagram_id)
+    diagram = None
+    if version:
+        etag = _diagram_etag(version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        diagram = await service.get_diagram(user_id, diagram_id)
     if not diagram:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -102,23 +330,63 @@ async def get_diagram(
                 "message": f"Diagram with ID {diagram_id} not found",
             },
         )
+    set_validators(response, etag)
     return DiagramResponse.from_domain(diagram)
 
 
+@router.get(
+    "/diagrams/{diagram_id}/content",
+    response_class=PlainTextResponse,
+    summary="Get the PlantUML source of a diagram",
+)
+async def get_diagram_content(
+    diagram_id: UUID,
+    if_none_match: str | None = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    service: AsyncDiagramService = Depends(get_async_diagram_service),
+) -> Response:
+    user_id = UUID(current_user["sub"])
+    version = await service.get_diagram_version(user_id, diagram_id)
+    content = None
+    if version:
+        # The checksum identifies the content, so it alone makes the tag
+        etag = entity_tag("content", version.checksum)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        content = await service.get_diagram_content(version)
+    if content is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "diagram/not-found",
+                "message": f"Diagram with ID {diagram_id} not found",
+            },
+        )
+    return PlainTextResponse(
+        content,
+        media_type="text/x-plantuml",
+        headers={"ETag": etag, "Cache-Control": REVALIDATE},
+    )
+
+
 @router.post(
     "/diagrams/{diagram_id}/parse",
     response_model=ParseDiagramResponse,
     summary="Parse diagram to extract components and relationships",
 )
-async def parse_diagram(
+def parse_diagram(
     diagram_id: UUID,
     current_user: dict = Depends(get_current_user),
     service: DiagramService = Depends(get_diagram_service),
     matrix_service: DiagramMatrixService = Depends(get_diagram_matrix_service),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
 ) -> ParseDiagramResponse:
     try:
         user_id = UUID(current_user["sub"])
-        components, relationships = service.parse_diagram(user_id, diagram_id)
+        # Component sync, status update and matrix defaults commit together
+        components, relationships = parse_with_matrix_defaults(
+            service, matrix_service, unit_of_work, user_id, diagram_id
+        )
     except DiagramNotFoundError as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -146,9 +414,6 @@ async def parse_diagram(
             },
         )
 
-    # Ensure matrix defaults exist for all components/NFR pairs
-    matrix_service.ensure_defaults(diagram_id)
-
     return ParseDiagramResponse(
         diagram=DiagramResponse.from_domain(diagram),
         components=[ComponentResponse.from_domain(c) for c in components],
@@ -156,20 +421,92 @@ async def parse_diagram(
     )
 
 
+@router.post(
+    "/diagrams/{diagram_id}/parse-jobs",
+    response_model=ParseJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue diagram parsing in the background",
+)
+def submit_parse_job(
+    diagram_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    job_service: ParseJobService = Depends(get_parse_job_service),
+) -> ParseJobResponse:
+    try:
+        job = job_service.submit(UUID(current_user["sub"]), diagram_id)
+    except DiagramNotFoundError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "diagram/not-found",
+                "message": str(exc),
+            },
+        ) from exc
+    return ParseJobResponse.from_domain(job)
+
+
+@router.get(
+    "/diagrams/{diagram_id}/parse-jobs/{job_id}",
+    response_model=ParseJobResponse,
+    summary="Get background parse job status",
+)
+def get_parse_job(
+    diagram_id: UUID,
+    job_id: UUID,
+    current_user: dict = Depends(get_current_user),
+    job_service: ParseJobService = Depends(get_parse_job_service),
+) -> ParseJobResponse:
+    job = job_service.get_job(UUID(current_user["sub"]), diagram_id, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "parse-job/not-found",
+                "message": f"Parse job with ID {job_id} not found",
+            },
+        )
+    return ParseJobResponse.from_domain(job)
+
+
+def _requested_matrix_format(
+    matrix_format: MatrixFormat | None, accept: str | None
+) -> MatrixFormat:
+    if matrix_format is not None:
+        return matrix_format
+    for media_range in (accept or "").split(","):
+        media_type = media_range.split(";", 1)[0].strip().lower()
+        if media_type in MATRIX_MEDIA_TYPES:
+            return MATRIX_MEDIA_TYPES[media_type]
+    return MatrixFormat.ENTRIES
+
+
 @router.get(
     "/diagrams/{diagram_id}/matrix",
     response_model=DiagramMatrixResponse,
     summary="Get NFR × Component impact matrix for a diagram",
+    description=(
+        "Returns one entry per cell by default. `format=dense` (or an Accept "
+        "of application/vnd.matrix.dense+json) returns a "
+        "DenseDiagramMatrixResponse with ordered axes and row-major impact "
+        "codes instead; `format=packed` (application/vnd.matrix.packed+json) "
+        "base64-packs those codes at four per byte."
+    ),
 )
 async def get_matrix(
     diagram_id: UUID,
+    response: Response,
+    matrix_format: MatrixFormat | None = Query(default=None, alias="format"),
+    accept: str | None = Header(default=None),
+    if_none_match: str | None = Header(default=None),
     current_user: dict = Depends(get_current_user),
-    diagram_service: DiagramService = Depends(get_diagram_service),
-    matrix_service: DiagramMatrixService = Depends(get_diagram_matrix_service),
-) -> DiagramMatrixResponse:
+    diagram_service: AsyncDiagramService = Depends(get_async_diagram_service),
+    matrix_service: AsyncDiagramMatrixService = Depends(
+        get_async_diagram_matrix_service
+    ),
+) -> DiagramMatrixResponse | Response:
     user_id = UUID(current_user["sub"])
-    diagram = diagram_service.get_diagram(user_id, diagram_id)
-    if not diagram:
+    version = await diagram_service.get_diagram_version(user_id, diagram_id)
+    if not version:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={
@@ -177,7 +514,37 @@ async def get_matrix(
                 "message": f"Diagram with ID {diagram_id} not found",
             },
         )
-    entries, scores, overall_score = matrix_service.list_matrix_with_scores(diagram_id)
+
+    matrix_format = _requested_matrix_format(matrix_format, accept)
+    etag = _matrix_etag(version, matrix_format)
+    if etag_matches(if_none_match, etag):
+        not_modified_response = not_modified(etag)
+        not_modified_response.headers["Vary"] = "Accept"
+        return not_modified_response
+
+    if matrix_format is not MatrixFormat.ENTRIES:
+        matrix, scores, overall_score = await matrix_service.load_matrix_with_scores(
+            diagram_id
+        )
+        packed = matrix_format is MatrixFormat.PACKED
+        dense = DenseDiagramMatrixResponse.from_matrix(
+            matrix, scores, overall_score, packed=packed
+        )
+        # Serialized directly: response_model validation would re-check
+        # every code the dense shape exists to avoid
+        return Response(
+            content=dense.model_dump_json(
+                exclude={"impacts"} if packed else {"packed_impacts"}
+            ),
+            media_type=_MEDIA_TYPES_BY_FORMAT[matrix_format],
+            headers={"Vary": "Accept", "ETag": etag, "Cache-Control": REVALIDATE},
+        )
+
+    response.headers["Vary"] = "Accept"
+    set_validators(response, etag)
+    entries, scores, overall_score = await matrix_service.list_matrix_with_scores(
+        diagram_id
+    )
     return DiagramMatrixResponse(
         entries=[MatrixCellResponse.from_domain(entry) for entry in entries],
         nfr_scores=[
@@ -188,6 +555,19 @@ async def get_matrix(
     )
 
 
+def _unknown_matrix_axis(diagram_id: UUID) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail={
+            "code": "matrix/unknown-reference",
+            "message": (
+                "Matrix cells reference NFRs or components that diagram "
+                f"{diagram_id} does not have"
+            ),
+        },
+    )
+
+
 @router.put(
     "/diagrams/{diagram_id}/matrix",
     response_model=MatrixCellUpdateResponse,
@@ -197,12 +577,13 @@ async def update_matrix_cell(
     diagram_id: UUID,
     payload: UpdateMatrixCellRequest,
     current_user: dict = Depends(get_current_user),
-    diagram_service: DiagramService = Depends(get_diagram_service),
-    matrix_service: DiagramMatrixService = Depends(get_diagram_matrix_service),
+    diagram_service: AsyncDiagramService = Depends(get_async_diagram_service),
+    matrix_service: AsyncDiagramMatrixService = Depends(
+        get_async_diagram_matrix_service
+    ),
 ) -> MatrixCellUpdateResponse:
     user_id = UUID(current_user["sub"])
-    diagram = diagram_service.get_diagram(user_id, diagram_id)
-    if not diagram:
+    if diagram_id not in await diagram_service.owned_by(user_id, [diagram_id]):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={
@@ -210,13 +591,16 @@ async def update_matrix_cell(
                 "message": f"Diagram with ID {diagram_id} not found",
             },
         )
-    entry = matrix_service.update_impact(
-        diagram_id,
-        payload.nfr_id,
-        payload.component_id,
-        payload.impact,
-    )
-    _, scores, overall_score = matrix_service.list_matrix_with_scores(diagram_id)
+    try:
+        entry = await matrix_service.update_impact(
+            diagram_id,
+            payload.nfr_id,
+            payload.component_id,
+            payload.impact,
+        )
+    except UnknownMatrixAxisError as exc:
+        raise _unknown_matrix_axis(diagram_id) from exc
+    scores, overall_score = await matrix_service.score_matrix(diagram_id)
     nfr_score = scores.get(payload.nfr_id, 0)
     return MatrixCellUpdateResponse(
         entry=MatrixCellResponse.from_domain(entry),
@@ -225,23 +609,77 @@ async def update_matrix_cell(
     )
 
 
+@router.patch(
+    "/diagrams/{diagram_id}/matrix/cells",
+    response_model=MatrixCellsUpdateResponse,
+    summary="Set the impact of many matrix cells in one request",
+)
+async def update_matrix_cells(
+    diagram_id: UUID,
+    payload: UpdateMatrixCellsRequest,
+    current_user: dict = Depends(get_current_user),
+    diagram_service: AsyncDiagramService = Depends(get_async_diagram_service),
+    matrix_service: AsyncDiagramMatrixService = Depends(
+        get_async_diagram_matrix_service
+    ),
+) -> MatrixCellsUpdateResponse:
+    user_id = UUID(current_user["sub"])
+    if diagram_id not in await diagram_service.owned_by(user_id, [diagram_id]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "diagram/not-found",
+                "message": f"Diagram with ID {diagram_id} not found",
+            },
+        )
+    try:
+        entries, scores, overall_score = await matrix_service.update_impacts(
+            diagram_id,
+            [(cell.nfr_id, cell.component_id, cell.impact) for cell in payload.cells],
+        )
+    except UnknownMatrixAxisError as exc:
+        raise _unknown_matrix_axis(diagram_id) from exc
+    return MatrixCellsUpdateResponse(
+        entries=[MatrixCellResponse.from_domain(entry) for entry in entries],
+        nfr_scores=[
+            NFRScoreResponse(nfr_id=nfr_id, score=score)
+            for nfr_id, score in scores.items()
+        ],
+        overall_score=overall_score,
+    )
+
+
 @router.get(
     "/diagrams/{base_diagram_id}/diff/{target_diagram_id}",
     response_model=DiagramDiffResponse,
     summary="Get differences between two diagrams",
 )
-async def diff_diagrams(
+def diff_diagrams(
     base_diagram_id: UUID,
     target_diagram_id: UUID,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
     current_user: dict = Depends(get_current_user),
     service: DiagramService = Depends(get_diagram_service),
-) -> DiagramDiffResponse:
+) -> DiagramDiffResponse | Response:
+    user_id = UUID(current_user["sub"])
+    versions = service.get_diagram_versions(
+        user_id, [base_diagram_id, target_diagram_id]
+    )
+    base = versions.get(base_diagram_id)
+    target = versions.get(target_diagram_id)
+    if base and target:
+        etag = _diff_etag(base, target)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        set_validators(response, etag)
+
     try:
-        user_id = UUID(current_user["sub"])
         component_diffs, relationship_diffs = service.diff_diagrams(
             user_id,
             base_diagram_id=base_diagram_id,
             target_diagram_id=target_diagram_id,
+            versions=versions,
         )
     except DiagramNotFoundError as exc:
         raise HTTPException(
@@ -255,25 +693,8 @@ async def diff_diagrams(
     return DiagramDiffResponse(
         base_diagram_id=base_diagram_id,
         target_diagram_id=target_diagram_id,
-        components=[
-            ComponentDiffResponse(
-                name=diff.name,
-                change_type=diff.change_type,
-                previous_type=diff.previous_type,
-                new_type=diff.new_type,
-            )
-            for diff in component_diffs
-        ],
+        components=[ComponentDiffResponse.from_domain(d) for d in component_diffs],
         relationships=[
-            RelationshipDiffResponse(
-                source=diff.source,
-                target=diff.target,
-                change_type=diff.change_type,
-                previous_label=diff.previous_label,
-                new_label=diff.new_label,
-                previous_direction=diff.previous_direction,
-                new_direction=diff.new_direction,
-            )
-            for diff in relationship_diffs
+            RelationshipDiffResponse.from_domain(d) for d in relationship_diffs
         ],
     )
@@ -4,10 +4,18 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.application.nfr.services import NFRService
+from app.application.nfr.backfill import MatrixBackfillService
+from app.application.nfr.services import AsyncNFRService
 from app.domain.nfr.exceptions import NFRAlreadyExistsError, NFRNotFoundError
-from app.presentation.api.dependencies import get_nfr_service
-from app.presentation.api.v1.schemas import CreateNFRRequest, NFRResponse
+from app.presentation.api.dependencies import (
+    get_async_nfr_service,
+    get_matrix_backfill_service,
+)
+from app.presentation.api.v1.schemas import (
+    CreateNFRRequest,
+    MatrixBackfillJobResponse,
+    NFRResponse,
+)
 
 router = APIRouter(prefix="/nfrs")
 
@@ -18,9 +26,9 @@ router = APIRouter(prefix="/nfrs")
     summary="List all non-functional requirements",
 )
 async def list_nfrs(
-    service: NFRService = Depends(get_nfr_service),
+    service: AsyncNFRService = Depends(get_async_nfr_service),
 ) -> list[NFRResponse]:
-    requirements = service.list_requirements()
+    requirements = await service.list_requirements()
     return [NFRResponse.from_domain(nfr) for nfr in requirements]
 
 
@@ -31,10 +39,10 @@ async def list_nfrs(
     summary="Create a new non-functional requirement",
 )
 async def create_nfr(
-    payload: CreateNFRRequest, service: NFRService = Depends(get_nfr_service)
+    payload: CreateNFRRequest, service: AsyncNFRService = Depends(get_async_nfr_service)
 ) -> NFRResponse:
     try:
-        nfr = service.create_requirement(payload.name, payload.description)
+        nfr = await service.create_requirement(payload.name, payload.description)
     except NFRAlreadyExistsError as exc:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -51,12 +59,16 @@ async def create_nfr(
     "/{nfr_id}",
     status_code=status.HTTP_200_OK,
     summary="Delete an existing non-functional requirement",
+    description=(
+        "The NFR is hidden right away; its cells are removed from every "
+        "diagram matrix in the background."
+    ),
 )
 async def delete_nfr(
-    nfr_id: UUID, service: NFRService = Depends(get_nfr_service)
+    nfr_id: UUID, service: AsyncNFRService = Depends(get_async_nfr_service)
 ) -> dict[str, str]:
     try:
-        service.delete_requirement(nfr_id)
+        await service.delete_requirement(nfr_id)
     except NFRNotFoundError as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -66,3 +78,28 @@ async def delete_nfr(
             },
         ) from exc
     return {"status": "deleted"}
+
+
+@router.get(
+    "/{nfr_id}/backfill-job",
+    response_model=MatrixBackfillJobResponse,
+    summary="Get progress of the latest matrix backfill for an NFR",
+    description=(
+        "Jobs are tracked in memory by the process that queued them, so "
+        "other processes answer 404 for them."
+    ),
+)
+async def get_nfr_backfill_job(
+    nfr_id: UUID,
+    backfill: MatrixBackfillService = Depends(get_matrix_backfill_service),
+) -> MatrixBackfillJobResponse:
+    job = backfill.latest_job(nfr_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "code": "nfr-backfill/not-found",
+                "message": f"No matrix backfill job for NFR {nfr_id}",
+            },
+        )
+    return MatrixBackfillJobResponse.from_domain(job)
@@ -2,33 +2,48 @@ from .diagrams import (
     ComponentResponse,
     ComponentDiffResponse,
     DiagramDiffResponse,
+    DiagramEvolutionResponse,
+    DiagramEvolutionStepResponse,
     DiagramResponse,
     ParseDiagramResponse,
+    ParseJobResponse,
     RelationshipDiffResponse,
     RelationshipResponse,
 )
-from .nfrs import CreateNFRRequest, NFRResponse
+from .nfrs import CreateNFRRequest, MatrixBackfillJobResponse, NFRResponse
 from .matrix import (
+    DenseDiagramMatrixResponse,
     DiagramMatrixResponse,
     MatrixCellResponse,
     MatrixCellUpdateResponse,
+    MatrixCellsUpdateResponse,
+    MatrixFormat,
     NFRScoreResponse,
     UpdateMatrixCellRequest,
+    UpdateMatrixCellsRequest,
 )
 
 __all__ = [
     "ComponentResponse",
     "ComponentDiffResponse",
     "DiagramDiffResponse",
+    "DiagramEvolutionResponse",
+    "DiagramEvolutionStepResponse",
     "DiagramResponse",
     "ParseDiagramResponse",
+    "ParseJobResponse",
     "RelationshipDiffResponse",
     "RelationshipResponse",
     "CreateNFRRequest",
+    "MatrixBackfillJobResponse",
     "NFRResponse",
+    "DenseDiagramMatrixResponse",
     "DiagramMatrixResponse",
     "MatrixCellResponse",
     "MatrixCellUpdateResponse",
+    "MatrixCellsUpdateResponse",
+    "MatrixFormat",
     "NFRScoreResponse",
     "UpdateMatrixCellRequest",
+    "UpdateMatrixCellsRequest",
 ]
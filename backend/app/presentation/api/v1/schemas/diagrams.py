@@ -7,11 +7,18 @@ from typing import Literal
 
 from pydantic import BaseModel
 
+from .matrix import NFRScoreResponse
+
+from app.application.diagrams.ports import ComponentDiff, RelationshipDiff
+from app.application.diagrams.services import EvolutionStep
 from app.domain.diagrams.entities import (
     Component,
     ComponentType,
     Diagram,
+    DiagramSummary,
     DiagramStatus,
+    ParseJob,
+    ParseJobStatus,
     Relationship,
     RelationshipDirection,
 )
@@ -26,7 +33,7 @@ class DiagramResponse(BaseModel):
     parsed_at: datetime | None = None
 
     @classmethod
-    def from_domain(cls, diagram: Diagram) -> "DiagramResponse":
+    def from_domain(cls, diagram: Diagram | DiagramSummary) -> "DiagramResponse":
         return cls(
             id=diagram.id,
             name=diagram.name,
@@ -90,12 +97,52 @@ class ParseDiagramResponse(BaseModel):
     relationships: list[RelationshipResponse]
 
 
+class ParseJobResponse(BaseModel):
+    id: UUID
+    diagram_id: UUID
+    status: ParseJobStatus
+    error: str | None = None
+    component_count: int | None = None
+    relationship_count: int | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @classmethod
+    def from_domain(cls, job: ParseJob) -> "ParseJobResponse":
+        return cls(
+            id=job.id,
+            diagram_id=job.diagram_id,
+            status=job.status,
+            error=job.error,
+            component_count=job.component_count,
+            relationship_count=job.relationship_count,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+
+    class Config:
+        json_encoders = {
+            UUID: str,
+        }
+
+
 class ComponentDiffResponse(BaseModel):
     name: str
     change_type: Literal["added", "removed", "modified"]
     previous_type: ComponentType | None = None
     new_type: ComponentType | None = None
 
+    @classmethod
+    def from_domain(cls, diff: ComponentDiff) -> "ComponentDiffResponse":
+        return cls(
+            name=diff.name,
+            change_type=diff.change_type,
+            previous_type=diff.previous_type,
+            new_type=diff.new_type,
+        )
+
 
 class RelationshipDiffResponse(BaseModel):
     source: str
@@ -106,9 +153,59 @@ class RelationshipDiffResponse(BaseModel):
     previous_direction: RelationshipDirection | None = None
     new_direction: RelationshipDirection | None = None
 
+    @classmethod
+    def from_domain(cls, diff: RelationshipDiff) -> "RelationshipDiffResponse":
+        return cls(
+            source=diff.source,
+            target=diff.target,
+            change_type=diff.change_type,
+            previous_label=diff.previous_label,
+            new_label=diff.new_label,
+            previous_direction=diff.previous_direction,
+            new_direction=diff.new_direction,
+        )
+
 
 class DiagramDiffResponse(BaseModel):
     base_diagram_id: UUID
     target_diagram_id: UUID
     components: list[ComponentDiffResponse]
     relationships: list[RelationshipDiffResponse]
+
+
+class DiagramEvolutionStepResponse(BaseModel):
+    """A version's scores and its changes since the previous version."""
+
+    diagram_id: UUID
+    component_count: int
+    relationship_count: int
+    components: list[ComponentDiffResponse]
+    relationships: list[RelationshipDiffResponse]
+    nfr_scores: list[NFRScoreResponse]
+    overall_score: float | None = None
+
+    @classmethod
+    def from_domain(
+        cls,
+        step: EvolutionStep,
+        scores: dict[UUID, float],
+        overall_score: float | None,
+    ) -> "DiagramEvolutionStepResponse":
+        return cls(
+            diagram_id=step.diagram_id,
+            component_count=step.component_count,
+            relationship_count=step.relationship_count,
+            components=[ComponentDiffResponse.from_domain(d) for d in step.components],
+            relationships=[
+                RelationshipDiffResponse.from_domain(d) for d in step.relationships
+            ],
+            nfr_scores=[
+                NFRScoreResponse(nfr_id=nfr_id, score=score)
+                for nfr_id, score in scores.items()
+            ],
+            overall_score=overall_score,
+        )
+
+
+class DiagramEvolutionResponse(BaseModel):
+    versions: list[DiagramEvolutionStepResponse]
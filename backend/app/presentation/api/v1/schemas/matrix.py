@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import base64
+from enum import Enum
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.domain.diagrams.entities import ImpactValue, DiagramNFRComponentImpact
+from app.domain.diagrams.scoring import ImpactMatrix, pack_impact_codes
 
 
 class MatrixCellResponse(BaseModel):
@@ -36,13 +39,73 @@ class DiagramMatrixResponse(BaseModel):
     overall_score: float | None = None
 
 
+class MatrixFormat(str, Enum):
+    ENTRIES = "entries"
+    DENSE = "dense"
+    PACKED = "packed"
+
+
+class DenseDiagramMatrixResponse(BaseModel):
+    """
+    Matrix as ordered axes plus the impact code of every (NFR, component)
+    pair in row-major order: 0 no cell, 1 negative, 2 no effect, 3 positive.
+
+    ``impacts`` lists the codes; in the packed format ``packed_impacts``
+    carries them base64-encoded at four per byte, lowest bits first.
+    """
+
+    nfr_ids: list[UUID]
+    component_ids: list[UUID]
+    impacts: list[int] | None = None
+    packed_impacts: str | None = None
+    nfr_scores: list[NFRScoreResponse]
+    overall_score: float | None = None
+
+    @classmethod
+    def from_matrix(
+        cls,
+        matrix: ImpactMatrix,
+        scores: dict[UUID, float],
+        overall_score: float | None,
+        packed: bool = False,
+    ) -> "DenseDiagramMatrixResponse":
+        codes = matrix.impact_codes()
+        return cls(
+            nfr_ids=list(matrix.nfr_ids),
+            component_ids=list(matrix.component_ids),
+            impacts=None if packed else codes.ravel().tolist(),
+            packed_impacts=(
+                base64.b64encode(pack_impact_codes(codes)).decode("ascii")
+                if packed
+                else None
+            ),
+            nfr_scores=[
+                NFRScoreResponse(nfr_id=nfr_id, score=score)
+                for nfr_id, score in scores.items()
+            ],
+            overall_score=overall_score,
+        )
+
+
 class UpdateMatrixCellRequest(BaseModel):
     nfr_id: UUID
     component_id: UUID
     impact: ImpactValue
 
 
+class UpdateMatrixCellsRequest(BaseModel):
+    # Bounded so a single multi-row INSERT stays under PostgreSQL's
+    # bind-parameter limit
+    cells: list[UpdateMatrixCellRequest] = Field(min_length=1, max_length=5000)
+
+
 class MatrixCellUpdateResponse(BaseModel):
     entry: MatrixCellResponse
     nfr_score: NFRScoreResponse
     overall_score: float | None = None
+
+
+class MatrixCellsUpdateResponse(BaseModel):
+    entries: list[MatrixCellResponse]
+    nfr_scores: list[NFRScoreResponse]
+    overall_score: float | None = None
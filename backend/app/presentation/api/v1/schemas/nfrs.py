@@ -5,7 +5,12 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
-from app.domain.nfr.entities import NonFunctionalRequirement
+from app.domain.nfr.entities import (
+    MatrixBackfillAction,
+    MatrixBackfillJob,
+    MatrixBackfillStatus,
+    NonFunctionalRequirement,
+)
 
 
 class CreateNFRRequest(BaseModel):
@@ -34,3 +39,36 @@ class NFRResponse(BaseModel):
         json_encoders = {
             UUID: str,
         }
+
+
+class MatrixBackfillJobResponse(BaseModel):
+    id: UUID
+    nfr_id: UUID
+    action: MatrixBackfillAction
+    status: MatrixBackfillStatus
+    diagrams_total: int | None = None
+    diagrams_done: int
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @classmethod
+    def from_domain(cls, job: MatrixBackfillJob) -> "MatrixBackfillJobResponse":
+        return cls(
+            id=job.id,
+            nfr_id=job.nfr_id,
+            action=job.action,
+            status=job.status,
+            diagrams_total=job.diagrams_total,
+            diagrams_done=job.diagrams_done,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+
+    class Config:
+        json_encoders = {
+            UUID: str,
+        }
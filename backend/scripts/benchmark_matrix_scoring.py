@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Matrix scoring benchmark.
+
+Compares the previous per-entry aggregation loop with the vectorized
+ImpactMatrix engine on fully populated NFR × component matrices and
+checks that both produce identical scores. Timings are reported for:
+
+- loop:    per-entry loop over DiagramNFRComponentImpact entities
+- entries: ImpactMatrix.from_entries(...).score()
+- columns: ImpactMatrix.from_cells(...).score() on raw column values, as
+           returned by load_impact_matrix's projection query
+- score:   ImpactMatrix.score() on an already built matrix
+
+Usage: python scripts/benchmark_matrix_scoring.py [--repeat N]
+"""
+
+import argparse
+import random
+import sys
+import timeit
+from collections import defaultdict
+from pathlib import Path
+from uuid import uuid4
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.domain.diagrams.scoring import IMPACT_SCORES, ImpactMatrix
+from app.domain.diagrams.entities import DiagramNFRComponentImpact, ImpactValue
+
+SIZES = [(30, 20), (500, 200)]
+
+
+def loop_scores(entries):
+    """Per-entry aggregation used before the vectorized engine."""
+    aggregates = defaultdict(lambda: [0, 0])
+    for entry in entries:
+        aggregate = aggregates[entry.nfr_id]
+        aggregate[0] += IMPACT_SCORES[entry.impact]
+        aggregate[1] += 1
+    averages = {nfr_id: total / count for nfr_id, (total, count) in aggregates.items()}
+    overall = sum(averages.values()) / len(averages) if averages else None
+    return averages, overall
+
+
+def vectorized_scores(entries):
+    return ImpactMatrix.from_entries(entries).score()
+
+
+def to_columns(entries):
+    """Raw (nfr_id, component_id, impact) columns, as the database returns them."""
+    return (
+        [entry.nfr_id for entry in entries],
+        [entry.component_id for entry in entries],
+        [entry.impact.value for entry in entries],
+    )
+
+
+def build_entries(nfr_count, component_count, seed=0):
+    rng = random.Random(seed)
+    impacts = list(ImpactValue)
+    diagram_id = uuid4()
+    component_ids = [uuid4() for _ in range(component_count)]
+    return [
+        DiagramNFRComponentImpact(
+            diagram_id=diagram_id,
+            nfr_id=nfr_id,
+            component_id=component_id,
+            impact=rng.choice(impacts),
+        )
+        for nfr_id in (uuid4() for _ in range(nfr_count))
+        for component_id in component_ids
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'matrix':>9} {'cells':>7} {'loop ms':>8} {'entries':>8} "
+        f"{'columns':>8} {'score':>8} {'score x':>8}"
+    )
+    for nfr_count, component_count in SIZES:
+        entries = build_entries(nfr_count, component_count)
+        columns = to_columns(entries)
+        matrix = ImpactMatrix.from_entries(entries)
+        expected = loop_scores(entries)
+        if not (
+            vectorized_scores(entries)
+            == ImpactMatrix.from_cells(*columns).score()
+            == expected
+        ):
+            print(f"Mismatch for {nfr_count}x{component_count}")
+            return 1
+
+        def best(func):
+            return min(timeit.repeat(func, number=1, repeat=args.repeat)) * 1000
+
+        loop_ms = best(lambda: loop_scores(entries))
+        entries_ms = best(lambda: vectorized_scores(entries))
+        columns_ms = best(lambda: ImpactMatrix.from_cells(*columns).score())
+        score_ms = best(matrix.score)
+        print(
+            f"{nfr_count:>4}x{component_count:<4} {len(entries):>7} "
+            f"{loop_ms:>8.3f} {entries_ms:>8.3f} {columns_ms:>8.3f} "
+            f"{score_ms:>8.3f} {loop_ms / score_ms:>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
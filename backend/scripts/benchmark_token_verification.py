@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Token verification benchmark.
+
+Compares verifying access tokens with a full signature check on every call
+against the verified-token cache, and measures the per-request latency of
+an authenticated no-op endpoint for both dependency paths:
+
+- before: AuthService.verify_token behind get_auth_service, which builds a
+          user repository on a fresh database session per request
+- after:  get_current_user, which only uses the process-wide TokenVerifier
+
+No database server is needed: sessions are opened but never connect.
+
+Usage: python scripts/benchmark_token_verification.py [--requests N]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import Depends, FastAPI
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from app.application.auth.services import AuthService
+from app.application.auth.tokens import TokenVerifier
+from app.core.config import get_settings
+from app.infrastructure.caching.verified_tokens import LRUVerifiedTokenCache
+from app.presentation.api.dependencies import (
+    get_auth_service,
+    get_current_user,
+    security,
+)
+
+
+def get_current_user_before(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    auth_service: AuthService = Depends(get_auth_service),
+) -> dict:
+    """Dependency path used before the verified-token cache."""
+    return auth_service.verify_token(credentials.credentials)
+
+
+def verifications_per_second(verify, token, seconds=1.0):
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            verify(token)
+        count += 100
+    return count / seconds
+
+
+def request_latencies_ms(client, headers, count):
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = client.get("/probe", headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise SystemExit(f"Unexpected status {response.status_code}")
+    return latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    token = AuthService(user_repository=None).create_access_token("user", "u@x.io")
+    uncached = TokenVerifier(settings.jwt_secret_key, settings.jwt_algorithm)
+    cached = TokenVerifier(
+        settings.jwt_secret_key,
+        settings.jwt_algorithm,
+        cache=LRUVerifiedTokenCache(),
+    )
+    before_rate = verifications_per_second(uncached.verify, token)
+    after_rate = verifications_per_second(cached.verify, token)
+    print(f"{'verify':>8} {'ops/s':>12}")
+    print(f"{'decode':>8} {before_rate:>12,.0f}")
+    print(f"{'cached':>8} {after_rate:>12,.0f} {after_rate / before_rate:>7.1f}x")
+
+    app = FastAPI()
+
+    @app.get("/probe")
+    async def probe(current_user: dict = Depends(get_current_user)) -> str:
+        return current_user["sub"]
+
+    headers = {"Authorization": f"Bearer {token}"}
+    print(f"\n{'request':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for label, dependency in (
+        ("before", get_current_user_before),
+        ("after", get_current_user),
+    ):
+        app.dependency_overrides[get_current_user] = dependency
+        with TestClient(app) as client:
+            request_latencies_ms(client, headers, 100)
+            latencies = request_latencies_ms(client, headers, args.requests)
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(f"{label:>8} {quantiles[49]:>8.3f} {quantiles[98]:>8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
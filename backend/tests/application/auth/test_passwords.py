@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Optional
+from uuid import UUID
+
+import pytest
+
+from app.application.auth.passwords import BcryptPasswordHasher
+from app.application.auth.services import AsyncAuthService
+from app.domain.auth.entities import User
+from app.domain.auth.exceptions import (
+    InvalidCredentialsError,
+    PasswordHashingBusyError,
+)
+from app.domain.auth.repositories import AsyncUserRepository
+
+
+class InMemoryAsyncUserRepository(AsyncUserRepository):
+    def __init__(self) -> None:
+        self.users: dict[UUID, User] = {}
+        self.updates = 0
+
+    async def add(self, user: User) -> User:
+        self.users[user.id] = user
+        return user
+
+    async def update(self, user: User) -> User:
+        self.updates += 1
+        self.users[user.id] = user
+        return user
+
+    async def get(self, user_id: UUID) -> Optional[User]:
+        return self.users.get(user_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return next((u for u in self.users.values() if u.email == email), None)
+
+
+def test_hashes_verify_on_the_worker_pool() -> None:
+    hasher = BcryptPasswordHasher(rounds=4, max_workers=2, max_queued=2)
+    try:
+        hashed = hasher.hash("correct horse")
+        assert hashed.startswith("$2b$04$")
+        assert hasher.verify("correct horse", hashed)
+        assert not hasher.verify("wrong horse", hashed)
+        assert not hasher.verify("correct horse", "not-a-hash")
+        assert asyncio.run(hasher.verify_async("correct horse", hashed))
+        assert hasher.usage() == {"running": 0, "queued": 0}
+    finally:
+        hasher.shutdown()
+
+
+def test_checks_beyond_the_queue_limit_are_refused() -> None:
+    hasher = BcryptPasswordHasher(rounds=4, max_workers=1, max_queued=1)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking_hash(password: str) -> str:
+        started.set()
+        release.wait(5)
+        return password
+
+    hasher._hash = blocking_hash
+    try:
+        running = threading.Thread(target=hasher.hash, args=("a",))
+        running.start()
+        assert started.wait(5)
+        queued = threading.Thread(target=hasher.hash, args=("b",))
+        queued.start()
+        while hasher.usage()["queued"] == 0:
+            time.sleep(0.01)
+
+        with pytest.raises(PasswordHashingBusyError):
+            hasher.hash("c")
+        assert hasher.usage() == {"running": 1, "queued": 1}
+    finally:
+        release.set()
+        running.join()
+        queued.join()
+        hasher.shutdown()
+    assert hasher.usage() == {"running": 0, "queued": 0}
+
+
+def test_needs_rehash_compares_the_stored_cost() -> None:
+    hasher = BcryptPasswordHasher(rounds=12)
+
+    assert not hasher.needs_rehash("$2b$12$" + "x" * 53)
+    assert hasher.needs_rehash("$2b$10$" + "x" * 53)
+    assert hasher.needs_rehash("plain")
+
+
+def test_login_upgrades_hashes_made_with_another_cost() -> None:
+    repository = InMemoryAsyncUserRepository()
+    old_hasher = BcryptPasswordHasher(rounds=4)
+    new_hasher = BcryptPasswordHasher(rounds=5)
+
+    async def scenario() -> None:
+        await AsyncAuthService(repository, old_hasher).register_user(
+            "user@example.com", "correct horse"
+        )
+        service = AsyncAuthService(repository, new_hasher)
+        with pytest.raises(InvalidCredentialsError):
+            await service.login("user@example.com", "wrong horse")
+        assert repository.updates == 0
+
+        user, token = await service.login("user@example.com", "correct horse")
+        assert token
+        assert user.hashed_password.startswith("$2b$05$")
+        await service.login("user@example.com", "correct horse")
+
+    asyncio.run(scenario())
+    assert repository.updates == 1
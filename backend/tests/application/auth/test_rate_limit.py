@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+import pytest
+
+from app.application.auth.passwords import BcryptPasswordHasher
+from app.application.auth.rate_limit import BucketLimit, LoginRateLimiter
+from app.application.auth.services import AsyncAuthService
+from app.domain.auth.entities import User
+from app.domain.auth.exceptions import InvalidCredentialsError, LoginRateLimitedError
+from app.domain.auth.repositories import AsyncUserRepository
+from app.infrastructure.ratelimit.in_memory import InMemoryRateLimitBackend
+
+
+class CountingAsyncUserRepository(AsyncUserRepository):
+    def __init__(self) -> None:
+        self.users: dict[UUID, User] = {}
+        self.lookups = 0
+
+    async def add(self, user: User) -> User:
+        self.users[user.id] = user
+        return user
+
+    async def update(self, user: User) -> User:
+        self.users[user.id] = user
+        return user
+
+    async def get(self, user_id: UUID) -> Optional[User]:
+        return self.users.get(user_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        self.lookups += 1
+        return next((u for u in self.users.values() if u.email == email), None)
+
+
+def test_limited_logins_fail_before_the_user_lookup() -> None:
+    repository = CountingAsyncUserRepository()
+    limiter = LoginRateLimiter(
+        InMemoryRateLimitBackend(),
+        per_client=None,
+        per_email=BucketLimit(capacity=2, per_minute=1),
+    )
+    service = AsyncAuthService(repository, BcryptPasswordHasher(rounds=4), limiter)
+
+    async def scenario() -> None:
+        await service.register_user("user@example.com", "correct horse")
+        for _ in range(2):
+            with pytest.raises(InvalidCredentialsError):
+                await service.login("user@example.com", "wrong", "10.0.0.1")
+        with pytest.raises(LoginRateLimitedError) as raised:
+            await service.login(" USER@example.com", "correct horse", "10.0.0.2")
+        assert raised.value.retry_after == pytest.approx(60, abs=1)
+
+    asyncio.run(scenario())
+    assert repository.lookups == 3
+
+
+def test_successful_logins_give_their_email_attempt_back() -> None:
+    limiter = LoginRateLimiter(
+        InMemoryRateLimitBackend(),
+        per_client=None,
+        per_email=BucketLimit(capacity=2, per_minute=1),
+    )
+    service = AsyncAuthService(
+        CountingAsyncUserRepository(), BcryptPasswordHasher(rounds=4), limiter
+    )
+
+    async def scenario() -> None:
+        await service.register_user("user@example.com", "correct horse")
+        for _ in range(5):
+            await service.login("user@example.com", "correct horse", "10.0.0.1")
+        with pytest.raises(InvalidCredentialsError):
+            await service.login("user@example.com", "wrong", "10.0.0.2")
+        # The owner still gets in after someone else's failed attempt
+        await service.login("user@example.com", "correct horse", "10.0.0.1")
+
+    asyncio.run(scenario())
+
+
+def test_client_bucket_is_checked_first_and_spares_the_email_bucket() -> None:
+    backend = InMemoryRateLimitBackend()
+    limiter = LoginRateLimiter(
+        backend,
+        per_client=BucketLimit(capacity=1, per_minute=1),
+        per_email=BucketLimit(capacity=5, per_minute=1),
+    )
+
+    async def scenario() -> None:
+        await limiter.check("victim@example.com", "10.0.0.1")
+        for _ in range(3):
+            with pytest.raises(LoginRateLimitedError):
+                await limiter.check("victim@example.com", "10.0.0.1")
+        # Requests without a known address are limited by email only
+        for _ in range(4):
+            await limiter.check("victim@example.com", None)
+        with pytest.raises(LoginRateLimitedError):
+            await limiter.check("victim@example.com", "10.0.0.2")
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import pytest
+from jose import jwt
+
+from app.application.auth.tokens import TokenVerifier
+from app.domain.auth.exceptions import InvalidCredentialsError
+from app.infrastructure.caching.verified_tokens import LRUVerifiedTokenCache
+
+SECRET = "test-secret"
+
+
+def make_token(expires_in: float, secret: str = SECRET) -> str:
+    claims = {"sub": "user", "exp": int(time.time() + expires_in)}
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+
+def test_verified_tokens_are_decoded_once() -> None:
+    verifier = TokenVerifier(SECRET, "HS256", cache=LRUVerifiedTokenCache())
+    token = make_token(expires_in=60)
+
+    with patch("app.application.auth.tokens.jwt.decode", wraps=jwt.decode) as decode:
+        first = verifier.verify(token)
+        first["sub"] = "changed by caller"
+        second = verifier.verify(token)
+
+    assert decode.call_count == 1
+    assert second["sub"] == "user"
+
+
+def test_cached_claims_stop_at_expiry() -> None:
+    now = [time.time()]
+    cache = LRUVerifiedTokenCache(clock=lambda: now[0])
+    verifier = TokenVerifier(SECRET, "HS256", cache=cache)
+    token = make_token(expires_in=60)
+    verifier.verify(token)
+
+    now[0] += 120
+    assert cache.get(token) is None
+
+
+@pytest.mark.parametrize(
+    "token",
+    [make_token(expires_in=-60), make_token(expires_in=60, secret="other"), "x.y.z"],
+)
+def test_invalid_tokens_are_rejected_and_not_cached(token: str) -> None:
+    cache = LRUVerifiedTokenCache()
+    verifier = TokenVerifier(SECRET, "HS256", cache=cache)
+
+    with pytest.raises(InvalidCredentialsError):
+        verifier.verify(token)
+    assert len(cache) == 0
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 from collections import defaultdict
 from typing import Iterable, Sequence
 from uuid import uuid4, UUID
 
-from app.application.diagrams.matrix_service import DiagramMatrixService
+from app.application.diagrams.matrix_service import (
+    AsyncDiagramMatrixService,
+    DiagramMatrixService,
+)
 from app.domain.diagrams.entities import (
     Component,
     ComponentType,
@@ -12,7 +16,10 @@ from app.domain.diagrams.entities import (
     DiagramNFRComponentImpact,
     ImpactValue,
 )
-from app.domain.diagrams.matrix_repository import DiagramMatrixRepository
+from app.domain.diagrams.matrix_repository import (
+    AsyncDiagramMatrixRepository,
+    DiagramMatrixRepository,
+)
 from app.domain.diagrams.repositories import DiagramRepository
 from app.domain.nfr.entities import NonFunctionalRequirement
 from app.domain.nfr.repositories import NonFunctionalRequirementRepository
@@ -119,10 +126,22 @@ class InMemoryNFRRepository(NonFunctionalRequirementRepository):
     def delete(self, nfr_id: UUID) -> None:
         self.items = [nfr for nfr in self.items if nfr.id != nfr_id]
 
+    def mark_deleted(self, nfr_id: UUID) -> None:
+        self.delete(nfr_id)
+
+    def list_deleted_ids(self) -> list[UUID]:
+        return []
+
 
 class InMemoryMatrixRepository(DiagramMatrixRepository):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        nfr_repository: InMemoryNFRRepository,
+        diagram_repository: InMemoryDiagramRepository,
+    ) -> None:
         self.entries: dict[tuple[UUID, UUID, UUID], DiagramNFRComponentImpact] = {}
+        self._nfr_repository = nfr_repository
+        self._diagram_repository = diagram_repository
 
     def list_by_diagram(self, diagram_id: UUID) -> Sequence[DiagramNFRComponentImpact]:
         return [
@@ -152,39 +171,96 @@ class InMemoryMatrixRepository(DiagramMatrixRepository):
         self.entries[key] = entry
         return entry
 
-    def ensure_pairs(
+    def initialize_cells(
+        self, diagram_id: UUID, default_impact: ImpactValue = ImpactValue.NO_EFFECT
+    ) -> None:
+        component_ids = {
+            component.id
+            for component in self._diagram_repository.get_components(diagram_id)
+        }
+        self.entries = {
+            key: value
+            for key, value in self.entries.items()
+            if value.diagram_id != diagram_id or value.component_id in component_ids
+        }
+        for nfr in self._nfr_repository.list():
+            for component_id in component_ids:
+                self.entries.setdefault(
+                    (diagram_id, nfr.id, component_id),
+                    DiagramNFRComponentImpact(
+                        diagram_id=diagram_id,
+                        nfr_id=nfr.id,
+                        component_id=component_id,
+                        impact=default_impact,
+                    ),
+                )
+
+
+    def count_diagrams(self) -> int:
+        return 1
+
+    def add_nfr_cells(
         self,
-        diagram_id: UUID,
-        pairs: Iterable[tuple[UUID, UUID]],
+        nfr_id: UUID,
+        after_diagram_id: UUID | None,
+        limit: int,
         default_impact: ImpactValue = ImpactValue.NO_EFFECT,
-    ) -> None:
-        for nfr_id, component_id in pairs:
-            key = (diagram_id, nfr_id, component_id)
-            if key not in self.entries:
-                self.entries[key] = DiagramNFRComponentImpact(
+    ) -> Sequence[UUID]:
+        diagram_id = self._diagram_repository.diagram.id
+        if after_diagram_id is not None and diagram_id <= after_diagram_id:
+            return []
+        for component in self._diagram_repository.get_components(diagram_id):
+            self.entries.setdefault(
+                (diagram_id, nfr_id, component.id),
+                DiagramNFRComponentImpact(
                     diagram_id=diagram_id,
                     nfr_id=nfr_id,
-                    component_id=component_id,
+                    component_id=component.id,
                     impact=default_impact,
-                )
-
-    def delete_missing_components(
-        self, diagram_id: UUID, component_ids: Iterable[UUID]
-    ) -> None:
-        component_set = set(component_ids)
+                ),
+            )
+        return [diagram_id]
+
+    def remove_nfr_cells(
+        self, nfr_id: UUID, after_diagram_id: UUID | None, limit: int
+    ) -> Sequence[UUID]:
+        diagram_id = self._diagram_repository.diagram.id
+        if after_diagram_id is not None and diagram_id <= after_diagram_id:
+            return []
         self.entries = {
-            key: value
-            for key, value in self.entries.items()
-            if value.diagram_id != diagram_id
-            or (component_set and value.component_id in component_set)
+            key: value for key, value in self.entries.items() if key[1] != nfr_id
         }
+        return [diagram_id]
+
+class AsyncInMemoryMatrixRepository(AsyncDiagramMatrixRepository):
+    def __init__(self, sync: InMemoryMatrixRepository) -> None:
+        self._sync = sync
+
+    async def list_by_diagram(
+        self, diagram_id: UUID
+    ) -> Sequence[DiagramNFRComponentImpact]:
+        return self._sync.list_by_diagram(diagram_id)
+
+    async def upsert(
+        self,
+        diagram_id: UUID,
+        nfr_id: UUID,
+        component_id: UUID,
+        impact: ImpactValue,
+    ) -> DiagramNFRComponentImpact:
+        return self._sync.upsert(diagram_id, nfr_id, component_id, impact)
+
+    async def initialize_cells(
+        self, diagram_id: UUID, default_impact: ImpactValue = ImpactValue.NO_EFFECT
+    ) -> None:
+        self._sync.initialize_cells(diagram_id, default_impact)
 
 
 def test_ensure_defaults_creates_missing_entries() -> None:
     diagram_repo = InMemoryDiagramRepository()
     nfr_repo = InMemoryNFRRepository()
-    matrix_repo = InMemoryMatrixRepository()
-    service = DiagramMatrixService(matrix_repo, nfr_repo, diagram_repo)
+    matrix_repo = InMemoryMatrixRepository(nfr_repo, diagram_repo)
+    service = DiagramMatrixService(matrix_repo)
 
     service.ensure_defaults(diagram_repo.diagram.id)
 
@@ -196,8 +272,8 @@ def test_ensure_defaults_creates_missing_entries() -> None:
 def test_update_impact_changes_value() -> None:
     diagram_repo = InMemoryDiagramRepository()
     nfr_repo = InMemoryNFRRepository()
-    matrix_repo = InMemoryMatrixRepository()
-    service = DiagramMatrixService(matrix_repo, nfr_repo, diagram_repo)
+    matrix_repo = InMemoryMatrixRepository(nfr_repo, diagram_repo)
+    service = DiagramMatrixService(matrix_repo)
 
     service.ensure_defaults(diagram_repo.diagram.id)
     entry = service.update_impact(
@@ -210,11 +286,38 @@ def test_update_impact_changes_value() -> None:
     assert entry.impact == ImpactValue.POSITIVE
 
 
+def test_update_impacts_applies_last_change_per_cell_and_scores_once() -> None:
+    diagram_repo = InMemoryDiagramRepository()
+    nfr_repo = InMemoryNFRRepository()
+    matrix_repo = InMemoryMatrixRepository(nfr_repo, diagram_repo)
+    service = DiagramMatrixService(matrix_repo)
+    diagram_id = diagram_repo.diagram.id
+    service.ensure_defaults(diagram_id)
+    first_nfr = nfr_repo.items[0].id
+    first, second = (component.id for component in diagram_repo.components[:2])
+
+    entries, scores, overall = service.update_impacts(
+        diagram_id,
+        [
+            (first_nfr, first, ImpactValue.NEGATIVE),
+            (first_nfr, second, ImpactValue.NEGATIVE),
+            (first_nfr, first, ImpactValue.POSITIVE),
+        ],
+    )
+
+    assert [(entry.component_id, entry.impact) for entry in entries] == [
+        (first, ImpactValue.POSITIVE),
+        (second, ImpactValue.NEGATIVE),
+    ]
+    assert scores == {first_nfr: 0}
+    assert overall == service.score_matrix(diagram_id)[1]
+
+
 def test_list_matrix_with_scores_returns_averages_and_overall_score() -> None:
     diagram_repo = InMemoryDiagramRepository()
     nfr_repo = InMemoryNFRRepository()
-    matrix_repo = InMemoryMatrixRepository()
-    service = DiagramMatrixService(matrix_repo, nfr_repo, diagram_repo)
+    matrix_repo = InMemoryMatrixRepository(nfr_repo, diagram_repo)
+    service = DiagramMatrixService(matrix_repo)
 
     service.ensure_defaults(diagram_repo.diagram.id)
     service.update_impact(
@@ -235,3 +338,36 @@ def test_list_matrix_with_scores_returns_averages_and_overall_score() -> None:
     assert scores[nfr_repo.items[0].id] == 0
     assert scores[nfr_repo.items[1].id] == 0
     assert overall == 0
+
+
+def test_async_service_scores_match_sync_service() -> None:
+    diagram_repo = InMemoryDiagramRepository()
+    nfr_repo = InMemoryNFRRepository()
+    matrix_repo = InMemoryMatrixRepository(nfr_repo, diagram_repo)
+    sync_service = DiagramMatrixService(matrix_repo)
+    async_service = AsyncDiagramMatrixService(
+        AsyncInMemoryMatrixRepository(matrix_repo)
+    )
+    diagram_id = diagram_repo.diagram.id
+    sync_service.ensure_defaults(diagram_id)
+
+    async def scenario():
+        await async_service.update_impact(
+            diagram_id,
+            nfr_repo.items[0].id,
+            diagram_repo.components[0].id,
+            ImpactValue.POSITIVE,
+        )
+        return (
+            await async_service.list_matrix_with_scores(diagram_id),
+            await async_service.score_matrix(diagram_id),
+        )
+
+    (entries, scores, overall), matrix_scores = asyncio.run(scenario())
+
+    assert (entries, scores, overall) == sync_service.list_matrix_with_scores(
+        diagram_id
+    )
+    assert scores[nfr_repo.items[0].id] == 0.5
+    assert overall == 0.25
+    assert matrix_scores == (scores, overall) == sync_service.score_matrix(diagram_id)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.application.diagrams.parse_jobs import ParseJobService, execute_parse_job
+from app.application.diagrams.ports import DiagramStorage, UnitOfWork
+from app.application.diagrams.services import DiagramService
+from app.domain.diagrams.entities import DiagramStatus, ParseJobStatus
+from app.domain.diagrams.exceptions import DiagramNotFoundError
+from app.infrastructure.jobs.in_memory import InMemoryParseJobQueue
+from app.infrastructure.parsing.plantuml_parser import RegexPlantUMLParser
+from app.infrastructure.persistence.in_memory import InMemoryDiagramRepository
+
+
+class InMemoryStorage(DiagramStorage):
+    def __init__(self) -> None:
+        self.saved: dict[str, bytes] = {}
+
+    def save(self, content: bytes, filename: str) -> str:
+        path = f"diagram://{filename}"
+        self.saved[path] = content
+        return path
+
+    def read(self, path: str) -> bytes | None:
+        return self.saved.get(path)
+
+
+class RecordingUnitOfWork(UnitOfWork):
+    def __init__(self) -> None:
+        self.commits = 0
+
+    def __enter__(self) -> "RecordingUnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        pass
+
+
+class StubMatrixService:
+    def __init__(self) -> None:
+        self.initialized: list[UUID] = []
+
+    def ensure_defaults(self, diagram_id: UUID) -> None:
+        self.initialized.append(diagram_id)
+
+
+@pytest.fixture()
+def repository() -> InMemoryDiagramRepository:
+    return InMemoryDiagramRepository()
+
+
+@pytest.fixture()
+def diagram_service(repository: InMemoryDiagramRepository) -> DiagramService:
+    return DiagramService(
+        repository=repository,
+        storage=InMemoryStorage(),
+        parser=RegexPlantUMLParser(),
+    )
+
+
+@pytest.fixture()
+def queue() -> InMemoryParseJobQueue:
+    return InMemoryParseJobQueue()
+
+
+def test_submit_queues_job_for_owned_diagram(
+    diagram_service: DiagramService,
+    repository: InMemoryDiagramRepository,
+    queue: InMemoryParseJobQueue,
+) -> None:
+    user_id = uuid4()
+    diagram = diagram_service.upload_diagram(
+        user_id, "arch.puml", b"[A] --> [B]", display_name=None
+    )
+    job_service = ParseJobService(queue, repository)
+
+    job = job_service.submit(user_id, diagram.id)
+
+    assert job.status is ParseJobStatus.QUEUED
+    assert queue.dequeue(timeout=0) is job
+    assert job_service.get_job(user_id, diagram.id, job.id) is job
+    assert job_service.get_job(uuid4(), diagram.id, job.id) is None
+
+    with pytest.raises(DiagramNotFoundError):
+        job_service.submit(uuid4(), diagram.id)
+
+
+def test_execute_parse_job_records_success(
+    diagram_service: DiagramService,
+    repository: InMemoryDiagramRepository,
+    queue: InMemoryParseJobQueue,
+) -> None:
+    user_id = uuid4()
+    diagram = diagram_service.upload_diagram(
+        user_id,
+        "arch.puml",
+        b"[Frontend] as FE\n[Backend] as BE\nFE --> BE : HTTP",
+        display_name=None,
+    )
+    job = ParseJobService(queue, repository).submit(user_id, diagram.id)
+    matrix_service = StubMatrixService()
+    unit_of_work = RecordingUnitOfWork()
+
+    execute_parse_job(job, queue, diagram_service, matrix_service, unit_of_work)
+
+    assert job.status is ParseJobStatus.SUCCEEDED
+    assert (job.component_count, job.relationship_count) == (2, 1)
+    assert job.started_at is not None and job.finished_at is not None
+    assert matrix_service.initialized == [diagram.id]
+    assert unit_of_work.commits == 1
+    assert repository.get(diagram.id).status is DiagramStatus.PARSED
+
+
+def test_execute_parse_job_records_parse_failure(
+    diagram_service: DiagramService,
+    repository: InMemoryDiagramRepository,
+    queue: InMemoryParseJobQueue,
+) -> None:
+    user_id = uuid4()
+    diagram = diagram_service.upload_diagram(
+        user_id, "empty.puml", b"   \n", display_name=None
+    )
+    job = ParseJobService(queue, repository).submit(user_id, diagram.id)
+    unit_of_work = RecordingUnitOfWork()
+
+    execute_parse_job(
+        job, queue, diagram_service, StubMatrixService(), unit_of_work
+    )
+
+    assert job.status is ParseJobStatus.FAILED
+    assert job.error
+    assert job.is_finished
+    assert unit_of_work.commits == 1
+    assert repository.get(diagram.id).status is DiagramStatus.FAILED
@@ -7,7 +7,14 @@ import pytest
 from app.application.diagrams.ports import DiagramStorage
 from app.application.diagrams.services import DiagramService
 from app.domain.diagrams.entities import DiagramStatus, RelationshipDirection
-from app.domain.diagrams.exceptions import DiagramAlreadyExistsError, ParseError
+from app.domain.diagrams.exceptions import (
+    DiagramAlreadyExistsError,
+    DiagramNotFoundError,
+    ParseError,
+)
+from app.infrastructure.caching.diff_results import LRUDiffResultCache
+from app.infrastructure.caching.ownership import TTLOwnershipCache
+from app.infrastructure.caching.parse_results import LRUParseResultCache
 from app.infrastructure.parsing.plantuml_parser import RegexPlantUMLParser
 from app.infrastructure.persistence.in_memory import InMemoryDiagramRepository
 
@@ -165,3 +172,161 @@ def test_diff_diagrams_returns_component_and_relationship_changes(
         rel.source == "Backend" and rel.target == "Cache" and rel.new_label == "cache"
         for rel in added_relationships
     )
+
+
+def test_upload_and_parse_diagram_streams_chunks(
+    service: DiagramService, user_id: uuid4
+) -> None:
+    content = SAMPLE_PLANTUML.replace("HTTP", "HTTP → façade")
+    payload = content.encode()
+    # Tiny chunks split lines and multi-byte characters across boundaries
+    chunks = [payload[i : i + 7] for i in range(0, len(payload), 7)]
+
+    diagram, components, relationships = service.upload_and_parse_diagram(
+        user_id, "demo.puml", iter(chunks), display_name="Streamed"
+    )
+
+    assert diagram.content == content
+    assert diagram.name == "Streamed"
+    assert diagram.status == DiagramStatus.PARSED
+    assert len(components) == 3
+    assert len(relationships) == 2
+    assert relationships[0].label == "HTTP → façade"
+    assert all(component.diagram_id == diagram.id for component in components)
+
+    with pytest.raises(DiagramAlreadyExistsError):
+        service.upload_and_parse_diagram(user_id, "demo.puml", [payload])
+
+
+def test_parse_diagram_reuses_cached_result_for_identical_content(
+    user_id: uuid4,
+) -> None:
+    class CountingParser(RegexPlantUMLParser):
+        calls = 0
+
+        def parse(self, content: str):
+            CountingParser.calls += 1
+            return super().parse(content)
+
+    parse_cache = LRUParseResultCache()
+    first_user, second_user = user_id, uuid4()
+    for owner in (first_user, second_user):
+        service = DiagramService(
+            repository=InMemoryDiagramRepository(),
+            storage=InMemoryStorage(),
+            parser=CountingParser(),
+            parse_cache=parse_cache,
+        )
+        diagram = service.upload_diagram(owner, "demo.puml", SAMPLE_PLANTUML.encode())
+        components, relationships = service.parse_diagram(owner, diagram.id)
+
+        assert len(components) == 3
+        assert len(relationships) == 2
+        assert {r.source_component_id for r in relationships} <= {
+            c.id for c in components
+        }
+
+    assert CountingParser.calls == 1
+
+
+def test_diff_diagrams_reuses_cached_result_until_reparse(user_id: uuid4) -> None:
+    class CountingRepository(InMemoryDiagramRepository):
+        component_loads = 0
+
+        def get_components(self, diagram_id):
+            CountingRepository.component_loads += 1
+            return super().get_components(diagram_id)
+
+    service = DiagramService(
+        repository=CountingRepository(),
+        storage=InMemoryStorage(),
+        parser=RegexPlantUMLParser(),
+        diff_cache=LRUDiffResultCache(max_entries=8),
+    )
+    base = service.upload_diagram(user_id, "base.puml", SAMPLE_PLANTUML.encode())
+    target = service.upload_diagram(
+        user_id, "target.puml", SAMPLE_PLANTUML.replace("Backend", "API").encode()
+    )
+    service.parse_diagram(user_id, base.id)
+    service.parse_diagram(user_id, target.id)
+
+    first = service.diff_diagrams(user_id, base.id, target.id)
+    loads_after_first = CountingRepository.component_loads
+    second = service.diff_diagrams(user_id, base.id, target.id)
+
+    assert second == first
+    assert CountingRepository.component_loads == loads_after_first
+
+    # Re-parsing moves parsed_at, so the pair's key changes
+    service.parse_diagram(user_id, target.id)
+    loads_before_third = CountingRepository.component_loads
+    assert service.diff_diagrams(user_id, base.id, target.id) == first
+    assert CountingRepository.component_loads == loads_before_third + 2
+
+    with pytest.raises(DiagramNotFoundError):
+        service.diff_diagrams(uuid4(), base.id, target.id)
+
+
+def test_diagram_evolution_matches_pairwise_diffs(
+    service: DiagramService, user_id: uuid4
+) -> None:
+    contents = [
+        SAMPLE_PLANTUML,
+        SAMPLE_PLANTUML.replace("SQL", "SQL(read)"),
+        SAMPLE_PLANTUML.replace("SQL", "SQL(read)").replace("Backend", "API"),
+    ]
+    diagrams = [
+        service.upload_diagram(user_id, f"v{n}.puml", content.encode())
+        for n, content in enumerate(contents)
+    ]
+    for diagram in diagrams:
+        service.parse_diagram(user_id, diagram.id)
+    ids = [diagram.id for diagram in diagrams]
+
+    steps = service.diagram_evolution(user_id, ids)
+
+    assert [step.diagram_id for step in steps] == ids
+    assert (steps[0].components, steps[0].relationships) == ((), ())
+    assert [step.component_count for step in steps] == [3, 3, 3]
+    for base_id, step in zip(ids, steps[1:]):
+        components, relationships = service.diff_diagrams(
+            user_id, base_id, step.diagram_id
+        )
+        assert list(step.components) == components
+        assert list(step.relationships) == relationships
+    assert steps[1].components == ()
+    assert {diff.change_type for diff in steps[2].components} == {"added", "removed"}
+
+    with pytest.raises(DiagramNotFoundError):
+        service.diagram_evolution(user_id, [ids[0], uuid4()])
+    with pytest.raises(DiagramNotFoundError):
+        service.diagram_evolution(uuid4(), ids)
+
+
+def test_owned_by_answers_repeated_checks_from_the_ownership_cache(
+    user_id: uuid4,
+) -> None:
+    class CountingRepository(InMemoryDiagramRepository):
+        ownership_queries = 0
+
+        def owned_by(self, user_id, diagram_ids):
+            CountingRepository.ownership_queries += 1
+            return super().owned_by(user_id, diagram_ids)
+
+    service = DiagramService(
+        repository=CountingRepository(),
+        storage=InMemoryStorage(),
+        parser=RegexPlantUMLParser(),
+        ownership_cache=TTLOwnershipCache(ttl_seconds=60),
+    )
+    diagram = service.upload_diagram(user_id, "base.puml", SAMPLE_PLANTUML.encode())
+    unknown_id = uuid4()
+
+    assert service.owned_by(user_id, [diagram.id, unknown_id]) == {diagram.id}
+    assert service.owned_by(user_id, [diagram.id]) == {diagram.id}
+    assert CountingRepository.ownership_queries == 1
+
+    # Absence is not cached, and other users never see the diagram
+    assert service.owned_by(user_id, [unknown_id]) == set()
+    assert service.owned_by(uuid4(), [diagram.id]) == set()
+    assert CountingRepository.ownership_queries == 3
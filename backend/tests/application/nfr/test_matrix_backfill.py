@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+from typing import Sequence
+from uuid import UUID, uuid4
+
+from app.application.nfr.backfill import MatrixBackfillService, execute_backfill_job
+from app.application.nfr.services import NFRService
+from app.domain.diagrams.entities import DiagramNFRComponentImpact, ImpactValue
+from app.domain.diagrams.matrix_repository import DiagramMatrixRepository
+from app.domain.nfr.entities import (
+    MatrixBackfillAction,
+    MatrixBackfillJob,
+    MatrixBackfillStatus,
+    NonFunctionalRequirement,
+)
+from app.domain.nfr.repositories import NonFunctionalRequirementRepository
+from app.infrastructure.jobs.in_memory import InMemoryMatrixBackfillQueue
+
+
+class InMemoryNFRRepository(NonFunctionalRequirementRepository):
+    def __init__(self) -> None:
+        self._items: dict[UUID, NonFunctionalRequirement] = {}
+        self._deleted: set[UUID] = set()
+
+    def add(self, nfr: NonFunctionalRequirement) -> NonFunctionalRequirement:
+        self._items[nfr.id] = nfr
+        return nfr
+
+    def get(self, nfr_id: UUID) -> NonFunctionalRequirement | None:
+        return next((item for item in self.list() if item.id == nfr_id), None)
+
+    def get_by_name(self, name: str) -> NonFunctionalRequirement | None:
+        return next((item for item in self.list() if item.name == name), None)
+
+    def list(self):
+        return [
+            item for item in self._items.values() if item.id not in self._deleted
+        ]
+
+    def delete(self, nfr_id: UUID) -> None:
+        self._items.pop(nfr_id, None)
+        self._deleted.discard(nfr_id)
+
+    def mark_deleted(self, nfr_id: UUID) -> None:
+        self._deleted.add(nfr_id)
+
+    def list_deleted_ids(self) -> list[UUID]:
+        return sorted(self._deleted)
+
+
+class ProgressRecordingQueue(InMemoryMatrixBackfillQueue):
+    def __init__(self) -> None:
+        super().__init__()
+        self.progress: list[tuple[MatrixBackfillStatus, int]] = []
+
+    def save(self, job: MatrixBackfillJob) -> None:
+        self.progress.append((job.status, job.diagrams_done))
+        super().save(job)
+
+
+class BatchRecordingMatrixRepository(DiagramMatrixRepository):
+    """Diagrams with one component each; records every backfill batch."""
+
+    def __init__(self, diagram_count: int) -> None:
+        self.components = {uuid4(): uuid4() for _ in range(diagram_count)}
+        self.cells: set[tuple[UUID, UUID]] = set()
+        self.batches: list[Sequence[UUID]] = []
+
+    def list_by_diagram(self, diagram_id: UUID) -> Sequence[DiagramNFRComponentImpact]:
+        return [
+            DiagramNFRComponentImpact(
+                diagram_id=diagram_id,
+                nfr_id=nfr_id,
+                component_id=self.components[diagram_id],
+            )
+            for cell_diagram_id, nfr_id in self.cells
+            if cell_diagram_id == diagram_id
+        ]
+
+    def upsert(self, diagram_id, nfr_id, component_id, impact):
+        raise NotImplementedError
+
+    def initialize_cells(self, diagram_id, default_impact=ImpactValue.NO_EFFECT):
+        raise NotImplementedError
+
+    def count_diagrams(self) -> int:
+        return len(self.components)
+
+    def _batch(self, after_diagram_id: UUID | None, limit: int) -> list[UUID]:
+        batch = sorted(
+            diagram_id
+            for diagram_id in self.components
+            if after_diagram_id is None or diagram_id > after_diagram_id
+        )[:limit]
+        self.batches.append(batch)
+        return batch
+
+    def add_nfr_cells(
+        self,
+        nfr_id: UUID,
+        after_diagram_id: UUID | None,
+        limit: int,
+        default_impact: ImpactValue = ImpactValue.NO_EFFECT,
+    ) -> Sequence[UUID]:
+        batch = self._batch(after_diagram_id, limit)
+        self.cells.update((diagram_id, nfr_id) for diagram_id in batch)
+        return batch
+
+    def remove_nfr_cells(
+        self, nfr_id: UUID, after_diagram_id: UUID | None, limit: int
+    ) -> Sequence[UUID]:
+        batch = self._batch(after_diagram_id, limit)
+        self.cells.difference_update((diagram_id, nfr_id) for diagram_id in batch)
+        return batch
+
+
+def test_backfill_walks_diagrams_in_throttled_batches_and_reports_progress() -> None:
+    queue = ProgressRecordingQueue()
+    nfr_repository = InMemoryNFRRepository()
+    matrix_repository = BatchRecordingMatrixRepository(diagram_count=5)
+    nfr_service = NFRService(nfr_repository, MatrixBackfillService(queue))
+    pauses: list[float] = []
+
+    nfr = nfr_service.create_requirement("Availability")
+    job = queue.dequeue(timeout=0)
+    assert job is not None
+    assert (job.nfr_id, job.action) == (nfr.id, MatrixBackfillAction.ADD)
+    execute_backfill_job(
+        job,
+        queue,
+        matrix_repository,
+        nfr_repository,
+        batch_size=2,
+        pause_seconds=0.1,
+        sleep=pauses.append,
+    )
+
+    assert [len(batch) for batch in matrix_repository.batches] == [2, 2, 1]
+    assert pauses == [0.1, 0.1]
+    assert matrix_repository.cells == {
+        (diagram_id, nfr.id) for diagram_id in matrix_repository.components
+    }
+    assert queue.progress == [
+        (MatrixBackfillStatus.RUNNING, 0),
+        (MatrixBackfillStatus.RUNNING, 2),
+        (MatrixBackfillStatus.RUNNING, 4),
+        (MatrixBackfillStatus.RUNNING, 5),
+        (MatrixBackfillStatus.SUCCEEDED, 5),
+    ]
+    assert job.diagrams_total == 5
+    assert queue.latest_for_nfr(nfr.id) is job
+
+
+def test_delete_hides_nfr_until_backfill_removed_its_cells() -> None:
+    queue = InMemoryMatrixBackfillQueue()
+    nfr_repository = InMemoryNFRRepository()
+    matrix_repository = BatchRecordingMatrixRepository(diagram_count=3)
+    nfr_service = NFRService(nfr_repository, MatrixBackfillService(queue))
+    nfr = nfr_service.create_requirement("Security")
+    add_job = queue.dequeue(timeout=0)
+    execute_backfill_job(add_job, queue, matrix_repository, nfr_repository, 10)
+
+    remove_job = nfr_service.delete_requirement(nfr.id)
+
+    assert remove_job is not None
+    assert remove_job.action is MatrixBackfillAction.REMOVE
+    assert nfr_service.list_requirements() == []
+    assert nfr_repository.list_deleted_ids() == [nfr.id]
+    assert queue.dequeue(timeout=0) is remove_job
+
+    execute_backfill_job(remove_job, queue, matrix_repository, nfr_repository, 10)
+
+    assert remove_job.status is MatrixBackfillStatus.SUCCEEDED
+    assert matrix_repository.cells == set()
+    assert nfr_repository.list_deleted_ids() == []
+
+
+def test_resume_requeues_removals_lost_with_their_jobs() -> None:
+    nfr_repository = InMemoryNFRRepository()
+    matrix_repository = BatchRecordingMatrixRepository(diagram_count=2)
+    nfr = nfr_repository.add(NonFunctionalRequirement(name="Latency"))
+    matrix_repository.cells.update(
+        (diagram_id, nfr.id) for diagram_id in matrix_repository.components
+    )
+    # Marked deleted by a process that stopped before running the removal
+    nfr_repository.mark_deleted(nfr.id)
+
+    queue = InMemoryMatrixBackfillQueue()
+    resumed = MatrixBackfillService(queue).resume_removals(nfr_repository)
+
+    assert [(job.nfr_id, job.action) for job in resumed] == [
+        (nfr.id, MatrixBackfillAction.REMOVE)
+    ]
+    execute_backfill_job(
+        queue.dequeue(timeout=0), queue, matrix_repository, nfr_repository, 10
+    )
+    assert matrix_repository.cells == set()
+    assert nfr_repository.list_deleted_ids() == []
+
+
+def test_failed_batch_marks_job_failed_and_keeps_progress() -> None:
+    class FailingSecondBatch(BatchRecordingMatrixRepository):
+        def _batch(self, after_diagram_id: UUID | None, limit: int) -> list[UUID]:
+            if self.batches:
+                raise RuntimeError("lock timeout")
+            return super()._batch(after_diagram_id, limit)
+
+    queue = InMemoryMatrixBackfillQueue()
+    nfr_repository = InMemoryNFRRepository()
+    nfr = nfr_repository.add(NonFunctionalRequirement(name="Cost"))
+    job = MatrixBackfillJob(nfr_id=nfr.id, action=MatrixBackfillAction.ADD)
+
+    execute_backfill_job(
+        job, queue, FailingSecondBatch(diagram_count=3), nfr_repository, 2
+    )
+
+    assert job.status is MatrixBackfillStatus.FAILED
+    assert job.diagrams_done == 2
+    assert job.error == "Internal error while updating diagram matrices"
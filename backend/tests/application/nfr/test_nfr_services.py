@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 from uuid import UUID, uuid4
 
 import pytest
 
-from app.application.nfr.services import NFRService
+from app.application.nfr.services import AsyncNFRService, NFRService
 from app.domain.nfr.entities import NonFunctionalRequirement
 from app.domain.nfr.exceptions import NFRAlreadyExistsError, NFRNotFoundError
-from app.domain.nfr.repositories import NonFunctionalRequirementRepository
+from app.domain.nfr.repositories import (
+    AsyncNonFunctionalRequirementRepository,
+    NonFunctionalRequirementRepository,
+)
 
 
 class InMemoryNFRRepository(NonFunctionalRequirementRepository):
@@ -30,6 +34,12 @@ class InMemoryNFRRepository(NonFunctionalRequirementRepository):
     def delete(self, nfr_id: UUID) -> None:
         self._items.pop(nfr_id, None)
 
+    def mark_deleted(self, nfr_id: UUID) -> None:
+        self.delete(nfr_id)
+
+    def list_deleted_ids(self) -> list[UUID]:
+        return []
+
 
 @pytest.fixture()
 def service() -> NFRService:
@@ -62,3 +72,43 @@ def test_delete_requirement_removes_entity(service: NFRService) -> None:
 def test_delete_missing_requirement_raises_error(service: NFRService) -> None:
     with pytest.raises(NFRNotFoundError):
         service.delete_requirement(uuid4())
+
+
+class AsyncInMemoryNFRRepository(AsyncNonFunctionalRequirementRepository):
+    def __init__(self) -> None:
+        self._sync = InMemoryNFRRepository()
+
+    async def add(self, nfr: NonFunctionalRequirement) -> NonFunctionalRequirement:
+        return self._sync.add(nfr)
+
+    async def get(self, nfr_id: UUID) -> NonFunctionalRequirement | None:
+        return self._sync.get(nfr_id)
+
+    async def get_by_name(self, name: str) -> NonFunctionalRequirement | None:
+        return self._sync.get_by_name(name)
+
+    async def list(self):
+        return self._sync.list()
+
+    async def delete(self, nfr_id: UUID) -> None:
+        self._sync.delete(nfr_id)
+
+    async def mark_deleted(self, nfr_id: UUID) -> None:
+        self._sync.mark_deleted(nfr_id)
+
+
+def test_async_service_mirrors_sync_use_cases() -> None:
+    service = AsyncNFRService(repository=AsyncInMemoryNFRRepository())
+
+    async def scenario() -> None:
+        nfr = await service.create_requirement("Security")
+        with pytest.raises(NFRAlreadyExistsError):
+            await service.create_requirement("Security")
+        assert [item.id for item in await service.list_requirements()] == [nfr.id]
+
+        await service.delete_requirement(nfr.id)
+        assert await service.list_requirements() == []
+        with pytest.raises(NFRNotFoundError):
+            await service.delete_requirement(nfr.id)
+
+    asyncio.run(scenario())
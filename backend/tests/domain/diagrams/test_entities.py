@@ -52,6 +52,33 @@ def test_diagram_mark_failed_sets_failed_status_without_timestamp() -> None:
     assert diagram.parsed_at is None
 
 
+def test_diagram_content_loads_once_on_first_use() -> None:
+    # Arrange
+    loads: list[int] = []
+
+    def load() -> str:
+        loads.append(1)
+        return "@startuml\n@enduml"
+
+    diagram = Diagram(
+        user_id=uuid4(),
+        name="Payments Flow",
+        source_url="diagram://payments",
+        content=None,
+        checksum="abc123",
+        content_loader=load,
+    )
+
+    # Act
+    first = diagram.load_content()
+    second = diagram.load_content()
+
+    # Assert
+    assert first == second == "@startuml\n@enduml"
+    assert diagram.content == first
+    assert len(loads) == 1
+
+
 def test_component_and_relationship_metadata_are_not_shared() -> None:
     # Arrange
     user_id = uuid4()
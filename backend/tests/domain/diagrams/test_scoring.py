@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import random
+from collections import defaultdict
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.domain.diagrams.scoring import (
+    IMPACT_CODES,
+    IMPACT_SCORES,
+    ImpactMatrix,
+    NFRScoreTotals,
+    impact_delta,
+    pack_impact_codes,
+    scores_from_totals,
+    unpack_impact_codes,
+)
+from app.domain.diagrams.entities import DiagramNFRComponentImpact, ImpactValue
+
+
+def _reference_scores(
+    entries: list[DiagramNFRComponentImpact],
+) -> tuple[dict[UUID, float], float | None]:
+    """Per-entry aggregation the vectorized engine must reproduce."""
+    aggregates: dict[UUID, list[int]] = defaultdict(lambda: [0, 0])
+    for entry in entries:
+        aggregate = aggregates[entry.nfr_id]
+        aggregate[0] += IMPACT_SCORES[entry.impact]
+        aggregate[1] += 1
+    averages = {nfr_id: total / count for nfr_id, (total, count) in aggregates.items()}
+    overall = sum(averages.values()) / len(averages) if averages else None
+    return averages, overall
+
+
+def _random_entries(
+    nfr_count: int, component_count: int, fill: float, seed: int
+) -> list[DiagramNFRComponentImpact]:
+    rng = random.Random(seed)
+    diagram_id = uuid4()
+    nfr_ids = [uuid4() for _ in range(nfr_count)]
+    component_ids = [uuid4() for _ in range(component_count)]
+    entries = [
+        DiagramNFRComponentImpact(
+            diagram_id=diagram_id,
+            nfr_id=nfr_id,
+            component_id=component_id,
+            impact=rng.choice(list(ImpactValue)),
+        )
+        for nfr_id in nfr_ids
+        for component_id in component_ids
+        if rng.random() < fill
+    ]
+    rng.shuffle(entries)
+    return entries
+
+
+@pytest.mark.parametrize(
+    ("nfr_count", "component_count", "fill"),
+    [(0, 0, 1.0), (1, 1, 1.0), (3, 7, 0.5), (30, 20, 1.0), (57, 41, 0.8)],
+)
+def test_vectorized_scores_match_reference(
+    nfr_count: int, component_count: int, fill: float
+) -> None:
+    entries = _random_entries(nfr_count, component_count, fill, seed=nfr_count)
+
+    averages, overall = ImpactMatrix.from_entries(entries).score()
+    expected_averages, expected_overall = _reference_scores(entries)
+
+    assert averages == expected_averages
+    assert list(averages) == list(expected_averages)
+    assert overall == expected_overall
+
+
+def test_matrix_marks_missing_cells_as_absent() -> None:
+    diagram_id, nfr_id = uuid4(), uuid4()
+    first, second = uuid4(), uuid4()
+    other_nfr = uuid4()
+    matrix = ImpactMatrix.from_entries(
+        [
+            DiagramNFRComponentImpact(
+                diagram_id=diagram_id,
+                nfr_id=nfr_id,
+                component_id=first,
+                impact=ImpactValue.NEGATIVE,
+            ),
+            DiagramNFRComponentImpact(
+                diagram_id=diagram_id,
+                nfr_id=other_nfr,
+                component_id=second,
+                impact=ImpactValue.POSITIVE,
+            ),
+        ]
+    )
+
+    assert matrix.nfr_ids == (nfr_id, other_nfr)
+    assert matrix.component_ids == (first, second)
+    assert matrix.scores.tolist() == [[-1, 0], [0, 1]]
+    assert matrix.present.tolist() == [[True, False], [False, True]]
+    assert matrix.score() == ({nfr_id: -1.0, other_nfr: 1.0}, 0.0)
+
+
+def test_totals_updated_by_impact_deltas_match_full_rescore() -> None:
+    rng = random.Random(7)
+    entries = _random_entries(5, 6, 1.0, seed=7)
+    matrix = ImpactMatrix.from_entries(entries)
+    totals = {total.nfr_id: total for total in matrix.score_totals()}
+
+    for _ in range(200):
+        position = rng.randrange(len(entries))
+        entry = entries[position]
+        impact = rng.choice(list(ImpactValue))
+        score_delta, count_delta = impact_delta(entry.impact, impact)
+        current = totals[entry.nfr_id]
+        totals[entry.nfr_id] = NFRScoreTotals(
+            nfr_id=current.nfr_id,
+            score_sum=current.score_sum + score_delta,
+            entry_count=current.entry_count + count_delta,
+        )
+        entries[position] = DiagramNFRComponentImpact(
+            diagram_id=entry.diagram_id,
+            nfr_id=entry.nfr_id,
+            component_id=entry.component_id,
+            impact=impact,
+        )
+
+    assert scores_from_totals(totals.values()) == _reference_scores(entries)
+
+
+def test_impact_delta_counts_new_cells() -> None:
+    assert impact_delta(None, ImpactValue.NEGATIVE) == (-1, 1)
+    assert impact_delta(ImpactValue.NEGATIVE, ImpactValue.POSITIVE) == (2, 0)
+    assert scores_from_totals([]) == ({}, None)
+
+
+def test_impact_codes_are_row_major_and_survive_packing() -> None:
+    nfr_ids = [uuid4() for _ in range(3)]
+    component_ids = [uuid4() for _ in range(3)]
+    # The last pair has no cell, and 9 codes leave the last byte padded
+    cells = [
+        (nfr_id, component_id, impact)
+        for (nfr_id, component_id), impact in zip(
+            [(n, c) for n in nfr_ids for c in component_ids][:-1],
+            list(ImpactValue) * 3,
+        )
+    ]
+    matrix = ImpactMatrix.from_cells(*zip(*cells))
+
+    codes = matrix.impact_codes()
+
+    expected = [IMPACT_CODES[impact] for *_, impact in cells] + [0]
+    assert codes.ravel().tolist() == expected
+    packed = pack_impact_codes(codes)
+    assert len(packed) == 3
+    assert unpack_impact_codes(packed, codes.shape).tolist() == codes.tolist()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from app.application.diagrams.ports import ComponentDiff
+from app.domain.diagrams.entities import ComponentType
+from app.infrastructure.caching.diff_results import LRUDiffResultCache
+
+
+def _key(name: str):
+    return (f"{name}-base", None, f"{name}-target", None)
+
+
+def _diff(name: str):
+    return ((ComponentDiff(name, "added", new_type=ComponentType.QUEUE),), ())
+
+
+def test_lru_diff_cache_evicts_least_recently_used_pair() -> None:
+    cache = LRUDiffResultCache(max_entries=2)
+    cache.put(_key("a"), _diff("a"))
+    cache.put(_key("b"), _diff("b"))
+
+    assert cache.get(_key("a")) == _diff("a")
+    cache.put(_key("c"), _diff("c"))
+
+    assert len(cache) == 2
+    assert cache.get(_key("b")) is None
+    assert cache.get(_key("a")) == _diff("a")
+    assert cache.get(_key("c")) == _diff("c")
+
+
+def test_lru_diff_cache_with_zero_entries_stores_nothing() -> None:
+    cache = LRUDiffResultCache(max_entries=0)
+    cache.put(_key("a"), _diff("a"))
+
+    assert cache.get(_key("a")) is None
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from uuid import uuid4
+
+from app.infrastructure.caching.ownership import TTLOwnershipCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ownership_is_remembered_per_user_until_the_ttl_passes() -> None:
+    clock = FakeClock()
+    cache = TTLOwnershipCache(ttl_seconds=30, clock=clock)
+    user_id, other_user_id = uuid4(), uuid4()
+    owned_id, unknown_id = uuid4(), uuid4()
+    cache.remember(user_id, [owned_id])
+
+    assert cache.owned(user_id, [owned_id, unknown_id]) == {owned_id}
+    assert cache.owned(other_user_id, [owned_id]) == set()
+
+    clock.now = 30
+    assert cache.owned(user_id, [owned_id]) == set()
+    assert len(cache) == 0
+
+
+def test_ownership_cache_keeps_the_most_recent_pairs() -> None:
+    cache = TTLOwnershipCache(max_entries=2, clock=FakeClock())
+    user_id = uuid4()
+    first, second, third = uuid4(), uuid4(), uuid4()
+    cache.remember(user_id, [first, second])
+    cache.remember(user_id, [third])
+
+    assert cache.owned(user_id, [first, second, third]) == {second, third}
+
+
+def test_ownership_cache_with_zero_ttl_stores_nothing() -> None:
+    cache = TTLOwnershipCache(ttl_seconds=0)
+    user_id, diagram_id = uuid4(), uuid4()
+    cache.remember(user_id, [diagram_id])
+
+    assert cache.owned(user_id, [diagram_id]) == set()
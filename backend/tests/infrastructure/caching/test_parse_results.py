@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.application.diagrams.ports import CachedParseResult
+from app.domain.diagrams.entities import RelationshipDirection
+from app.infrastructure.caching.parse_results import (
+    FileParseResultCache,
+    LRUParseResultCache,
+)
+from app.infrastructure.parsing.tokenizing_parser import TokenizingPlantUMLParser
+
+SAMPLE_PLANTUML = """
+@startuml
+[Frontend] as FE
+[Backend] as BE
+FE <--> BE : HTTP
+@enduml
+""".strip()
+
+
+def _result(name: str = "Frontend") -> CachedParseResult:
+    components, relationships = TokenizingPlantUMLParser().parse(
+        SAMPLE_PLANTUML.replace("Frontend", name)
+    )
+    return CachedParseResult.from_entities(components, relationships)
+
+
+def test_cached_result_round_trips_to_fresh_entities() -> None:
+    components, relationships = _result().to_entities()
+
+    assert [component.name for component in components] == ["Frontend", "Backend"]
+    assert relationships[0].source_component_id == components[0].id
+    assert relationships[0].target_component_id == components[1].id
+    assert relationships[0].label == "HTTP"
+    assert relationships[0].direction == RelationshipDirection.BIDIRECTIONAL
+
+
+def test_lru_cache_evicts_least_recently_used_entry() -> None:
+    cache = LRUParseResultCache(max_entries=2)
+    cache.put(("a", "v1"), _result("A"))
+    cache.put(("b", "v1"), _result("B"))
+    assert cache.get(("a", "v1")) is not None
+
+    cache.put(("c", "v1"), _result("C"))
+
+    assert len(cache) == 2
+    assert cache.get(("b", "v1")) is None
+    assert cache.get(("a", "v1")) is not None
+    assert cache.get(("a", "v2")) is None
+
+
+def test_lru_cache_respects_size_limit() -> None:
+    entry_size = _result("A").size_bytes()
+    cache = LRUParseResultCache(max_entries=100, max_bytes=entry_size * 2)
+    for name in ("A", "B", "C"):
+        cache.put((name, "v1"), _result(name))
+
+    assert len(cache) == 2
+    assert cache.size_bytes <= entry_size * 2
+
+
+def test_persistent_tier_survives_memory_eviction(tmp_path: Path) -> None:
+    backing = FileParseResultCache(tmp_path)
+    cache = LRUParseResultCache(max_entries=1, backing=backing)
+    cache.put(("a", "tokenizing-1"), _result("A"))
+    cache.put(("b", "tokenizing-1"), _result("B"))
+
+    restored = LRUParseResultCache(backing=FileParseResultCache(tmp_path)).get(
+        ("a", "tokenizing-1")
+    )
+
+    assert restored == _result("A")
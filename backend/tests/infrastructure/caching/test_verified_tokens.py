@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from app.infrastructure.caching.verified_tokens import LRUVerifiedTokenCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_claims_are_kept_until_the_token_expires() -> None:
+    clock = FakeClock()
+    cache = LRUVerifiedTokenCache(clock=clock)
+    cache.put("token", {"sub": "user"}, expires_at=60)
+
+    assert cache.get("token") == {"sub": "user"}
+    assert cache.get("other-token") is None
+
+    clock.now = 60
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_token_cache_evicts_the_least_recently_used() -> None:
+    cache = LRUVerifiedTokenCache(max_entries=2, clock=FakeClock())
+    cache.put("first", {"sub": "1"}, expires_at=60)
+    cache.put("second", {"sub": "2"}, expires_at=60)
+    cache.get("first")
+    cache.put("third", {"sub": "3"}, expires_at=60)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == {"sub": "1"}
+    assert cache.get("third") == {"sub": "3"}
+
+
+def test_token_cache_skips_expired_tokens_and_zero_size() -> None:
+    clock = FakeClock()
+    clock.now = 100
+    cache = LRUVerifiedTokenCache(clock=clock)
+    cache.put("expired", {"sub": "user"}, expires_at=100)
+    disabled = LRUVerifiedTokenCache(max_entries=0, clock=clock)
+    disabled.put("token", {"sub": "user"}, expires_at=200)
+
+    assert len(cache) == 0
+    assert disabled.get("token") is None
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import threading
+from uuid import uuid4
+
+from app.domain.diagrams.entities import ParseJob
+from app.infrastructure.jobs.in_memory import InMemoryParseJobQueue
+from app.infrastructure.jobs.worker import JobWorkerPool
+
+
+def test_worker_pool_drains_queue_and_stops() -> None:
+    queue = InMemoryParseJobQueue()
+    handled: list[ParseJob] = []
+    done = threading.Event()
+
+    def handler(job: ParseJob) -> None:
+        handled.append(job)
+        if len(handled) == 3:
+            done.set()
+
+    pool = JobWorkerPool(queue, handler, workers=2, poll_interval=0.05)
+    pool.start()
+    try:
+        for _ in range(3):
+            queue.enqueue(ParseJob(diagram_id=uuid4(), user_id=uuid4()))
+        assert done.wait(timeout=5)
+    finally:
+        pool.stop(timeout=5)
+
+    assert len(handled) == 3
+    assert not pool.running
+
+
+def test_queue_forgets_oldest_finished_jobs_beyond_limit() -> None:
+    queue = InMemoryParseJobQueue(max_jobs=2)
+    finished = ParseJob(diagram_id=uuid4(), user_id=uuid4())
+    finished.mark_failed("boom")
+    queue.enqueue(finished)
+    pending = ParseJob(diagram_id=uuid4(), user_id=uuid4())
+    queue.enqueue(pending)
+    latest = ParseJob(diagram_id=uuid4(), user_id=uuid4())
+    queue.enqueue(latest)
+
+    assert queue.get(finished.id) is None
+    assert queue.get(pending.id) is pending
+    assert queue.get(latest.id) is latest
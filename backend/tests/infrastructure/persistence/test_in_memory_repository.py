@@ -127,3 +127,48 @@ def test_update_and_delete_components_and_relationships() -> None:
 
     repository.delete_relationships(diagram.id)
     assert repository.get_relationships(diagram.id) == []
+
+
+def test_sync_components_applies_changes_and_replaces_relationships() -> None:
+    repository = InMemoryDiagramRepository()
+    diagram = Diagram(
+        user_id=uuid4(),
+        name="Sync",
+        source_url="diagram://sync",
+        content="[]",
+        checksum="sync-123",
+    )
+    repository.add(diagram)
+    api = Component(diagram_id=diagram.id, name="API", type=ComponentType.COMPONENT)
+    db = Component(diagram_id=diagram.id, name="DB", type=ComponentType.DATABASE)
+    repository.add_components([api, db])
+    repository.add_relationships(
+        [
+            Relationship(
+                diagram_id=diagram.id,
+                source_component_id=api.id,
+                target_component_id=db.id,
+            )
+        ]
+    )
+
+    renamed_api = Component(
+        diagram_id=diagram.id, name="API v2", type=ComponentType.COMPONENT, id=api.id
+    )
+    cache = Component(diagram_id=diagram.id, name="Cache", type=ComponentType.QUEUE)
+    relationship = Relationship(
+        diagram_id=diagram.id,
+        source_component_id=api.id,
+        target_component_id=cache.id,
+    )
+
+    repository.sync_components(
+        diagram.id,
+        added=[cache],
+        updated=[renamed_api],
+        removed_ids=[db.id],
+        relationships=[relationship],
+    )
+
+    assert repository.get_components(diagram.id) == [renamed_api, cache]
+    assert repository.get_relationships(diagram.id) == [relationship]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import random
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.domain.diagrams.entities import DiagramNFRComponentImpact, ImpactValue
+from app.domain.diagrams.scoring import ImpactMatrix
+from app.infrastructure.persistence.packed_matrix import PackedMatrix
+
+
+@pytest.mark.parametrize("nfr_count, component_count", [(0, 0), (3, 5), (7, 9)])
+def test_storage_round_trip_preserves_cells_and_scores(
+    nfr_count: int, component_count: int
+) -> None:
+    rng = random.Random(nfr_count)
+    diagram_id = uuid4()
+    nfr_ids = [uuid4() for _ in range(nfr_count)]
+    component_ids = [uuid4() for _ in range(component_count)]
+    # Leave some pairs without a cell
+    changes = {
+        (nfr_id, component_id): rng.choice(list(ImpactValue))
+        for nfr_id in nfr_ids
+        for component_id in component_ids
+        if rng.random() < 0.8
+    }
+    matrix = PackedMatrix.empty().covering(
+        nfr_ids, component_ids, ImpactValue.NO_EFFECT
+    )
+    matrix = PackedMatrix.from_storage(
+        nfr_ids, component_ids, matrix.with_cells(changes).to_storage()
+    )
+
+    assert len(matrix.to_storage()) == -(-nfr_count * component_count // 4)
+    entries = matrix.entries(diagram_id)
+    assert {
+        (entry.nfr_id, entry.component_id): entry.impact for entry in entries
+    } == {
+        (nfr_id, component_id): changes.get(
+            (nfr_id, component_id), ImpactValue.NO_EFFECT
+        )
+        for nfr_id in nfr_ids
+        for component_id in component_ids
+    }
+    assert matrix.to_impact_matrix().score() == ImpactMatrix.from_entries(
+        entries
+    ).score()
+    # Cell ids are derived from the pair, so repeated reads agree
+    assert [entry.id for entry in entries] == [
+        entry.id for entry in matrix.entries(diagram_id)
+    ]
+
+
+def test_changes_copy_instead_of_mutating_the_loaded_matrix() -> None:
+    nfr_id, component_id, added_nfr_id = uuid4(), uuid4(), uuid4()
+    loaded = PackedMatrix.empty().with_cells(
+        {(nfr_id, component_id): ImpactValue.NEGATIVE}
+    )
+
+    changed = loaded.with_cells(
+        {
+            (nfr_id, component_id): ImpactValue.POSITIVE,
+            (added_nfr_id, component_id): ImpactValue.NO_EFFECT,
+        }
+    )
+
+    assert loaded.impact(nfr_id, component_id) is ImpactValue.NEGATIVE
+    assert changed.impact(nfr_id, component_id) is ImpactValue.POSITIVE
+    assert changed.nfr_ids == (nfr_id, added_nfr_id)
+    assert not loaded.codes.flags.writeable
+    with pytest.raises(ValueError):
+        loaded.codes[0, 0] = 0
+
+
+def test_covering_keeps_kept_cells_and_defaults_the_rest() -> None:
+    nfr_a, nfr_b = uuid4(), uuid4()
+    kept, dropped, added = uuid4(), uuid4(), uuid4()
+    matrix = PackedMatrix.empty().with_cells(
+        {
+            (nfr_a, kept): ImpactValue.POSITIVE,
+            (nfr_a, dropped): ImpactValue.NEGATIVE,
+        }
+    )
+
+    covered = matrix.covering([nfr_a, nfr_b], [added, kept], ImpactValue.NO_EFFECT)
+
+    assert covered.component_ids == (added, kept)
+    assert np.count_nonzero(covered.codes) == 4
+    assert covered.impact(nfr_a, kept) is ImpactValue.POSITIVE
+    assert covered.impact(nfr_b, kept) is ImpactValue.NO_EFFECT
+    assert covered.impact(nfr_a, dropped) is None
+
+    with_nfr = covered.with_nfr(uuid4(), ImpactValue.NEGATIVE)
+    assert with_nfr.to_impact_matrix().score_totals()[-1].score_sum == -2
+    assert with_nfr.without_nfr(with_nfr.nfr_ids[-1]).nfr_ids == covered.nfr_ids
+
+
+def test_entries_match_row_storage_entities() -> None:
+    diagram_id, nfr_id, component_id = uuid4(), uuid4(), uuid4()
+    matrix = PackedMatrix.empty().with_cells(
+        {(nfr_id, component_id): ImpactValue.POSITIVE}
+    )
+
+    [entry] = matrix.entries(diagram_id)
+
+    assert isinstance(entry, DiagramNFRComponentImpact)
+    assert (entry.diagram_id, entry.nfr_id, entry.component_id, entry.impact) == (
+        diagram_id,
+        nfr_id,
+        component_id,
+        ImpactValue.POSITIVE,
+    )
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.infrastructure.persistence import pool_metrics
+from app.infrastructure.persistence.pool_metrics import (
+    InstrumentedQueuePool,
+    pool_usage,
+)
+
+
+class RecordingCounter:
+    def __init__(self) -> None:
+        self.calls: list[dict[str, str]] = []
+
+    def add(self, amount: int, attributes: dict[str, str]) -> None:
+        self.calls.append(attributes)
+
+
+def test_pool_usage_and_exhaustion_are_reported(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    checkouts = RecordingCounter()
+    timeouts = RecordingCounter()
+    monkeypatch.setattr(pool_metrics, "_checkouts", checkouts)
+    monkeypatch.setattr(pool_metrics, "_checkout_timeouts", timeouts)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="test",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+
+    held = engine.connect()
+    assert pool_usage(engine.pool) == {"in_use": 1, "idle": 0, "overflow": 0}
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    assert timeouts.calls == [{"pool": "test"}]
+
+    held.close()
+    assert pool_usage(engine.pool) == {"in_use": 0, "idle": 1, "overflow": 0}
+    assert checkouts.calls == [{"pool": "test"}]
+    engine.dispose()
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import create_engine, delete, event, make_url
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.application.diagrams.services import AsyncDiagramService, DiagramService
+from app.domain.diagrams.exceptions import DiagramContentNotLoadedError
+from app.infrastructure.caching.diff_results import LRUDiffResultCache
+from app.infrastructure.parsing.plantuml_parser import RegexPlantUMLParser
+from app.infrastructure.persistence.async_postgresql import (
+    AsyncPostgreSQLDiagramRepository,
+)
+from app.infrastructure.persistence.models import Base, DiagramModel, UserModel
+from app.infrastructure.persistence.postgresql import PostgreSQLDiagramRepository
+from app.infrastructure.storage.local import LocalDiagramStorage
+
+# Guards the number of round trips per request path; see
+# test_postgresql_matrix_repository.py for how to point these at a server.
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL, reason="TEST_DATABASE_URL is not set"
+)
+
+VERSIONS = [
+    "[Frontend] as FE\n[Backend] as BE\nFE --> BE : HTTP",
+    "[Frontend] as FE\n[Backend] as BE\ndatabase DB\nFE --> BE : HTTP\nBE --> DB",
+    "[Frontend] as FE\n[API] as BE\ndatabase DB\nFE --> BE : gRPC\nBE --> DB",
+]
+
+
+@pytest.fixture()
+def engine() -> Iterator[Engine]:
+    engine = create_engine(DATABASE_URL)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def user_id(engine: Engine) -> Iterator[UUID]:
+    user_id = uuid4()
+    with Session(engine) as session:
+        session.add(
+            UserModel(id=user_id, email=f"{user_id}@example.com", hashed_password="x")
+        )
+        session.commit()
+
+    yield user_id
+
+    with Session(engine) as session:
+        session.execute(delete(UserModel).where(UserModel.id == user_id))
+        session.commit()
+
+
+@contextmanager
+def recorded_statements(engine: Engine) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_diff_and_evolution_reads_do_not_grow_with_versions(
+    engine: Engine, user_id: UUID, tmp_path: Path
+) -> None:
+    with Session(engine) as session:
+        service = DiagramService(
+            repository=PostgreSQLDiagramRepository(session),
+            storage=LocalDiagramStorage(tmp_path),
+            parser=RegexPlantUMLParser(),
+            diff_cache=LRUDiffResultCache(max_entries=8),
+        )
+        ids = []
+        for number, body in enumerate(VERSIONS):
+            content = f"@startuml\n{body}\n@enduml"
+            diagram = service.upload_diagram(
+                user_id, f"v{number}.puml", content.encode()
+            )
+            service.parse_diagram(user_id, diagram.id)
+            ids.append(diagram.id)
+
+        # Versions, then components and relationships of both diagrams
+        with recorded_statements(engine) as statements:
+            service.diff_diagrams(user_id, ids[0], ids[1])
+        assert len(statements) == 3
+        with recorded_statements(engine) as statements:
+            service.diff_diagrams(user_id, ids[0], ids[1])
+        assert len(statements) == 1
+        # The endpoint passes in the versions it read for the ETag
+        versions = service.get_diagram_versions(user_id, ids[:2])
+        with recorded_statements(engine) as statements:
+            service.diff_diagrams(user_id, ids[0], ids[1], versions)
+        assert statements == []
+
+        with recorded_statements(engine) as two_versions:
+            service.diagram_evolution(user_id, ids[:2])
+        with recorded_statements(engine) as three_versions:
+            service.diagram_evolution(user_id, ids)
+        assert len(three_versions) == len(two_versions) == 3
+
+
+def test_listing_pages_by_keyset_without_reading_content(
+    engine: Engine, user_id: UUID
+) -> None:
+    uploaded_at = datetime(2024, 1, 1)
+    # Two diagrams share a timestamp, so the id has to break the tie
+    timestamps = [uploaded_at + timedelta(minutes=n) for n in (0, 1, 1, 2, 3)]
+    with Session(engine) as session:
+        session.add_all(
+            DiagramModel(
+                id=uuid4(),
+                user_id=user_id,
+                name=f"v{number}",
+                source_url=f"v{number}.puml",
+                content="@startuml\n@enduml",
+                checksum=f"{user_id}-{number}",
+                status="uploaded",
+                uploaded_at=timestamp,
+            )
+            for number, timestamp in enumerate(timestamps)
+        )
+        session.commit()
+
+    async_engine = create_async_engine(
+        make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+    )
+
+    async def walk_pages() -> tuple[list[list[str]], list[str], list[str]]:
+        pages = []
+        after = None
+        async with AsyncSession(async_engine) as session:
+            service = AsyncDiagramService(AsyncPostgreSQLDiagramRepository(session))
+            with recorded_statements(async_engine.sync_engine) as statements:
+                while True:
+                    page, after = await service.list_diagram_page(user_id, 2, after)
+                    pages.append([summary.name for summary in page])
+                    if after is None:
+                        break
+            everything, after = await service.list_diagram_page(user_id, None)
+            assert after is None
+            return pages, [summary.name for summary in everything], statements
+
+    try:
+        pages, everything, statements = asyncio.run(walk_pages())
+    finally:
+        asyncio.run(async_engine.dispose())
+
+    listed = [name for page in pages for name in page]
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert listed[:2] == ["v4", "v3"] and listed[-1] == "v0"
+    assert sorted(listed[2:4]) == ["v1", "v2"]
+    assert len(statements) == 3
+    assert not any("content" in statement for statement in statements)
+    # Without a limit there is a single page holding every diagram
+    assert everything == listed
+
+
+def test_diagram_reads_leave_content_to_the_lazy_accessor(
+    engine: Engine, user_id: UUID, tmp_path: Path
+) -> None:
+    content = "@startuml\n" + "[Component] as C\n" * 200 + "@enduml"
+    with Session(engine) as session:
+        repository = PostgreSQLDiagramRepository(session)
+        service = DiagramService(
+            repository=repository,
+            storage=LocalDiagramStorage(tmp_path),
+            parser=RegexPlantUMLParser(),
+        )
+        diagram_id = service.upload_diagram(
+            user_id, "big.puml", content.encode()
+        ).id
+        session.expunge_all()
+
+        with recorded_statements(engine) as statements:
+            diagram = repository.get(diagram_id)
+            assert diagram is not None
+            diagram.mark_parsed()
+            repository.update(diagram)
+        assert diagram.content is None
+        assert not any("content" in statement for statement in statements)
+
+        with recorded_statements(engine) as statements:
+            assert diagram.load_content() == content
+            assert diagram.load_content() == content
+        assert len(statements) == 1
+
+
+def test_async_diagram_reads_refuse_to_load_content_lazily(
+    engine: Engine, user_id: UUID
+) -> None:
+    diagram_id = uuid4()
+    with Session(engine) as session:
+        session.add(
+            DiagramModel(
+                id=diagram_id,
+                user_id=user_id,
+                name="async",
+                source_url="async.puml",
+                content="@startuml\n@enduml",
+                checksum=f"{user_id}-async",
+                status="uploaded",
+                uploaded_at=datetime(2024, 1, 1),
+            )
+        )
+        session.commit()
+    async_engine = create_async_engine(
+        make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+    )
+
+    async def read() -> tuple[list, str | None]:
+        async with AsyncSession(async_engine) as session:
+            repository = AsyncPostgreSQLDiagramRepository(session)
+            diagrams = [
+                await repository.get(diagram_id),
+                *await repository.list(user_id),
+                await repository.find_by_checksum(user_id, f"{user_id}-async"),
+            ]
+            return diagrams, await repository.get_content(diagram_id)
+
+    try:
+        diagrams, content = asyncio.run(read())
+    finally:
+        asyncio.run(async_engine.dispose())
+
+    assert content == "@startuml\n@enduml"
+    for diagram in diagrams:
+        assert diagram.content is None
+        with pytest.raises(DiagramContentNotLoadedError):
+            diagram.load_content()
+
+
+def test_owned_by_reads_ids_only(
+    engine: Engine, user_id: UUID, tmp_path: Path
+) -> None:
+    with Session(engine) as session:
+        repository = PostgreSQLDiagramRepository(session)
+        service = DiagramService(
+            repository=repository,
+            storage=LocalDiagramStorage(tmp_path),
+            parser=RegexPlantUMLParser(),
+        )
+        owned_id = service.upload_diagram(
+            user_id, "owned.puml", b"@startuml\n[A]\n@enduml"
+        ).id
+        unknown_id = uuid4()
+
+        with recorded_statements(engine) as statements:
+            assert repository.owned_by(user_id, [owned_id, unknown_id]) == {
+                owned_id
+            }
+            assert repository.owned_by(uuid4(), [owned_id]) == set()
+        assert len(statements) == 2
+        assert all(
+            statement.startswith("SELECT diagrams.id \nFROM diagrams")
+            for statement in statements
+        )
@@ -0,0 +1,464 @@
+from __future__ import annotations
+
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterator
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import create_engine, delete, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.domain.diagrams.entities import ImpactValue
+from app.domain.diagrams.exceptions import UnknownMatrixAxisError
+from app.domain.diagrams.repositories import DiagramRepository
+from app.domain.diagrams.scoring import IMPACT_SCORES, NFRScoreTotals
+from app.domain.nfr.entities import NonFunctionalRequirement
+from app.infrastructure.persistence.models import (
+    Base,
+    ComponentModel,
+    DiagramModel,
+    NonFunctionalRequirementModel,
+    UserModel,
+)
+from app.infrastructure.persistence.postgresql import (
+    PackedPostgreSQLDiagramMatrixRepository,
+    PostgreSQLDiagramMatrixRepository,
+    PostgreSQLDiagramRepository,
+    PostgreSQLNFRRepository,
+)
+from app.infrastructure.persistence.unit_of_work import SQLAlchemyUnitOfWork
+
+# These tests need a real PostgreSQL server (row locks, ON CONFLICT); point
+# TEST_DATABASE_URL at a disposable database to run them.
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL, reason="TEST_DATABASE_URL is not set"
+)
+
+WRITERS = 8
+EDITS_PER_WRITER = 25
+
+
+@pytest.fixture()
+def engine() -> Iterator[Engine]:
+    engine = create_engine(DATABASE_URL, pool_size=WRITERS)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(
+    params=[PostgreSQLDiagramMatrixRepository, PackedPostgreSQLDiagramMatrixRepository],
+    ids=["rows", "packed"],
+)
+def repository_class(request: pytest.FixtureRequest) -> type:
+    """Both matrix storage backends must pass the same contract."""
+    return request.param
+
+
+@pytest.fixture()
+def matrix(engine: Engine) -> Iterator[tuple[UUID, UUID, UUID]]:
+    """A diagram with one NFR and one component, but no matrix cells."""
+    user_id, diagram_id = uuid4(), uuid4()
+    nfr_id, component_id = uuid4(), uuid4()
+    with Session(engine) as session:
+        session.add(
+            UserModel(id=user_id, email=f"{user_id}@example.com", hashed_password="x")
+        )
+        session.add(NonFunctionalRequirementModel(id=nfr_id, name=f"nfr-{nfr_id}"))
+        session.flush()
+        session.add(
+            DiagramModel(
+                id=diagram_id,
+                user_id=user_id,
+                name="diagram",
+                source_url="diagram.puml",
+                content="@startuml\n@enduml",
+                checksum=str(diagram_id),
+                status="parsed",
+                uploaded_at=datetime.utcnow(),
+            )
+        )
+        session.flush()
+        session.add(
+            ComponentModel(
+                id=component_id, diagram_id=diagram_id, name="api", type="component"
+            )
+        )
+        session.commit()
+
+    yield diagram_id, nfr_id, component_id
+
+    with Session(engine) as session:
+        session.execute(delete(UserModel).where(UserModel.id == user_id))
+        session.execute(
+            delete(NonFunctionalRequirementModel).where(
+                NonFunctionalRequirementModel.id == nfr_id
+            )
+        )
+        session.commit()
+
+
+def test_concurrent_upserts_of_one_cell_keep_totals_consistent(
+    engine: Engine, matrix: tuple[UUID, UUID, UUID], repository_class: type
+) -> None:
+    diagram_id, nfr_id, component_id = matrix
+    sessions = sessionmaker(engine)
+
+    def hammer(seed: int) -> list[ImpactValue]:
+        rng = random.Random(seed)
+        written = []
+        for _ in range(EDITS_PER_WRITER):
+            impact = rng.choice(list(ImpactValue))
+            with sessions() as session:
+                entry = repository_class(session).upsert(
+                    diagram_id, nfr_id, component_id, impact
+                )
+            assert entry.impact == impact
+            written.append(impact)
+        return written
+
+    # Every writer starts on a missing cell, so the first edits also race on
+    # the insert
+    with ThreadPoolExecutor(max_workers=WRITERS) as pool:
+        results = list(pool.map(hammer, range(WRITERS)))
+
+    with sessions() as session:
+        repository = repository_class(session)
+        cells = repository.list_by_diagram(diagram_id)
+        totals = repository.load_score_totals(diagram_id)
+
+    assert len(cells) == 1
+    final = cells[0].impact
+    assert any(final in written for written in results)
+    assert list(totals) == [
+        NFRScoreTotals(nfr_id=nfr_id, score_sum=IMPACT_SCORES[final], entry_count=1)
+    ]
+
+
+def test_bulk_upsert_racing_a_first_write_keeps_totals_consistent(
+    engine: Engine, matrix: tuple[UUID, UUID, UUID]
+) -> None:
+    diagram_id, nfr_id, _ = matrix
+    added_id = uuid4()
+    with Session(engine) as session:
+        PostgreSQLDiagramMatrixRepository(session).initialize_cells(diagram_id)
+        # A component without a cell yet, while the NFR already has totals
+        session.add(
+            ComponentModel(
+                id=added_id, diagram_id=diagram_id, name="db", type="database"
+            )
+        )
+        session.commit()
+
+    def waiting_on_lock() -> bool:
+        with engine.connect() as connection:
+            return bool(
+                connection.scalar(
+                    text(
+                        "SELECT count(*) FROM pg_stat_activity WHERE "
+                        "wait_event_type = 'Lock' AND datname = current_database()"
+                    )
+                )
+            )
+
+    with Session(engine) as first, Session(engine) as second:
+        with SQLAlchemyUnitOfWork(first) as unit_of_work, ThreadPoolExecutor() as pool:
+            # First write of the cell, not committed yet
+            PostgreSQLDiagramMatrixRepository(first).upsert(
+                diagram_id, nfr_id, added_id, ImpactValue.NEGATIVE
+            )
+            racing = pool.submit(
+                PostgreSQLDiagramMatrixRepository(second).bulk_upsert,
+                diagram_id,
+                [(nfr_id, added_id, ImpactValue.POSITIVE)],
+            )
+            for _ in range(500):
+                if waiting_on_lock():
+                    break
+                time.sleep(0.01)
+            unit_of_work.commit()
+            racing.result(timeout=10)
+
+    with Session(engine) as session:
+        totals = PostgreSQLDiagramMatrixRepository(session).load_score_totals(
+            diagram_id
+        )
+    assert NFRScoreTotals(nfr_id=nfr_id, score_sum=1, entry_count=2) in totals
+
+
+def test_initialize_cells_fills_matrix_and_keeps_edited_cells(
+    engine: Engine, matrix: tuple[UUID, UUID, UUID], repository_class: type
+) -> None:
+    diagram_id, nfr_id, component_id = matrix
+    added_id = uuid4()
+    with Session(engine) as session:
+        session.add(
+            ComponentModel(
+                id=added_id, diagram_id=diagram_id, name="db", type="database"
+            )
+        )
+        session.commit()
+
+        repository = repository_class(session)
+        repository.initialize_cells(diagram_id)
+        repository.upsert(diagram_id, nfr_id, added_id, ImpactValue.NEGATIVE)
+        session.execute(delete(ComponentModel).where(ComponentModel.id == component_id))
+        session.commit()
+        repository.initialize_cells(diagram_id)
+
+        # Other NFRs in the database get default cells too; look at ours
+        cells = [
+            cell
+            for cell in repository.list_by_diagram(diagram_id)
+            if cell.nfr_id == nfr_id
+        ]
+        assert [(cell.component_id, cell.impact) for cell in cells] == [
+            (added_id, ImpactValue.NEGATIVE)
+        ]
+        assert NFRScoreTotals(
+            nfr_id=nfr_id, score_sum=-1, entry_count=1
+        ) in repository.load_score_totals(diagram_id)
+
+        session.execute(delete(ComponentModel).where(ComponentModel.id == added_id))
+        session.commit()
+        repository.initialize_cells(diagram_id)
+        assert repository.list_by_diagram(diagram_id) == []
+        assert repository.load_score_totals(diagram_id) == []
+
+
+def test_reparse_after_removing_a_component_keeps_totals_in_step(
+    engine: Engine, matrix: tuple[UUID, UUID, UUID], repository_class: type
+) -> None:
+    diagram_id, nfr_id, component_id = matrix
+    kept_id = uuid4()
+    with Session(engine) as session:
+        session.add(
+            ComponentModel(
+                id=kept_id, diagram_id=diagram_id, name="db", type="database"
+            )
+        )
+        session.commit()
+        diagrams = PostgreSQLDiagramRepository(session)
+        repository = repository_class(session)
+        repository.initialize_cells(diagram_id)
+        repository.upsert(diagram_id, nfr_id, component_id, ImpactValue.NEGATIVE)
+        repository.upsert(diagram_id, nfr_id, kept_id, ImpactValue.POSITIVE)
+
+        # The parse path: component changes through the fine-grained
+        # repository methods, then the matrix follows the components
+        DiagramRepository.sync_components(
+            diagrams, diagram_id, [], [], [component_id], []
+        )
+        assert [c.id for c in diagrams.get_components(diagram_id)] == [kept_id]
+        repository.initialize_cells(diagram_id)
+
+        assert NFRScoreTotals(
+            nfr_id=nfr_id, score_sum=1, entry_count=1
+        ) in repository.load_score_totals(diagram_id)
+
+
+def test_nfr_backfill_batches_add_and_remove_one_nfr_cells(
+    engine: Engine, matrix: tuple[UUID, UUID, UUID], repository_class: type
+) -> None:
+    diagram_id, nfr_id, component_id = matrix
+    added_nfr_id, edited_id = uuid4(), uuid4()
+    # Keyset start just before our diagram so the batch holds only it
+    after_diagram_id = UUID(int=diagram_id.int - 1)
+    with Session(engine) as session:
+        session.add(
+            ComponentModel(
+                id=edited_id, diagram_id=diagram_id, name="db", type="database"
+            )
+        )
+        session.commit()
+        repository = repository_class(session)
+        repository.initialize_cells(diagram_id)
+        session.add(
+            NonFunctionalRequirementModel(id=added_nfr_id, name=f"nfr-{added_nfr_id}")
+        )
+        session.commit()
+        try:
+            # Written before the backfill reaches the diagram
+            repository.upsert(diagram_id, added_nfr_id, edited_id, ImpactValue.POSITIVE)
+
+            assert repository.add_nfr_cells(added_nfr_id, after_diagram_id, 1) == [
+                diagram_id
+            ]
+            cells = {
+                cell.component_id: cell.impact
+                for cell in repository.list_by_diagram(diagram_id)
+                if cell.nfr_id == added_nfr_id
+            }
+            assert cells == {
+                component_id: ImpactValue.NO_EFFECT,
+                edited_id: ImpactValue.POSITIVE,
+            }
+            totals = repository.load_score_totals(diagram_id)
+            assert NFRScoreTotals(
+                nfr_id=added_nfr_id, score_sum=1, entry_count=2
+            ) in totals
+            assert NFRScoreTotals(nfr_id=nfr_id, score_sum=0, entry_count=2) in totals
+
+            assert repository.remove_nfr_cells(
+                added_nfr_id, after_diagram_id, 1
+            ) == [diagram_id]
+            assert all(
+                cell.nfr_id != added_nfr_id
+                for cell in repository.list_by_diagram(diagram_id)
+            )
+            assert [
+                total.nfr_id
+                for total in repository.load_score_totals(diagram_id)
+                if total.nfr_id == added_nfr_id
+            ] == []
+        finally:
+            session.execute(
+                delete(NonFunctionalRequirementModel).where(
+                    NonFunctionalRequirementModel.id == added_nfr_id
+                )
+            )
+            session.commit()
+
+
+def test_nfr_marked_deleted_gets_no_new_cells_and_frees_its_name(
+    engine: Engine, matrix: tuple[UUID, UUID, UUID], repository_class: type
+) -> None:
+    diagram_id, nfr_id, component_id = matrix
+    after_diagram_id = UUID(int=diagram_id.int - 1)
+    with Session(engine) as session:
+        nfrs = PostgreSQLNFRRepository(session)
+        repository = repository_class(session)
+        nfrs.mark_deleted(nfr_id)
+        try:
+            assert nfrs.get(nfr_id) is None
+            assert nfr_id in nfrs.list_deleted_ids()
+
+            repository.initialize_cells(diagram_id)
+            repository.add_nfr_cells(nfr_id, after_diagram_id, 1)
+            assert all(
+                cell.nfr_id != nfr_id
+                for cell in repository.list_by_diagram(diagram_id)
+            )
+
+            # The name is free again while the old row awaits removal
+            reused = nfrs.add(NonFunctionalRequirement(name=f"nfr-{nfr_id}"))
+            assert nfrs.get_by_name(reused.name).id == reused.id
+        finally:
+            session.execute(
+                delete(NonFunctionalRequirementModel).where(
+                    NonFunctionalRequirementModel.name == f"nfr-{nfr_id}"
+                )
+            )
+            session.commit()
+
+
+def test_nfr_marked_deleted_is_hidden_from_matrix_reads(
+    engine: Engine, matrix: tuple[UUID, UUID, UUID], repository_class: type
+) -> None:
+    diagram_id, nfr_id, component_id = matrix
+    with Session(engine) as session:
+        repository = repository_class(session)
+        repository.bulk_upsert(
+            diagram_id, [(nfr_id, component_id, ImpactValue.POSITIVE)]
+        )
+        assert [t.nfr_id for t in repository.load_score_totals(diagram_id)] == [
+            nfr_id
+        ]
+
+        diagrams = PostgreSQLDiagramRepository(session)
+        before = diagrams.get_version(diagram_id)
+
+        # Its cells and totals stay stored until the backfill removes them
+        PostgreSQLNFRRepository(session).mark_deleted(nfr_id)
+        after = diagrams.get_version(diagram_id)
+        assert after.nfrs_deleted_at != before.nfrs_deleted_at
+        assert repository.list_by_diagram(diagram_id) == []
+        assert nfr_id not in repository.load_impact_matrix(diagram_id).nfr_ids
+        assert repository.load_score_totals(diagram_id) == []
+        assert repository.load_score_totals_many([diagram_id]) == {diagram_id: []}
+
+
+def test_packed_cells_must_reference_live_nfrs_and_own_components(
+    engine: Engine, matrix: tuple[UUID, UUID, UUID]
+) -> None:
+    diagram_id, nfr_id, component_id = matrix
+    with Session(engine) as session:
+        repository = PackedPostgreSQLDiagramMatrixRepository(session)
+        for cell in [
+            (uuid4(), component_id, ImpactValue.POSITIVE),
+            (nfr_id, uuid4(), ImpactValue.POSITIVE),
+        ]:
+            with pytest.raises(UnknownMatrixAxisError):
+                repository.bulk_upsert(diagram_id, [cell])
+
+        repository.bulk_upsert(
+            diagram_id, [(nfr_id, component_id, ImpactValue.POSITIVE)]
+        )
+        assert [
+            (cell.nfr_id, cell.impact)
+            for cell in repository.list_by_diagram(diagram_id)
+        ] == [(nfr_id, ImpactValue.POSITIVE)]
+
+
+def test_every_matrix_write_bumps_the_diagram_matrix_version(
+    engine: Engine, matrix: tuple[UUID, UUID, UUID], repository_class: type
+) -> None:
+    diagram_id, nfr_id, component_id = matrix
+    after_diagram_id = UUID(int=diagram_id.int - 1)
+    with Session(engine) as session:
+        diagrams = PostgreSQLDiagramRepository(session)
+        repository = repository_class(session)
+
+        def matrix_version() -> int:
+            version = diagrams.get_version(diagram_id)
+            assert version is not None
+            return version.matrix_version
+
+        assert matrix_version() == 0
+        repository.initialize_cells(diagram_id)
+        assert matrix_version() == 1
+        repository.upsert(diagram_id, nfr_id, component_id, ImpactValue.POSITIVE)
+        assert matrix_version() == 2
+        repository.bulk_upsert(
+            diagram_id, [(nfr_id, component_id, ImpactValue.NEGATIVE)]
+        )
+        assert matrix_version() == 3
+        repository.remove_nfr_cells(nfr_id, after_diagram_id, 1)
+        assert matrix_version() == 4
+        repository.add_nfr_cells(nfr_id, after_diagram_id, 1)
+        assert matrix_version() == 5
+
+
+def test_batched_reads_match_per_diagram_reads(
+    engine: Engine, matrix: tuple[UUID, UUID, UUID], repository_class: type
+) -> None:
+    diagram_id, nfr_id, component_id = matrix
+    with Session(engine) as session:
+        diagrams = PostgreSQLDiagramRepository(session)
+        repository = repository_class(session)
+        repository.initialize_cells(diagram_id)
+        repository.upsert(diagram_id, nfr_id, component_id, ImpactValue.POSITIVE)
+
+        missing_id = uuid4()
+        ids = [diagram_id, missing_id]
+        assert diagrams.get_versions(ids) == {
+            diagram_id: diagrams.get_version(diagram_id)
+        }
+        assert diagrams.get_components_by_diagram(ids) == {
+            diagram_id: diagrams.get_components(diagram_id),
+            missing_id: [],
+        }
+        assert diagrams.get_relationships_by_diagram(ids) == {
+            diagram_id: [],
+            missing_id: [],
+        }
+        assert repository.load_score_totals_many([diagram_id])[diagram_id] == (
+            repository.load_score_totals(diagram_id)
+        )
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from typing import Iterator
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from app.infrastructure.persistence.database import upgrade_schema
+
+DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL, reason="TEST_DATABASE_URL is not set"
+)
+
+# The two tables as an earlier release created them
+LEGACY_TABLES = (
+    """
+    CREATE TABLE non_functional_requirements (
+        id UUID PRIMARY KEY,
+        name VARCHAR(255) NOT NULL UNIQUE,
+        description TEXT,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE diagrams (
+        id UUID PRIMARY KEY,
+        user_id UUID NOT NULL,
+        uploaded_at TIMESTAMP WITH TIME ZONE NOT NULL
+    )
+    """,
+)
+
+
+@pytest.fixture()
+def legacy_engine() -> Iterator[Engine]:
+    """An engine whose search path is a scratch schema with the legacy tables."""
+    schema = f"legacy_{uuid4().hex}"
+    admin = create_engine(DATABASE_URL)
+    with admin.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_engine(
+        DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"}
+    )
+    with engine.begin() as connection:
+        for statement in LEGACY_TABLES:
+            connection.execute(text(statement))
+    yield engine
+    engine.dispose()
+    with admin.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    admin.dispose()
+
+
+def _insert_nfr(engine: Engine, name: str, deleted: bool) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO non_functional_requirements "
+                "(id, name, created_at, deleted_at) "
+                "VALUES (:id, :name, now(), CASE WHEN :deleted THEN now() END)"
+            ),
+            {"id": uuid4(), "name": name, "deleted": deleted},
+        )
+
+
+def test_upgrade_brings_legacy_tables_to_current_models(
+    legacy_engine: Engine,
+) -> None:
+    upgrade_schema(legacy_engine)
+    # Runs on every startup, so a second pass must be a no-op
+    upgrade_schema(legacy_engine)
+
+    schema = inspect(legacy_engine)
+    columns = {c["name"] for c in schema.get_columns("non_functional_requirements")}
+    assert "deleted_at" in columns
+    assert {i["name"] for i in schema.get_indexes("diagrams")} >= {
+        "ix_diagrams_user_uploaded_at_id",
+        "ix_diagrams_id_user_id",
+    }
+
+    # Only live NFRs keep their names unique
+    _insert_nfr(legacy_engine, "Latency", deleted=True)
+    _insert_nfr(legacy_engine, "Latency", deleted=True)
+    _insert_nfr(legacy_engine, "Latency", deleted=False)
+    with pytest.raises(IntegrityError):
+        _insert_nfr(legacy_engine, "Latency", deleted=False)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+
+from app.infrastructure.persistence.unit_of_work import (
+    SQLAlchemyUnitOfWork,
+    commit_or_flush,
+)
+
+
+class RecordingSession:
+    """Stand-in for a SQLAlchemy session that records transaction calls."""
+
+    def __init__(self) -> None:
+        self.info: dict = {}
+        self.calls: list[str] = []
+
+    def commit(self) -> None:
+        self.calls.append("commit")
+
+    def flush(self) -> None:
+        self.calls.append("flush")
+
+    def rollback(self) -> None:
+        self.calls.append("rollback")
+
+
+def test_repository_writes_commit_outside_unit_of_work() -> None:
+    session = RecordingSession()
+
+    commit_or_flush(session)  # type: ignore[arg-type]
+
+    assert session.calls == ["commit"]
+
+
+def test_unit_of_work_defers_repository_commits_to_single_commit() -> None:
+    session = RecordingSession()
+    uow = SQLAlchemyUnitOfWork(session)  # type: ignore[arg-type]
+
+    with uow:
+        commit_or_flush(session)  # type: ignore[arg-type]
+        with uow:
+            commit_or_flush(session)  # type: ignore[arg-type]
+            uow.commit()
+        uow.commit()
+
+    assert session.calls == ["flush", "flush", "flush", "commit", "rollback"]
+    assert session.calls.count("commit") == 1
+
+
+def test_unit_of_work_rolls_back_on_error() -> None:
+    session = RecordingSession()
+    uow = SQLAlchemyUnitOfWork(session)  # type: ignore[arg-type]
+
+    with pytest.raises(RuntimeError):
+        with uow:
+            commit_or_flush(session)  # type: ignore[arg-type]
+            raise RuntimeError("boom")
+
+    assert session.calls == ["flush", "rollback"]
+    commit_or_flush(session)  # type: ignore[arg-type]
+    assert session.calls[-1] == "commit"
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.infrastructure.ratelimit.in_memory import InMemoryRateLimitBackend
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_allows_a_burst_then_refills_over_time() -> None:
+    clock = FakeClock()
+    backend = InMemoryRateLimitBackend(clock=clock)
+
+    def take(key: str = "a") -> float:
+        return asyncio.run(backend.take(key, capacity=3, refill_per_second=0.5))
+
+    assert [take() for _ in range(3)] == [0, 0, 0]
+    assert take() == 2.0
+    assert take("b") == 0
+
+    clock.now = 1
+    assert take() == 1.0
+    clock.now = 2
+    assert take() == 0
+    # A long pause refills up to the capacity only
+    clock.now = 100
+    assert [take() for _ in range(4)] == [0, 0, 0, 2.0]
+
+
+def test_refunds_return_a_token_up_to_the_capacity() -> None:
+    backend = InMemoryRateLimitBackend(clock=FakeClock())
+
+    def take() -> float:
+        return asyncio.run(backend.take("a", capacity=2, refill_per_second=0.5))
+
+    assert [take(), take(), take()] == [0, 0, 2.0]
+    asyncio.run(backend.refund("a", capacity=2))
+    assert take() == 0
+    # Refunds never overfill, and an unknown bucket is already full
+    for key in ("a", "a", "a", "unknown"):
+        asyncio.run(backend.refund(key, capacity=2))
+    assert [take(), take(), take()] == [0, 0, 2.0]
+    assert len(backend) == 1
+
+
+def test_backend_keeps_the_most_recently_used_buckets() -> None:
+    backend = InMemoryRateLimitBackend(max_keys=2, clock=FakeClock())
+
+    def take(key: str) -> float:
+        return asyncio.run(backend.take(key, capacity=1, refill_per_second=1))
+
+    take("first")
+    take("second")
+    take("third")
+
+    assert len(backend) == 2
+    # The dropped bucket starts over full
+    assert take("first") == 0
+    assert take("third") == 1.0
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.application.auth.services import AuthService
+
+from app.application.diagrams.matrix_service import (
+    AsyncDiagramMatrixService,
+    DiagramMatrixService,
+)
+from app.application.diagrams.ports import UnitOfWork
+from app.application.diagrams.services import AsyncDiagramService, DiagramService
+from app.infrastructure.persistence.database import get_async_db, get_db
+from app.presentation.api.dependencies import (
+    get_async_diagram_matrix_service,
+    get_async_diagram_service,
+    get_current_user,
+    get_diagram_matrix_service,
+    get_diagram_service,
+    get_unit_of_work,
+)
+
+
+def test_request_repositories_share_one_session() -> None:
+    opened: list[object] = []
+
+    def fake_get_db():
+        session = object()
+        opened.append(session)
+        yield session
+
+    app = FastAPI()
+    app.dependency_overrides[get_db] = fake_get_db
+
+    @app.get("/probe")
+    def probe(
+        diagram_service: DiagramService = Depends(get_diagram_service),
+        matrix_service: DiagramMatrixService = Depends(get_diagram_matrix_service),
+        unit_of_work: UnitOfWork = Depends(get_unit_of_work),
+    ) -> list[int]:
+        sessions = {
+            id(diagram_service._repository._session),
+            id(matrix_service._matrix_repository._session),
+            id(unit_of_work._session),
+        }
+        return sorted(sessions)
+
+    with TestClient(app) as client:
+        response = client.get("/probe")
+
+    assert response.status_code == 200
+    assert len(opened) == 1
+    assert response.json() == [id(opened[0])]
+
+
+def test_async_request_repositories_share_one_session() -> None:
+    opened: list[object] = []
+
+    async def fake_get_async_db():
+        session = object()
+        opened.append(session)
+        yield session
+
+    app = FastAPI()
+    app.dependency_overrides[get_async_db] = fake_get_async_db
+
+    @app.get("/probe")
+    async def probe(
+        diagram_service: AsyncDiagramService = Depends(get_async_diagram_service),
+        matrix_service: AsyncDiagramMatrixService = Depends(
+            get_async_diagram_matrix_service
+        ),
+    ) -> list[int]:
+        sessions = {
+            id(diagram_service._repository._session),
+            id(matrix_service._matrix_repository._session),
+        }
+        return sorted(sessions)
+
+    with TestClient(app) as client:
+        response = client.get("/probe")
+
+    assert response.status_code == 200
+    assert len(opened) == 1
+    assert response.json() == [id(opened[0])]
+
+
+def test_current_user_does_not_open_a_session() -> None:
+    opened: list[object] = []
+
+    def fake_get_db():
+        opened.append(object())
+        yield opened[-1]
+
+    app = FastAPI()
+    app.dependency_overrides[get_db] = fake_get_db
+
+    @app.get("/probe")
+    async def probe(current_user: dict = Depends(get_current_user)) -> str:
+        return current_user["sub"]
+
+    token = AuthService(user_repository=None).create_access_token("user", "u@x.io")
+    with TestClient(app) as client:
+        for _ in range(2):
+            response = client.get(
+                "/probe", headers={"Authorization": f"Bearer {token}"}
+            )
+            assert response.status_code == 200
+            assert response.json() == "user"
+        rejected = client.get("/probe", headers={"Authorization": "Bearer x.y.z"})
+
+    assert rejected.status_code == 401
+    assert opened == []
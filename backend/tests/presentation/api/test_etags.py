@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from app.presentation.api.etags import entity_tag, etag_matches
+
+
+def test_entity_tag_is_strong_and_tracks_every_part() -> None:
+    parsed_at = datetime(2024, 5, 1, 12, 0)
+    etag = entity_tag("matrix", "diagram", parsed_at, 3)
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == entity_tag("matrix", "diagram", parsed_at, 3)
+    assert etag != entity_tag("matrix", "diagram", parsed_at, 4)
+    assert etag != entity_tag("matrix", "diagram", None, 3)
+
+
+def test_if_none_match_uses_weak_comparison_over_a_list() -> None:
+    etag = entity_tag("diagram", 1)
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
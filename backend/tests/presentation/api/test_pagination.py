@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from starlette.datastructures import URL
+
+from app.presentation.api.pagination import (
+    decode_cursor,
+    encode_cursor,
+    next_page_link,
+)
+
+
+def test_cursor_round_trips_the_keyset() -> None:
+    keyset = (datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=timezone.utc), uuid4())
+
+    cursor = encode_cursor(keyset)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == keyset
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not base64!",
+        # "diagram": no separator
+        "ZGlhZ3JhbQ",
+        # "2024-05-01|not-a-uuid"
+        "MjAyNC0wNS0wMXxub3QtYS11dWlk",
+    ],
+)
+def test_foreign_cursors_are_rejected(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_next_page_link_keeps_other_query_parameters() -> None:
+    keyset = (datetime(2024, 5, 1), uuid4())
+    url = URL("http://testserver/api/v1/diagrams?limit=2&cursor=old")
+
+    link = next_page_link(url, keyset)
+
+    assert link.endswith('>; rel="next"')
+    next_url = URL(link[1 : link.index(">")])
+    assert next_url.path == "/api/v1/diagrams"
+    assert "limit=2" in next_url.query
+    assert decode_cursor(next_url.query.split("cursor=")[1]) == keyset